@@ -1,16 +1,35 @@
+import time
+_STARTUP_ORIGIN = time.perf_counter()
+import os
+import sys
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 import json
 from datetime import datetime
-import pygame  # Add for sound effects
 from tkinter import filedialog
-import cv2  # Add for VOD review
+from stats_store import StatsStore, DEFAULT_STATS
+from session_stats import SessionStats
+from startup_profile import StartupProfiler
+from sound_engine import SoundEngine
+from popups import PopupManager
+from event_bus import EventBus
+from twitch_chat import TwitchChatClient, TWITCH_IRC_HOST, TWITCH_IRC_PORT
+from polls import PollEngine
+from chat_commands import CommandRouter
+from redemptions import RedemptionQueue
+from overlay_server import OverlayServer, OVERLAY_TYPES
+from replay_buffer import ReplayBuffer, ReplayCapture
+_IMPORT_SECONDS = time.perf_counter() - _STARTUP_ORIGIN
 
 class FortniteCompanion:
-    def __init__(self):
+    def __init__(self, profile_startup=False):
+        self.profiler = StartupProfiler(profile_startup, _STARTUP_ORIGIN)
+        self.profiler.record("imports", _IMPORT_SECONDS)
         try:
             # Initialize main window
-            self.root = tk.Tk()
+            with self.profiler.section("tk.Tk()"):
+                self.root = tk.Tk()
             self.root.title("Fortnite Stream Tools")
             self.root.geometry("1000x800")
             
@@ -26,40 +45,105 @@ class FortniteCompanion:
             }
             
             self.root.configure(bg=self.colors['bg'])
+            self.popups = PopupManager(self.root, self.colors, self.create_button, toasts=2)
             
             # Initialize basic variables
             self.elim_count = tk.IntVar(value=0)
             self.stats = {}  # Initialize empty before loading
+            self.stats_store = StatsStore('stats.json')
             try:
-                self.stats = self.load_stats()
+                with self.profiler.section("load_stats"):
+                    self.stats = self.load_stats()
             except:
                 print("Warning: Could not load stats")
+            self.stats_store.start()
+            self.session = SessionStats()
+            self.session.load(self.stats)
             
             self.session_start = datetime.now()
             
             # Initialize feature variables
-            self.replay_buffer = []
+            # Allocated when instant replay is first armed, not at startup
+            self.replay_buffer = None
+            self.replay_capture = None
+            self.recorder = None
+            self.replay_catalog = None
+            self.highlights = None
+            self.highlight_rows = {}
+            self.highlight_window = None
+            self.current_mode = None
             self.stream_connected = False
-            self.sound_effects = None
+            self.chat_client = None
+            self.chat_messages = 0
+            self.polls = PollEngine(on_update=self.on_poll_update, on_close=self.on_poll_closed)
+            self.poll_dialog = None
+            self.poll_tick_id = None
+            self.prediction = None
+            self.prediction_dialog = None
+            self.chat_commands = CommandRouter()
+            self.register_chat_commands()
+            self.sound_effects = SoundEngine(
+                channels=8,
+                voice_limits={'elimination': 3, 'victory': 1, 'death': 1},
+                # Effects that finish decoding late are played on the Tk thread
+                on_ready=lambda name: self.bus.post('call', lambda: self.sound_effects.play(name))
+            )
             self.current_vod = None
+            self.vod_strip = None
+            self.vod_reader = None
+            self.vod_fill_stop = None
+            self.vod_panel = None
+            self.vod_notes = None
+            self.hud_watcher = None
+            self.stats_api = None
+            self.tournament = None
+            self.scrim_store = None
+            self.scrim_import_thread = None
+            self.tournament_team = os.getenv('TOURNAMENT_TEAM') or os.getenv('FORTNITE_PLAYER')
+            # Created up front so standings update them even before the Stats
+            # tab is built; the tab only binds labels to them
+            self.tournament_stats = {
+                label: tk.StringVar(value='-')
+                for label in ('Tournament', 'Matches', 'Leader', 'Our Rank', 'Our Points')
+            }
             
-            # Try to initialize pygame
-            try:
-                pygame.mixer.init()
-                self.sound_effects = {}
-                self.load_sound_effects()
-            except Exception as e:
-                print(f"Warning: Sound system initialization failed: {e}")
-                self.sound_effects = None
+            # Background workers post here instead of touching Tk directly
+            self.bus = EventBus(self.root)
+            self.bus.subscribe('elim', self.update_elims)
+            self.bus.subscribe('victory', self.record_victory)
+            self.bus.subscribe('top_10', self.mark_top_10)
+            self.bus.subscribe('new_game', self.start_new_game)
+            self.bus.subscribe('chat', self.on_chat_messages)
+            self.bus.subscribe('chat_status', self.on_chat_status)
+            self.bus.subscribe('call', lambda callback: callback())
+            
+            # Channel-points redemptions survive restarts in redemptions.log
+            self.reward_actions = self.load_reward_actions()
+            self.closing = False
+            self.redemptions = RedemptionQueue('redemptions.log', self.handle_redemption)
+            self.redemptions.start()
+            
+            self.overlay = OverlayServer(port=int(os.environ.get('OVERLAY_PORT', 8765)))
+            self.visible_overlays = set()
+            # Optional pre-rendered RGBA frames for capture tools that cannot
+            # host a browser source (OVERLAY_FRAMES=1)
+            self.render_frames = os.environ.get('OVERLAY_FRAMES') == '1'
+            self.frame_overlays = {}
+            self.challenge = None
+            self.challenge_timer_running = False
+            self.bus.start()
             
             # Create UI elements
             try:
-                self.create_notebook()
+                with self.profiler.section("create_notebook"):
+                    self.create_notebook()
                 self.create_tabs()
             except Exception as e:
                 print(f"Error creating UI: {e}")
                 raise
             
+            self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+            
         except Exception as e:
             print(f"Critical initialization error: {e}")
             raise
@@ -83,33 +167,41 @@ class FortniteCompanion:
         self.vod_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
         self.scrim_frame = tk.Frame(self.notebook, bg=self.colors['bg'])
         
-        # Add frames to notebook
-        self.notebook.add(self.main_frame, text='Main')
-        self.notebook.add(self.quick_frame, text='Quick Actions')
-        self.notebook.add(self.polls_frame, text='Polls')
-        self.notebook.add(self.predictions_frame, text='Predictions')
-        self.notebook.add(self.stats_frame, text='Stats')
-        self.notebook.add(self.tournament_frame, text='Tournament')
-        self.notebook.add(self.challenges_frame, text='Challenges')
-        self.notebook.add(self.overlay_frame, text='Overlays')
-        self.notebook.add(self.stream_frame, text='Stream')
-        self.notebook.add(self.replay_frame, text='Replays')
-        self.notebook.add(self.vod_frame, text='VOD Review')
-        self.notebook.add(self.scrim_frame, text='Scrims')
-        
-        # Setup each tab
-        self.setup_main_tab()
-        self.setup_quick_actions()
-        self.setup_polls_tab()
-        self.setup_predictions_tab()
-        self.setup_stats_tab()
-        self.setup_tournament_tab()
-        self.setup_challenges_tab()
-        self.setup_overlay_tab()
-        self.setup_stream_tab()
-        self.setup_replay_tab()
-        self.setup_vod_tab()
-        self.setup_scrim_tab()
+        # Add frames to notebook; each tab is built the first time it is selected
+        self.tab_setups = {}
+        tabs = [
+            (self.main_frame, 'Main', self.setup_main_tab),
+            (self.quick_frame, 'Quick Actions', self.setup_quick_actions),
+            (self.polls_frame, 'Polls', self.setup_polls_tab),
+            (self.predictions_frame, 'Predictions', self.setup_predictions_tab),
+            (self.stats_frame, 'Stats', self.setup_stats_tab),
+            (self.tournament_frame, 'Tournament', self.setup_tournament_tab),
+            (self.challenges_frame, 'Challenges', self.setup_challenges_tab),
+            (self.overlay_frame, 'Overlays', self.setup_overlay_tab),
+            (self.stream_frame, 'Stream', self.setup_stream_tab),
+            (self.replay_frame, 'Replays', self.setup_replay_tab),
+            (self.vod_frame, 'VOD Review', self.setup_vod_tab),
+            (self.scrim_frame, 'Scrims', self.setup_scrim_tab)
+        ]
+        
+        for frame, text, setup in tabs:
+            self.notebook.add(frame, text=text)
+            self.tab_setups[str(frame)] = (text, setup)
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.build_tab(self.notebook.select())
+
+    def on_tab_changed(self, event=None):
+        self.build_tab(self.notebook.select())
+
+    def build_tab(self, tab_id):
+        # Runs a tab's setup once; later selections find nothing to build
+        entry = self.tab_setups.pop(str(tab_id), None)
+        if entry is None:
+            return
+        text, setup = entry
+        with self.profiler.section(f"setup tab: {text}"):
+            setup()
 
     def create_button(self, parent, text, command, color=None, size="normal"):
         if color is None:
@@ -172,7 +264,8 @@ class FortniteCompanion:
             ("Mark Top 10", self.mark_top_10),
             ("Reset Session", self.reset_session),
             ("Save Clip", self.save_clip),
-            ("Toggle Overlay", self.toggle_overlay)
+            ("Toggle Overlay", self.toggle_overlay),
+            ("Auto Detect (HUD)", self.toggle_hud_detection)
         ]
         
         for text, command in actions:
@@ -213,6 +306,14 @@ class FortniteCompanion:
                     option,
                     lambda o=option: self.start_poll(o)
                 ).pack(pady=2, padx=10, fill='x')
+            
+            # Chat votes 1..N across every option in the category
+            self.create_button(
+                frame,
+                "Poll All Options",
+                lambda c=category, o=options: self.start_poll(c, o),
+                self.colors['highlight']
+            ).pack(pady=2, padx=10, fill='x')
 
     def setup_predictions_tab(self):
         categories = {
@@ -276,12 +377,8 @@ class FortniteCompanion:
         session_frame.pack(pady=5, padx=10, fill='x')
         
         self.session_stats = {
-            'Victories': tk.StringVar(value="0"),
-            'Eliminations': tk.StringVar(value="0"),
-            'Games Played': tk.StringVar(value="0"),
-            'K/D Ratio': tk.StringVar(value="0.0"),
-            'Win Rate': tk.StringVar(value="0%"),
-            'Top 10s': tk.StringVar(value="0")
+            stat: tk.StringVar(value=self.session.render(stat))
+            for stat in SessionStats.FIELDS
         }
         
         for stat, var in self.session_stats.items():
@@ -301,6 +398,84 @@ class FortniteCompanion:
                 bg=self.colors['bg'],
                 fg=self.colors['success']
             ).pack(side='right', padx=5)
+            
+            self.session.bind(stat, var.set)
+        
+        # Account totals from the stats API, cached in the stats store so
+        # they show up before the first refresh
+        account_frame = tk.LabelFrame(
+            self.stats_frame,
+            text="Account Statistics",
+            bg=self.colors['bg'],
+            fg='white'
+        )
+        account_frame.pack(pady=5, padx=10, fill='x')
+        
+        self.account_stats = {}
+        for key, label in (('victories', 'Victories'), ('eliminations', 'Eliminations'),
+                           ('games_played', 'Matches'), ('top_10s', 'Top 10s')):
+            frame = tk.Frame(account_frame, bg=self.colors['bg'])
+            frame.pack(fill='x', pady=2)
+            tk.Label(frame, text=f"{label}:", bg=self.colors['bg'], fg='white').pack(side='left', padx=5)
+            var = tk.StringVar(value=str(self.stats.get('account_' + key, '-')))
+            tk.Label(frame, textvariable=var, bg=self.colors['bg'],
+                     fg=self.colors['success']).pack(side='right', padx=5)
+            self.account_stats[key] = var
+        
+        self.create_button(
+            account_frame,
+            "Refresh from Fortnite API",
+            self.refresh_api_stats
+        ).pack(pady=5, padx=10, fill='x')
+        
+        # Filled in by push_tournament once a tournament is running
+        tournament_frame = tk.LabelFrame(
+            self.stats_frame,
+            text="Tournament",
+            bg=self.colors['bg'],
+            fg='white'
+        )
+        tournament_frame.pack(pady=5, padx=10, fill='x')
+        
+        for label, var in self.tournament_stats.items():
+            frame = tk.Frame(tournament_frame, bg=self.colors['bg'])
+            frame.pack(fill='x', pady=2)
+            tk.Label(frame, text=f"{label}:", bg=self.colors['bg'], fg='white').pack(side='left', padx=5)
+            tk.Label(frame, textvariable=var, bg=self.colors['bg'],
+                     fg=self.colors['success']).pack(side='right', padx=5)
+        
+        self.update_stats()
+
+    def refresh_api_stats(self):
+        name = os.getenv('FORTNITE_PLAYER') or simpledialog.askstring(
+            "Account Statistics", "Epic account name:", parent=self.root
+        )
+        if not name:
+            return
+        if self.stats_api is None:
+            from stats_api import StatsApiClient
+            self.stats_api = StatsApiClient()
+        
+        # Runs on an API worker thread; results are applied on the Tk thread
+        def done(stats, error):
+            if error is not None:
+                self.bus.post('call', lambda: self.show_api_error(error))
+            else:
+                self.bus.post('call', lambda: self.apply_api_stats(stats))
+        
+        self.stats_api.player_stats_async(name, done)
+
+    def apply_api_stats(self, stats):
+        for key, value in stats.items():
+            self.stats_store.set('account_' + key, value)
+            self.account_stats[key].set(str(value))
+
+    def show_api_error(self, error):
+        print(f"Error fetching account stats: {error}")
+        self.popups.toast(
+            "Could not fetch account stats", self.colors['danger'], duration=2500,
+            fg='white', font=('Arial', 14, 'bold'), size="300x100"
+        )
 
     def setup_tournament_tab(self):
         # Tournament controls
@@ -325,6 +500,30 @@ class FortniteCompanion:
                 t_type,
                 lambda t=t_type: self.start_tournament(t)
             ).pack(pady=2, padx=10, fill='x')
+        
+        # Leaderboard
+        board_frame = tk.LabelFrame(
+            self.tournament_frame,
+            text="Leaderboard",
+            bg=self.colors['bg'],
+            fg='white'
+        )
+        board_frame.pack(pady=5, padx=10, fill='both', expand=True)
+        
+        buttons = tk.Frame(board_frame, bg=self.colors['bg'])
+        buttons.pack(fill='x', pady=2)
+        self.create_button(buttons, "Add Match Results", self.add_tournament_results).pack(side='left', padx=5)
+        self.create_button(buttons, "Undo Last Match", self.undo_tournament_match,
+                           color=self.colors['danger']).pack(side='left', padx=5)
+        self.tournament_status = tk.Label(buttons, text="No tournament running", bg=self.colors['bg'], fg='white')
+        self.tournament_status.pack(side='right', padx=5)
+        
+        columns = ('rank', 'team', 'points', 'wins', 'avg place', 'elims', 'matches')
+        self.tournament_tree = ttk.Treeview(board_frame, columns=columns, show='headings', height=15)
+        for column in columns:
+            self.tournament_tree.heading(column, text=column.title())
+            self.tournament_tree.column(column, width=200 if column == 'team' else 70)
+        self.tournament_tree.pack(fill='both', expand=True, padx=5, pady=5)
 
     def setup_challenges_tab(self):
         challenge_types = {
@@ -364,7 +563,8 @@ class FortniteCompanion:
             "Stats Display",
             "Victory Counter",
             "Challenge Timer",
-            "Custom Text"
+            "Custom Text",
+            "Poll Results"
         ]
         
         for overlay in overlay_types:
@@ -461,80 +661,170 @@ class FortniteCompanion:
                     option,
                     lambda o=option: self.start_scrim(o)
                 ).pack(pady=2, padx=10, fill='x')
+        
+        # Imported lobby results, queried per mode
+        results_frame = tk.LabelFrame(
+            self.scrim_frame,
+            text="Scrim Results",
+            bg=self.colors['bg'],
+            fg='white'
+        )
+        results_frame.pack(pady=5, padx=10, fill='both', expand=True)
+        
+        bar = tk.Frame(results_frame, bg=self.colors['bg'])
+        bar.pack(fill='x', pady=2)
+        self.create_button(bar, "Import Files", self.import_scrim_files).pack(side='left', padx=5)
+        self.create_button(bar, "Import Folder", self.import_scrim_folder).pack(side='left', padx=5)
+        self.scrim_mode = tk.StringVar(value='All modes')
+        self.scrim_sort = tk.StringVar(value='eliminations')
+        self.scrim_search = tk.StringVar()
+        self.scrim_mode_box = ttk.Combobox(bar, textvariable=self.scrim_mode, values=['All modes'],
+                                           state='readonly', width=16)
+        self.scrim_mode_box.pack(side='left', padx=5)
+        ttk.Combobox(bar, textvariable=self.scrim_sort, state='readonly', width=14, values=(
+            'eliminations', 'avg_elims', 'wins', 'win_rate', 'avg_placement', 'top_10s',
+            'storm_deaths', 'storm_rate', 'matches'
+        )).pack(side='left', padx=5)
+        tk.Entry(bar, textvariable=self.scrim_search, width=18).pack(side='left', padx=5)
+        for var in (self.scrim_mode, self.scrim_sort, self.scrim_search):
+            var.trace_add('write', lambda *args: self.refresh_scrim_results())
+        self.scrim_status = tk.Label(results_frame, text="No results imported", bg=self.colors['bg'], fg='white')
+        self.scrim_status.pack(fill='x', padx=5)
+        
+        columns = ('player', 'matches', 'elims', 'avg elims', 'wins', 'avg place', 'top 10s', 'storm deaths')
+        self.scrim_tree = ttk.Treeview(results_frame, columns=columns, show='headings', height=12)
+        for column in columns:
+            self.scrim_tree.heading(column, text=column.title())
+            self.scrim_tree.column(column, width=180 if column == 'player' else 80)
+        self.scrim_tree.pack(fill='both', expand=True, padx=5, pady=5)
 
     # Event handlers
     def update_elims(self, delta):
         new_value = self.elim_count.get() + delta
         if new_value >= 0:
             self.elim_count.set(new_value)
+            if delta > 0:
+                self.play_sound('elimination')
+            self.stats_store.incr('eliminations', delta)
+            self.session.elim(delta)
             self.update_stats()
 
     def record_victory(self):
-        self.stats['victories'] = self.stats.get('victories', 0) + 1
-        self.save_stats()
+        self.play_sound('victory')
+        self.stats_store.incr('victories')
+        self.session.victory()
         self.update_stats()
         
-        popup = tk.Toplevel(self.root)
-        popup.geometry("300x200")
-        popup.configure(bg=self.colors['success'])
-        
-        tk.Label(
-            popup,
-            text="VICTORY ROYALE!",
-            bg=self.colors['success'],
-            fg='black',
-            font=('Arial', 24, 'bold')
-        ).pack(expand=True)
-        
-        popup.after(3000, popup.destroy)
+        self.popups.toast(
+            "VICTORY ROYALE!",
+            self.colors['success'],
+            duration=3000,
+            key='victory'
+        )
 
-    def start_poll(self, question):
-        popup = tk.Toplevel(self.root)
-        popup.geometry("400x300")
-        popup.configure(bg=self.colors['bg'])
-        popup.title("Poll")
-        
-        tk.Label(
-            popup,
-            text=question,
-            bg=self.colors['bg'],
+    def start_poll(self, question, options=("Yes", "No"), duration=60):
+        poll = self.polls.start(question, options, duration)
+        self.poll_dialog = self.popups.dialog(
+            "Poll",
+            poll.summary(),
+            ["End Poll"],
+            on_choice=lambda choice, p=poll: self.end_poll(p)
+        )
+        if self.poll_tick_id is None:
+            self.poll_tick()
+
+    def poll_tick(self):
+        # Closes time-boxed polls and flushes throttled tallies while chat is
+        # quiet; stops once no poll is open
+        self.poll_tick_id = None
+        self.polls.tick()
+        poll = self.polls.poll
+        if poll is not None and not poll.closed:
+            self.poll_tick_id = self.root.after(int(self.polls.push_interval * 1000), self.poll_tick)
+
+    def end_poll(self, poll):
+        # A dialog left over from an earlier poll must not end the current one
+        if self.polls.poll is poll:
+            self.polls.close()
+
+    def on_poll_update(self, poll):
+        if self.poll_dialog is not None:
+            status = "closed" if poll.closed else f"{poll.total} votes"
+            self.popups.update_dialog(self.poll_dialog, f"{poll.summary()}\n\n({status})")
+        if self.overlay.running:
+            self.overlay.update(poll=poll.overlay_state())
+        if self.frame_overlays:
+            self.update_frame_overlays(**self.poll_overlay_fields(poll))
+
+    def poll_overlay_fields(self, poll):
+        fields = {'poll_question': poll.question + (" (closed)" if poll.closed else "")}
+        results = poll.results()
+        for i in range(4):
+            if i < len(results):
+                option, count, share = results[i]
+                fields[f'poll_option_{i}'] = f"{i + 1}. {option}  {count} ({share * 100:.0f}%)"
+            else:
+                fields[f'poll_option_{i}'] = ''
+        return fields
+
+    def on_poll_closed(self, poll):
+        winner = poll.winner()
+        self.popups.toast(
+            f"Poll Winner:\n{winner}" if winner else "Poll Closed:\nNo votes",
+            self.colors['accent'],
+            duration=4000,
             fg='white',
-            font=('Arial', 16)
-        ).pack(pady=20)
-        
-        options_frame = tk.Frame(popup, bg=self.colors['bg'])
-        options_frame.pack(expand=True)
-        
-        for option in ["Yes", "No"]:
-            self.create_button(
-                options_frame,
-                option,
-                popup.destroy
-            ).pack(side=tk.LEFT, padx=10)
+            font=('Arial', 16, 'bold'),
+            size="400x200"
+        )
 
-    def start_prediction(self, question):
-        popup = tk.Toplevel(self.root)
-        popup.geometry("400x300")
-        popup.configure(bg=self.colors['bg'])
-        popup.title("Prediction")
+    def start_prediction(self, question, outcomes=("Yes", "No")):
+        # numpy is only needed once a prediction is actually run
+        from predictions import PredictionLedger
         
-        tk.Label(
-            popup,
-            text=question,
-            bg=self.colors['bg'],
+        if self.prediction is not None:
+            # Replacing an open prediction refunds it
+            self.resolve_prediction(None, self.prediction)
+        ledger = self.prediction = PredictionLedger(question, outcomes)
+        self.prediction_dialog = self.popups.dialog(
+            "Prediction",
+            self.prediction_text(),
+            [f"{outcome} Wins" for outcome in outcomes] + ["Cancel"],
+            on_choice=lambda choice: self.resolve_prediction(choice, ledger)
+        )
+
+    def prediction_text(self):
+        return f"{self.prediction.summary()}\n\nChat: !predict <number> <points>"
+
+    def resolve_prediction(self, choice, ledger):
+        # Each dialog is bound to its own ledger; a stale one is ignored
+        if ledger is None or ledger is not self.prediction:
+            return
+        self.prediction = None
+        labels = [f"{outcome} Wins" for outcome in ledger.outcomes]
+        if choice not in labels:
+            # Cancelled or closed: everyone is refunded
+            ledger.payouts = ledger.points[:ledger.count].copy()
+            message = "Prediction Cancelled:\nPoints refunded"
+        else:
+            winner = labels.index(choice)
+            ledger.resolve(winner)
+            message = (
+                f"{ledger.outcomes[winner]} Wins!\n"
+                f"{int(ledger.payouts.sum()):,} points to {int((ledger.payouts > 0).sum()):,} viewers"
+            )
+        try:
+            ledger.save()
+        except Exception as e:
+            print(f"Error saving prediction ledger: {e}")
+        self.popups.toast(
+            message,
+            self.colors['accent'],
+            duration=4000,
             fg='white',
-            font=('Arial', 16)
-        ).pack(pady=20)
-        
-        options_frame = tk.Frame(popup, bg=self.colors['bg'])
-        options_frame.pack(expand=True)
-        
-        for option in ["Yes", "No"]:
-            self.create_button(
-                options_frame,
-                option,
-                popup.destroy
-            ).pack(side=tk.LEFT, padx=10)
+            font=('Arial', 16, 'bold'),
+            size="400x200"
+        )
 
     def start_custom_prediction(self):
         if self.pred_entry.get().strip():
@@ -543,79 +833,686 @@ class FortniteCompanion:
 
     def start_new_game(self):
         self.elim_count.set(0)
-        self.stats['games_played'] = self.stats.get('games_played', 0) + 1
-        self.save_stats()
+        self.stats_store.incr('games_played')
+        self.session.new_game()
         self.update_stats()
 
     def mark_top_10(self):
-        self.stats['top_10s'] = self.stats.get('top_10s', 0) + 1
-        self.save_stats()
+        self.stats_store.incr('top_10s')
+        self.session.top_10()
         self.update_stats()
         
-        popup = tk.Toplevel(self.root)
-        popup.geometry("300x200")
-        popup.configure(bg=self.colors['warning'])
-        
-        tk.Label(
-            popup,
-            text="TOP 10!",
-            bg=self.colors['warning'],
-            fg='black',
-            font=('Arial', 24, 'bold')
-        ).pack(expand=True)
-        
-        popup.after(2000, popup.destroy)
+        self.popups.toast(
+            "TOP 10!",
+            self.colors['warning'],
+            duration=2000,
+            key='top_10'
+        )
+
+    def toggle_hud_detection(self):
+        if self.hud_watcher is not None and self.hud_watcher.running:
+            self.hud_watcher.stop()
+            self.popups.toast("HUD detection off", self.colors['bg'], duration=2000,
+                              fg='white', font=('Arial', 14), size="300x100")
+            return
+        from frame_sources import open_source
+        from hud_detector import HudDetector, HudWatcher
+        # Events go through the bus, so the detector thread never touches Tk
+        spec = os.environ.get('HUD_SOURCE') or os.environ.get('REPLAY_SOURCE', '0')
+        try:
+            detector = HudDetector(self.bus.post)
+            source = open_source(spec)
+        except Exception as e:
+            messagebox.showerror("HUD Detection", f"Could not start HUD detection: {e}")
+            return
+        detector.elims = self.elim_count.get()
+        self.hud_watcher = HudWatcher(detector, source)
+        self.hud_watcher.start()
+        self.popups.toast("HUD detection on", self.colors['success'], duration=2000,
+                          fg='black', font=('Arial', 14, 'bold'), size="300x100")
+
+    def update_stats(self):
+        # Pushed once per frame by the event bus; only labels whose text
+        # actually changed are touched
+        self.bus.coalesce('session_stats', self.push_stats)
+
+    def push_stats(self):
+        self.session.push()
+        if self.overlay.running:
+            # The overlay server diffs these and only sends what changed
+            self.overlay.update(
+                victories=self.session.victories,
+                eliminations=self.session.eliminations,
+                games_played=self.session.games_played,
+                kd=self.session.render('K/D Ratio'),
+                win_rate=self.session.render('Win Rate'),
+                top_10s=self.session.top_10s
+            )
+        if self.frame_overlays:
+            self.update_frame_overlays(
+                victories=self.session.victories,
+                eliminations=self.session.eliminations,
+                games_played=self.session.games_played,
+                kd=self.session.render('K/D Ratio'),
+                win_rate=self.session.render('Win Rate'),
+                top_10s=self.session.top_10s
+            )
+
+    def update_frame_overlays(self, **fields):
+        for renderer in self.frame_overlays.values():
+            renderer.update(**fields)
+            renderer.render()
+
+    def toggle_frame_overlay(self, overlay_type, visible):
+        from overlay_renderer import OverlayRenderer, frame_path
+        renderer = self.frame_overlays.pop(overlay_type, None)
+        if renderer is not None:
+            renderer.close()
+        if not visible:
+            return
+        try:
+            renderer = OverlayRenderer(overlay_type, frame_path(overlay_type))
+        except Exception as e:
+            print(f"Error creating overlay frame buffer: {e}")
+            return
+        self.frame_overlays[overlay_type] = renderer
+        self.push_stats()
+        fields = {'custom_text': self.overlay.state.get('custom_text', '')}
+        if self.challenge is not None:
+            fields['challenge'] = self.challenge[0]
+        if self.tournament is not None:
+            fields.update(self.tournament_overlay_fields())
+        if self.polls.poll is not None:
+            fields.update(self.poll_overlay_fields(self.polls.poll))
+        renderer.update(**fields)
+        renderer.render()
+        if overlay_type == "Challenge Timer" and not self.challenge_timer_running:
+            self.challenge_timer_running = True
+            self.tick_challenge_timer()
+
+    def tick_challenge_timer(self):
+        renderer = self.frame_overlays.get("Challenge Timer")
+        if renderer is None:
+            # Loop ends with the overlay; toggling it on again starts one
+            self.challenge_timer_running = False
+            return
+        if self.challenge is not None:
+            from overlay_renderer import format_timer
+            # Only the timer box changes, and only once a second
+            renderer.update(challenge_timer=format_timer(time.time() - self.challenge[1]))
+            renderer.render()
+        self.root.after(250, self.tick_challenge_timer)
 
     def reset_session(self):
-        self.stats = {'victories': 0, 'eliminations': 0, 'games_played': 0, 'top_10s': 0}
+        # The account_* totals come from the stats API, not this session, so
+        # they survive the reset
+        account = {k: v for k, v in self.stats_store.stats.items() if k.startswith('account_')}
+        self.stats_store.reset({**DEFAULT_STATS, **account})
+        self.session.reset()
         self.elim_count.set(0)
-        self.save_stats()
         self.update_stats()
 
     def save_clip(self):
-        # Placeholder for clip saving functionality
-        pass
+        if self.replay_capture is None or not self.replay_capture.running:
+            # First press arms instant replay; clips are available from then on
+            self.start_instant_replay()
+            return
+        if not self.replay_buffer.index:
+            self.popups.toast("Replay buffer is still empty", self.colors['bg'], duration=2000,
+                              fg='white', font=('Arial', 14), size="300x100")
+            return
+        
+        os.makedirs('clips', exist_ok=True)
+        path = os.path.join('clips', f"clip-{datetime.now().strftime('%Y%m%d-%H%M%S')}.mjpeg")
+        # The snapshot is taken up front; writing it never holds up capture
+        threading.Thread(target=self.write_clip, args=(path,), name='clip-writer', daemon=True).start()
+
+    def write_clip(self, path):
+        try:
+            info = self.replay_buffer.save(path)
+        except OSError as e:
+            print(f"Error saving clip: {e}")
+            return
+        if info is None:
+            return
+        print(f"Saved clip {path}: {info['duration']:.1f}s, {info['bytes'] / 1e6:.1f} MB "
+              f"in {info['save_ms']:.0f} ms")
+        self.bus.post('call', lambda: self.popups.toast(
+            f"Clip saved ({info['duration']:.0f}s)", self.colors['accent'], duration=2000,
+            fg='white', font=('Arial', 14, 'bold'), size="300x100"
+        ))
+
+    def start_instant_replay(self):
+        from frame_sources import open_source
+        seconds = int(os.environ.get('REPLAY_SECONDS', 30))
+        megabytes = int(os.environ.get('REPLAY_BUFFER_MB', 256))
+        try:
+            source = open_source(os.environ.get('REPLAY_SOURCE', '0'))
+        except OSError as e:
+            messagebox.showerror("Instant Replay", f"Could not open replay source: {e}")
+            return
+        if self.replay_buffer is None:
+            self.replay_buffer = ReplayBuffer(seconds=seconds, max_bytes=megabytes * 1024 * 1024)
+        self.replay_capture = ReplayCapture(self.replay_buffer, source)
+        self.replay_capture.start()
+        self.popups.toast(f"Instant replay on\nSave Clip keeps the last {seconds}s", self.colors['bg'],
+                          duration=2000, fg='white', font=('Arial', 14), size="350x120")
 
     def toggle_overlay(self):
-        # Placeholder for overlay toggle functionality
-        pass
+        if self.overlay.running:
+            self.overlay.stop()
+            messagebox.showinfo("Overlay", "Overlay server stopped")
+            return
+        self.start_overlay_server()
+        if self.overlay.running:
+            messagebox.showinfo("Overlay", f"Overlay server running at http://{self.overlay.host}:{self.overlay.port}/")
 
-    def start_tournament(self, t_type):
-        # Placeholder for tournament functionality
-        pass
+    def start_overlay_server(self):
+        if not self.overlay.running:
+            self.overlay.start()
+            self.push_stats()
+            self.push_tournament()
+            if self.polls.poll is not None:
+                self.overlay.update(poll=self.polls.poll.overlay_state())
 
-    def start_challenge(self, challenge):
-        popup = tk.Toplevel(self.root)
-        popup.geometry("400x200")
-        popup.configure(bg=self.colors['bg'])
+    def toggle_overlay_type(self, overlay_type):
+        self.start_overlay_server()
+        if not self.overlay.running:
+            messagebox.showerror("Overlay", "Could not start the overlay server")
+            return
         
-        tk.Label(
-            popup,
-            text=f"Challenge Started:\n{challenge}",
-            bg=self.colors['bg'],
+        slug = OVERLAY_TYPES[overlay_type][0]
+        visible = overlay_type not in self.visible_overlays
+        if visible and overlay_type == "Custom Text":
+            text = simpledialog.askstring("Custom Text", "Overlay text:", parent=self.root)
+            if text is None:
+                return
+            self.overlay.update(custom_text=text)
+            self.update_frame_overlays(custom_text=text)
+        self.overlay.update(**{'visible:' + slug: visible})
+        if visible:
+            self.visible_overlays.add(overlay_type)
+        else:
+            self.visible_overlays.discard(overlay_type)
+        if self.render_frames:
+            self.toggle_frame_overlay(overlay_type, visible)
+        
+        # Browser source URL goes straight to the clipboard for OBS
+        url = self.overlay.url(overlay_type)
+        self.root.clipboard_clear()
+        self.root.clipboard_append(url)
+        self.popups.toast(
+            f"{overlay_type} {'ON' if visible else 'OFF'}\nURL copied",
+            self.colors['accent'],
+            duration=2000,
             fg='white',
-            font=('Arial', 16)
-        ).pack(expand=True)
+            font=('Arial', 16, 'bold'),
+            size="400x200"
+        )
+
+    def start_tournament(self, t_type):
+        from tournament import Tournament, TOURNAMENT_RULES
+        if self.tournament is not None and self.tournament.matches and not messagebox.askyesno(
+            "Tournament", f"Discard the running {self.tournament.name} standings?"
+        ):
+            return
+        name = f"{t_type} {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        self.tournament = Tournament(
+            name, TOURNAMENT_RULES[t_type],
+            on_update=lambda t: self.bus.coalesce('tournament', self.push_tournament)
+        )
+        self.push_tournament()
+        self.popups.toast(
+            f"Tournament Started:\n{t_type}",
+            self.colors['accent'],
+            duration=3000,
+            fg='white',
+            font=('Arial', 16, 'bold'),
+            size="400x200"
+        )
+
+    def add_tournament_results(self):
+        from tournament import load_match_results
+        if self.tournament is None:
+            messagebox.showinfo("Tournament", "Start a tournament first")
+            return
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Match results", "*.csv *.json")]
+        )
+        if not file_path:
+            return
+        try:
+            results = load_match_results(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Tournament", f"Could not read results: {e}")
+            return
+        if not results:
+            messagebox.showerror("Tournament", "No results found in file")
+            return
+        self.tournament.add_match(results)
+        self.save_tournament()
+
+    def undo_tournament_match(self):
+        if self.tournament is not None and self.tournament.undo_match():
+            self.save_tournament()
+
+    def save_tournament(self):
+        os.makedirs('tournaments', exist_ok=True)
+        path = os.path.join('tournaments', self.tournament.name.replace(':', '-') + '.json')
+        try:
+            self.tournament.save(path)
+        except OSError as e:
+            print(f"Error saving tournament: {e}")
+
+    def tournament_overlay_fields(self):
+        # Frame overlays have fixed rows; the browser overlay gets the list
+        board = self.tournament.leaderboard(5)
+        fields = {'tournament_name': self.tournament.name}
+        for i in range(5):
+            fields[f'leaderboard_{i}'] = f"{board[i][0]}  {board[i][1]}" if i < len(board) else ''
+        return fields
+
+    def push_tournament(self):
+        tournament = self.tournament
+        if tournament is None:
+            return
+        # The tree shows the top of the board plus our team; with hundreds
+        # of teams the rest is not worth redrawing after every match
+        tree = self.tournament_tree
+        tree.delete(*tree.get_children())
+        shown = tournament.top(50)
+        if self.tournament_team in tournament.teams and tournament.rank(self.tournament_team) > 50:
+            shown.append(tournament.standing(self.tournament_team))
+        for standing in shown:
+            tree.insert('', 'end', values=(
+                tournament.rank(standing.team), standing.team, standing.points, standing.wins,
+                f"{standing.avg_placement:.1f}", standing.eliminations, standing.matches
+            ))
+        self.tournament_status.configure(text=f"{tournament.name}: {len(tournament)} teams")
         
-        popup.after(3000, popup.destroy)
+        leader = tournament.top(1)
+        ours = tournament.standing(self.tournament_team)
+        self.tournament_stats['Tournament'].set(tournament.name)
+        self.tournament_stats['Matches'].set(str(len(tournament.matches)))
+        self.tournament_stats['Leader'].set(f"{leader[0].team} ({leader[0].points})" if leader else '-')
+        self.tournament_stats['Our Rank'].set(
+            f"{tournament.rank(self.tournament_team)} / {len(tournament)}" if ours else '-'
+        )
+        self.tournament_stats['Our Points'].set(str(ours.points) if ours else '-')
+        
+        if self.overlay.running:
+            self.overlay.update(tournament_name=tournament.name, leaderboard=tournament.leaderboard(10))
+        if self.frame_overlays:
+            self.update_frame_overlays(**self.tournament_overlay_fields())
+
+    def start_challenge(self, challenge):
+        self.challenge = (challenge, time.time())
+        if self.overlay.running:
+            self.overlay.update(challenge=challenge, challenge_started_at=self.challenge[1])
+        self.update_frame_overlays(challenge=challenge)
+        self.popups.toast(
+            f"Challenge Started:\n{challenge}",
+            self.colors['bg'],
+            duration=3000,
+            fg='white',
+            font=('Arial', 16),
+            size="400x200"
+        )
 
     def connect_stream(self):
-        # Placeholder for stream connection logic
-        self.stream_connected = not self.stream_connected
-        status = "Connected" if self.stream_connected else "Disconnected"
-        messagebox.showinfo("Stream Status", f"Stream {status}")
+        if self.chat_client is not None:
+            self.chat_client.stop()
+            self.chat_client = None
+            self.stream_connected = False
+            messagebox.showinfo("Stream Status", "Stream Disconnected")
+            return
+        
+        channel = os.environ.get('TWITCH_CHANNEL') or simpledialog.askstring(
+            "Connect to Twitch", "Twitch channel:", parent=self.root
+        )
+        if not channel:
+            return
+        
+        # Chat runs on its own asyncio thread; batches reach Tk via the event bus
+        self.chat_client = TwitchChatClient(
+            channel,
+            on_batch=lambda batch: self.bus.post('chat', batch),
+            on_status=lambda text: self.bus.post('chat_status', text),
+            nick=os.environ.get('TWITCH_NICK'),
+            token=os.environ.get('TWITCH_TOKEN'),
+            host=os.environ.get('TWITCH_IRC_HOST', TWITCH_IRC_HOST),
+            port=int(os.environ.get('TWITCH_IRC_PORT', TWITCH_IRC_PORT))
+        )
+        self.chat_client.start()
+        self.stream_connected = True
+        messagebox.showinfo("Stream Status", f"Stream Connected to #{channel.lstrip('#')}")
+
+    def on_chat_messages(self, batch):
+        self.chat_messages += len(batch)
+        self.polls.ingest(batch)
+        if self.prediction is not None and self.prediction.ingest(batch):
+            self.popups.update_dialog(self.prediction_dialog, self.prediction_text())
+        for message in batch:
+            # Reward redemptions with text arrive as tagged chat messages
+            if message.raw_tags and 'custom-reward-id=' in message.raw_tags:
+                tags = message.tags
+                self.redemptions.submit({
+                    'id': tags.get('id') or f"{message.user_id}-{tags.get('tmi-sent-ts')}",
+                    'reward': tags['custom-reward-id'],
+                    'user': message.user_id,
+                    'input': message.text
+                })
+        for reply in self.chat_commands.dispatch_batch(batch):
+            if not (self.chat_client and self.chat_client.send(reply)):
+                print(f"Chat reply: {reply}")
+
+    def register_chat_commands(self):
+        # Replies read live data from the Tk thread, where chat batches are handled
+        commands = self.chat_commands
+        commands.register(
+            'elims', lambda user, args: f"Eliminations this game: {self.elim_count.get()}",
+            aliases=('kills',), global_cooldown=5, description="eliminations this game"
+        )
+        commands.register(
+            'wins', lambda user, args: f"Victory Royales: {self.stats.get('victories', 0)}",
+            aliases=('victories', 'dubs'), global_cooldown=5, description="total victories"
+        )
+        commands.register(
+            'stats', lambda user, args: (
+                f"Games {self.session.render('Games Played')} | "
+                f"Wins {self.session.render('Victories')} | "
+                f"Elims {self.session.render('Eliminations')} | "
+                f"K/D {self.session.render('K/D Ratio')} | "
+                f"Win Rate {self.session.render('Win Rate')} | "
+                f"Top 10s {self.session.render('Top 10s')}"
+            ),
+            aliases=('session',), global_cooldown=10, user_cooldown=60, description="session stats"
+        )
+        commands.register(
+            'kd', lambda user, args: f"K/D: {self.session.render('K/D Ratio')}",
+            global_cooldown=5, description="session K/D ratio"
+        )
+        commands.register(
+            'commands', lambda user, args: ' '.join('!' + c.name for c in commands.commands),
+            aliases=('help',), global_cooldown=30, description="list commands"
+        )
+
+    def on_chat_status(self, text):
+        print(f"Chat: {text}")
 
     def start_scrim(self, scrim_type):
-        # Placeholder for scrim functionality
-        messagebox.showinfo("Scrim Started", f"Starting {scrim_type} scrim mode")
+        self.current_mode = scrim_type
+        # Imports without a mode column are filed under the current mode
+        self.popups.toast(
+            f"Scrim Mode:\n{scrim_type}",
+            self.colors['accent'],
+            duration=2000,
+            fg='white',
+            font=('Arial', 16, 'bold'),
+            size="400x200"
+        )
+        if scrim_type in self.get_scrim_store().modes:
+            self.scrim_mode.set(scrim_type)
+        else:
+            self.refresh_scrim_results()
+
+    def get_scrim_store(self):
+        if self.scrim_store is None:
+            # numpy is only needed once scrim results are used
+            from scrim_import import ScrimStore
+            self.scrim_store = ScrimStore.load()
+        return self.scrim_store
+
+    def import_scrim_files(self):
+        paths = filedialog.askopenfilenames(
+            filetypes=[("Scrim results", "*.csv *.json *.jsonl")]
+        )
+        if paths:
+            self.import_scrim_results(list(paths))
+
+    def import_scrim_folder(self):
+        from scrim_import import find_result_files
+        folder = filedialog.askdirectory()
+        if folder:
+            self.import_scrim_results(find_result_files(folder))
+
+    def import_scrim_results(self, paths):
+        if not paths:
+            messagebox.showinfo("Scrim Results", "No result files found")
+            return
+        if self.scrim_import_thread is not None and self.scrim_import_thread.is_alive():
+            messagebox.showinfo("Scrim Results", "An import is already running")
+            return
+        store = self.get_scrim_store()
+        self.scrim_status.configure(text=f"Importing {len(paths)} files...")
+        
+        def progress(done, total):
+            if done % 20 == 0 or done == total:
+                self.bus.post('call', lambda: self.scrim_status.configure(text=f"Importing {done}/{total} files..."))
+        
+        def run():
+            try:
+                result = store.import_files(paths, default_mode=self.current_mode, on_progress=progress)
+                store.save()
+            except Exception as e:
+                print(f"Error importing scrim results: {e}")
+                self.bus.post('call', lambda error=e: self.scrim_status.configure(text=f"Import failed: {error}"))
+                return
+            self.bus.post('call', lambda: self.scrim_import_done(result))
+        
+        self.scrim_import_thread = threading.Thread(target=run, daemon=True)
+        self.scrim_import_thread.start()
+
+    def scrim_import_done(self, result):
+        self.refresh_scrim_results()
+        self.popups.toast(
+            f"Imported {result['rows']:,} results\nfrom {result['files']} files",
+            self.colors['success'],
+            duration=2500,
+            fg='white',
+            font=('Arial', 14, 'bold'),
+            size="300x100"
+        )
+
+    def refresh_scrim_results(self):
+        store = self.scrim_store
+        if store is None:
+            return
+        self.scrim_mode_box['values'] = ['All modes'] + list(store.modes)
+        mode = self.scrim_mode.get()
+        mode = None if mode == 'All modes' else mode
+        sort = self.scrim_sort.get()
+        rows = store.query(mode=mode, search=self.scrim_search.get().strip(), sort=sort,
+                           descending=sort != 'avg_placement', limit=200)
+        
+        tree = self.scrim_tree
+        tree.delete(*tree.get_children())
+        for row in rows:
+            tree.insert('', 'end', values=(
+                row['player'], row['matches'], row['eliminations'], f"{row['avg_elims']:.2f}",
+                row['wins'], f"{row['avg_placement']:.1f}", row['top_10s'], row['storm_deaths']
+            ))
+        summary = store.summary(mode)
+        status = (f"{summary['lobbies']} matches, {summary['players']} players, "
+                  f"{summary['eliminations']:,} elims, {summary['storm_deaths']:,} storm deaths")
+        if store.last_import is not None:
+            status += f" | last import {store.last_import['files']} files in {store.last_import['seconds']:.1f}s"
+        self.scrim_status.configure(text=status)
 
     def load_vod(self):
         file_path = filedialog.askopenfilename(
             filetypes=[("Video files", "*.mp4 *.avi *.mkv")]
         )
         if file_path:
-            self.current_vod = file_path
-            messagebox.showinfo("VOD Loaded", "VOD file loaded successfully")
+            self.open_vod_review(file_path)
+
+    def open_vod_review(self, file_path):
+        from vod_timeline import ThumbnailStrip, FrameReader
+        from vod_notes import VodNotes
+        try:
+            # Reopening a VOD only maps its cached strip; the video itself is
+            # opened by the background threads below
+            strip = ThumbnailStrip(file_path)
+        except OSError as e:
+            messagebox.showerror("VOD Review", f"Could not open VOD file: {e}")
+            return
+        self.close_vod_review()
+        if self.hud_watcher is not None:
+            self.hud_watcher.stop()
+        self.current_vod = file_path
+        self.vod_strip = strip
+        self.vod_notes = VodNotes(file_path)
+        threading.Thread(
+            target=self.load_keyframe_index, args=(self.vod_notes,), name='vod-keyframes', daemon=True
+        ).start()
+        self.build_vod_panel()
+        self.vod_scale.configure(to=max(strip.duration, 1))
+        self.vod_position.set(0)
+        
+        self.vod_reader = FrameReader(
+            file_path,
+            on_frame=lambda seconds, frame: self.bus.coalesce('vod_frame', self.show_vod_frame, seconds, frame)
+        )
+        if not strip.complete:
+            self.vod_fill_stop = threading.Event()
+            threading.Thread(
+                target=strip.fill,
+                args=(self.vod_fill_stop, lambda index: self.bus.coalesce('vod_strip', self.draw_vod_strip)),
+                name='vod-thumbnails',
+                daemon=True
+            ).start()
+        self.on_vod_scrub(0)
+
+    def load_keyframe_index(self, notes):
+        # One ffprobe pass per VOD, cached; until it is ready notes seek by time
+        from vod_notes import KeyframeIndex
+        try:
+            notes.keyframes = KeyframeIndex.load_or_build(notes.vod_path)
+        except Exception as e:
+            print(f"Warning: Could not index VOD keyframes: {e}")
+
+    def close_vod_review(self):
+        if self.vod_notes is not None:
+            self.vod_notes.close()
+            self.vod_notes = None
+        if self.vod_fill_stop is not None:
+            self.vod_fill_stop.set()
+            self.vod_fill_stop = None
+        if self.vod_reader is not None:
+            self.vod_reader.close()
+            self.vod_reader = None
+
+    def build_vod_panel(self):
+        if self.vod_panel is not None:
+            return
+        self.vod_panel = tk.Frame(self.vod_frame, bg=self.colors['bg'])
+        self.vod_panel.pack(fill='both', expand=True, padx=20, pady=5)
+        self.vod_preview = tk.Label(self.vod_panel, bg='black')
+        self.vod_preview.pack(pady=5)
+        self.vod_position = tk.DoubleVar(value=0)
+        self.vod_scale = ttk.Scale(self.vod_panel, from_=0, to=1, variable=self.vod_position,
+                                   command=self.on_vod_scrub)
+        self.vod_scale.pack(fill='x')
+        self.vod_time_label = tk.Label(self.vod_panel, bg=self.colors['bg'], fg='white', font=('Arial', 12))
+        self.vod_time_label.pack()
+        # Five thumbnails around the playhead; click one to jump there
+        self.vod_strip_canvas = tk.Canvas(self.vod_panel, width=5 * 164, height=94,
+                                          bg=self.colors['secondary'], highlightthickness=0)
+        self.vod_strip_canvas.pack(pady=5)
+        self.vod_strip_canvas.bind('<Button-1>', self.on_vod_strip_click)
+        self.vod_strip_images = []
+        # Notes within five minutes of the playhead
+        self.vod_notes_list = tk.Listbox(self.vod_panel, height=6, bg=self.colors['secondary'],
+                                         fg='white', font=('Arial', 11))
+        self.vod_notes_list.pack(fill='x', pady=5)
+        self.vod_notes_list.bind('<Double-1>', self.on_vod_note_click)
+        self.vod_notes_shown = []
+
+    def on_vod_scrub(self, value):
+        strip = self.vod_strip
+        if strip is None:
+            return
+        seconds = float(value)
+        whole = int(seconds)
+        self.vod_time_label.configure(
+            text=f"{whole // 3600}:{whole // 60 % 60:02}:{whole % 60:02} / "
+                 f"{int(strip.duration) // 3600}:{int(strip.duration) // 60 % 60:02}:{int(strip.duration) % 60:02}"
+        )
+        # The cached thumbnail shows at once; the full frame replaces it when
+        # the reader has decoded it
+        index = strip.nearest_filled(strip.index_at(seconds))
+        if index is not None:
+            from vod_timeline import photo_data
+            image = tk.PhotoImage(data=photo_data(strip.thumbs[index]), format='PPM').zoom(4)
+            self.vod_preview.configure(image=image)
+            self.vod_preview.image = image
+        self.draw_vod_strip()
+        self.show_vod_notes()
+        self.vod_reader.request(seconds)
+
+    def show_vod_frame(self, seconds, frame):
+        if self.vod_strip is None or abs(seconds - self.vod_position.get()) > 0.5:
+            return
+        from vod_timeline import photo_data
+        image = tk.PhotoImage(data=photo_data(frame), format='PPM')
+        self.vod_preview.configure(image=image)
+        self.vod_preview.image = image
+
+    def draw_vod_strip(self):
+        strip = self.vod_strip
+        if strip is None:
+            return
+        from vod_timeline import photo_data
+        canvas = self.vod_strip_canvas
+        canvas.delete('all')
+        self.vod_strip_images = []
+        center = strip.index_at(self.vod_position.get())
+        for slot in range(5):
+            index = center - 2 + slot
+            x = slot * 164 + 2
+            if not 0 <= index < strip.count:
+                continue
+            if strip.filled[index]:
+                image = tk.PhotoImage(data=photo_data(strip.thumbs[index]), format='PPM')
+                self.vod_strip_images.append(image)
+                canvas.create_image(x, 2, image=image, anchor='nw')
+            else:
+                canvas.create_rectangle(x, 2, x + 160, 92, fill=self.colors['highlight'], outline='')
+            if slot == 2:
+                canvas.create_rectangle(x - 1, 1, x + 161, 93, outline=self.colors['accent'], width=2)
+
+    def show_vod_notes(self):
+        if self.vod_notes is None or self.vod_panel is None:
+            return
+        position = self.vod_position.get()
+        shown = self.vod_notes.between(position - 300, position + 300, limit=200)
+        if shown == self.vod_notes_shown:
+            return
+        self.vod_notes_shown = shown
+        self.vod_notes_list.delete(0, 'end')
+        for seconds, kind, text in shown:
+            whole = int(seconds)
+            self.vod_notes_list.insert(
+                'end', f"{whole // 3600}:{whole // 60 % 60:02}:{whole % 60:02}  {text or kind}"
+            )
+
+    def on_vod_note_click(self, event):
+        selected = self.vod_notes_list.curselection()
+        if not selected or self.vod_strip is None:
+            return
+        # Snap to the keyframe at or before the note: shown with one decode
+        seconds, _ = self.vod_notes.seek_point(self.vod_notes_shown[selected[0]][0])
+        self.vod_position.set(seconds)
+        self.on_vod_scrub(seconds)
+
+    def on_vod_strip_click(self, event):
+        strip = self.vod_strip
+        if strip is None:
+            return
+        index = strip.index_at(self.vod_position.get()) - 2 + event.x // 164
+        if 0 <= index < strip.count:
+            self.vod_position.set(strip.time_at(index))
+            self.on_vod_scrub(strip.time_at(index))
 
     def load_sound_effects(self):
         # Load common sound effects
@@ -625,75 +1522,474 @@ class FortniteCompanion:
             'death': 'sounds/death.wav'
         }
         
+        # Decoding happens on the sound engine's loader thread
         for name, file in sound_files.items():
-            try:
-                self.sound_effects[name] = pygame.mixer.Sound(file)
-            except:
-                print(f"Could not load sound effect: {file}")
+            self.sound_effects.register(name, file)
+        if os.path.isdir('sounds/custom'):
+            self.sound_effects.load_pack('sounds/custom')
 
     def play_sound(self, sound_name):
-        if self.sound_effects is None:
-            return
-        if sound_name in self.sound_effects:
-            try:
-                self.sound_effects[sound_name].play()
-            except:
-                print(f"Warning: Could not play sound {sound_name}")
+        # pygame and the mixer are started on first use
+        if not self.sound_effects.files:
+            with self.profiler.section("load_sound_effects"):
+                self.load_sound_effects()
+        try:
+            self.sound_effects.play(sound_name)
+        except Exception:
+            print(f"Warning: Could not play sound {sound_name}")
 
     def run(self):
+        # Idle callbacks run once the first frame has been drawn
+        self.root.after_idle(self.profiler.report)
         self.root.mainloop()
 
-    def load_stats(self):
+    def on_close(self):
+        # Producers first, the bus last, so nothing posts into a stopped bus.
+        # Queued redemptions stay unacked and are delivered again next start.
+        self.closing = True
+        if self.chat_client is not None:
+            self.chat_client.stop()
+        self.redemptions.stop(drain=False)
+        self.overlay.stop()
+        if self.replay_capture is not None:
+            self.replay_capture.stop()
+        if self.recorder is not None and self.recorder.running:
+            self.stop_replay_recording()
+        if self.highlights is not None:
+            self.highlights.shutdown()
+        self.close_vod_review()
+        if self.hud_watcher is not None:
+            self.hud_watcher.stop()
+        if self.stats_api is not None:
+            self.stats_api.close()
+        for renderer in self.frame_overlays.values():
+            renderer.close()
+        self.sound_effects.stop()
         try:
-            with open('stats.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print("No existing stats file found, creating new one")
-            return {'victories': 0, 'eliminations': 0, 'games_played': 0, 'top_10s': 0}
+            self.stats_store.close()
         except Exception as e:
-            print(f"Error loading stats: {e}")
-            return {'victories': 0, 'eliminations': 0, 'games_played': 0, 'top_10s': 0}
+            print(f"Error saving stats: {e}")
+        self.bus.stop()
+        self.root.destroy()
+
+    def load_stats(self):
+        # Snapshot plus replay of the journal tail; self.stats is the store's
+        # live dict so every stats_store mutation is visible immediately
+        return self.stats_store.load()
 
     def quick_stream_poll(self):
         # Placeholder for stream poll functionality
         messagebox.showinfo("Stream Poll", "Starting quick stream poll...")
 
     def manage_channel_points(self):
-        # Placeholder for channel points management
-        messagebox.showinfo("Channel Points", "Opening channel points manager...")
+        stats = self.redemptions.stats
+        rewards = '\n'.join(f"{reward} -> {action}" for reward, action in self.reward_actions.items())
+        if not rewards:
+            rewards = 'none - map reward ids to "challenge:<name>", "poll:<question>" or "sound:<name>"'
+        messagebox.showinfo(
+            "Channel Points",
+            f"Waiting: {self.redemptions.backlog}\n"
+            f"Processed: {stats['processed']}  Failed: {stats['failed']}\n"
+            f"Duplicates: {stats['duplicates']}  Refused (busy): {stats['rejected']}\n\n"
+            f"Rewards (rewards.json):\n{rewards}"
+        )
+
+    def load_reward_actions(self):
+        # Maps reward ids (chat tags only carry the id) to "challenge:<name>",
+        # "poll:<question>" or "sound:<name>"
+        try:
+            with open('rewards.json', 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading rewards.json: {e}")
+            return {}
+
+    def redemption_action(self, redemption):
+        spec = self.reward_actions.get(redemption['reward'])
+        if spec is None:
+            return None
+        kind, _, arg = spec.partition(':')
+        kind = kind.strip().lower()
+        arg = arg.strip() or redemption.get('input', '').strip()
+        if kind == 'challenge' and arg:
+            return lambda: self.start_challenge(arg)
+        if kind == 'poll' and arg:
+            return lambda: self.start_poll(arg)
+        if kind == 'sound' and arg:
+            return lambda: self.play_sound(arg)
+        return None
+
+    def handle_redemption(self, redemption):
+        # Runs on a redemption worker; the action itself runs on the Tk thread
+        # and the redemption is only acked once it has completed
+        action = self.redemption_action(redemption)
+        if action is None:
+            print(f"No action for reward {redemption['reward']}")
+            return
+        done = threading.Event()
+        errors = []
+        
+        def run():
+            try:
+                action()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                done.set()
+        
+        self.bus.post('call', run)
+        deadline = time.monotonic() + 10
+        while not done.wait(0.1):
+            if self.closing:
+                # Left unacked; redelivered on the next start
+                raise RuntimeError("Shutting down before the redemption ran")
+            if time.monotonic() > deadline:
+                raise TimeoutError("UI did not run the redemption in time")
+        if errors:
+            raise errors[0]
 
     def setup_chat_commands(self):
-        # Placeholder for chat commands setup
-        messagebox.showinfo("Chat Commands", "Opening chat commands setup...")
+        messagebox.showinfo("Chat Commands", self.chat_commands.help_text())
 
     def start_replay_recording(self):
-        # Placeholder for replay recording
-        messagebox.showinfo("Replay", "Starting replay recording...")
+        if self.recorder is not None and self.recorder.running:
+            path = self.recorder.path
+            self.stop_replay_recording()
+            self.save_replay_stats(path)
+            messagebox.showinfo("Replay", f"Recording saved to {path}")
+            return
+        
+        from frame_sources import open_source
+        from recorder import ReplayRecorder
+        try:
+            source = open_source(os.environ.get('REPLAY_SOURCE', '0'))
+        except OSError as e:
+            messagebox.showerror("Replay", f"Could not open replay source: {e}")
+            return
+        os.makedirs('replays', exist_ok=True)
+        self.recorder = ReplayRecorder(
+            source,
+            self.replay_path(),
+            fps=int(os.environ.get('REPLAY_FPS', 30)),
+            policy=os.environ.get('REPLAY_DROP_POLICY', 'drop-newest')
+        )
+        self.recorder.start()
+        self.popups.toast("Recording replay", self.colors['bg'], duration=2000,
+                          fg='white', font=('Arial', 14, 'bold'), size="300x100")
+
+    def stop_replay_recording(self):
+        self.recorder.stop()
+        metrics = self.recorder.metrics()
+        print(f"Replay recorder: {metrics['written']} frames written, {metrics['dropped']} dropped "
+              f"({metrics['drop_rate'] * 100:.1f}%), {metrics['encode_fps']:.1f} fps encoded")
+
+    def replay_path(self):
+        return os.path.join('replays', f"replay-{datetime.now().strftime('%Y%m%d-%H%M%S')}.mp4")
 
     def save_replay(self):
-        # Placeholder for replay saving
-        messagebox.showinfo("Replay", "Saving replay...")
+        # Closes the current file as the last match and keeps recording into
+        # a new one, so nothing is lost between matches
+        if self.recorder is None or not self.recorder.running:
+            messagebox.showinfo("Replay", "Start recording first")
+            return
+        path = self.recorder.rotate(self.replay_path())
+        self.save_replay_stats(path)
+        self.popups.toast("Last match saved", self.colors['accent'], duration=2000,
+                          fg='white', font=('Arial', 14, 'bold'), size="300x100")
+
+    def save_replay_stats(self, path):
+        # Session stats at save time are kept next to the video for the
+        # replay library
+        stats = {
+            'saved_at': time.time(),
+            'mode': self.current_mode or '',
+            'eliminations': self.session.eliminations,
+            'victories': self.session.victories,
+            'games_played': self.session.games_played,
+            'top_10s': self.session.top_10s
+        }
+        try:
+            with open(os.path.splitext(path)[0] + '.json', 'w') as f:
+                json.dump(stats, f)
+        except OSError as e:
+            print(f"Warning: Could not save replay stats: {e}")
 
     def view_replays(self):
-        # Placeholder for replay viewing
-        messagebox.showinfo("Replay", "Opening replay viewer...")
+        if self.replay_catalog is None:
+            from replay_catalog import ReplayCatalog
+            self.replay_catalog = ReplayCatalog()
+        catalog = self.replay_catalog
+        
+        window = tk.Toplevel(self.root)
+        window.title("Replay Library")
+        window.geometry("900x500")
+        window.configure(bg=self.colors['bg'])
+        
+        bar = tk.Frame(window, bg=self.colors['bg'])
+        bar.pack(fill='x', padx=10, pady=5)
+        mode_var = tk.StringVar(value='All modes')
+        search_var = tk.StringVar()
+        sort_var = tk.StringVar(value='recorded_at')
+        mode_box = ttk.Combobox(bar, textvariable=mode_var, state='readonly', width=18)
+        mode_box.pack(side='left')
+        tk.Entry(bar, textvariable=search_var, width=25).pack(side='left', padx=5)
+        ttk.Combobox(bar, textvariable=sort_var, values=('recorded_at', 'duration', 'size',
+                     'eliminations', 'victories', 'name', 'mode'), state='readonly', width=12).pack(side='left')
+        status = tk.Label(bar, bg=self.colors['bg'], fg='white')
+        status.pack(side='right')
+        
+        columns = ('name', 'date', 'duration', 'resolution', 'mode', 'elims', 'wins')
+        tree = ttk.Treeview(window, columns=columns, show='headings')
+        for column in columns:
+            tree.heading(column, text=column.title())
+            tree.column(column, width=90 if column != 'name' else 220)
+        tree.pack(side='left', fill='both', expand=True, padx=10, pady=5)
+        preview = tk.Label(window, bg=self.colors['bg'])
+        preview.pack(side='right', padx=10)
+        rows = {}
+        
+        def refresh(*args):
+            mode = mode_var.get()
+            tree.delete(*tree.get_children())
+            rows.clear()
+            for row in catalog.query(mode=None if mode == 'All modes' else mode,
+                                     search=search_var.get().strip(), sort=sort_var.get()):
+                duration = row['duration'] or 0
+                item = tree.insert('', 'end', values=(
+                    row['name'],
+                    datetime.fromtimestamp(row['recorded_at']).strftime('%Y-%m-%d %H:%M'),
+                    f"{int(duration // 60)}:{int(duration % 60):02}",
+                    f"{row['width']}x{row['height']}" if row['width'] else '',
+                    row['mode'] or '',
+                    '' if row['eliminations'] is None else row['eliminations'],
+                    '' if row['victories'] is None else row['victories']
+                ))
+                rows[item] = row
+            mode_box['values'] = ['All modes'] + catalog.modes()
+        
+        def show_thumbnail(event):
+            selected = tree.selection()
+            row = rows.get(selected[0]) if selected else None
+            if row is None or not row['thumbnail'] or not os.path.exists(row['thumbnail']):
+                preview.configure(image='')
+                return
+            preview.image = tk.PhotoImage(file=row['thumbnail'])
+            preview.configure(image=preview.image)
+        
+        def open_replay(event):
+            selected = tree.selection()
+            if selected:
+                # Same state as Load VOD; the tab is built first so its
+                # buttons stay above the review panel
+                self.notebook.select(self.vod_frame)
+                self.build_tab(str(self.vod_frame))
+                self.open_vod_review(rows[selected[0]]['path'])
+        
+        def scan():
+            # Runs off the Tk thread; only new or changed files are probed
+            try:
+                result = catalog.scan(on_progress=lambda done, total: self.bus.post(
+                    'call', lambda: status.winfo_exists() and status.configure(text=f"Probing {done}/{total}")
+                ))
+            except Exception as e:
+                print(f"Error scanning replays: {e}")
+                return
+            
+            def finished():
+                if window.winfo_exists():
+                    status.configure(text=f"{result['files']} replays ({result['seconds'] * 1000:.0f} ms scan)")
+                    refresh()
+            self.bus.post('call', finished)
+        
+        for var in (mode_var, search_var, sort_var):
+            var.trace_add('write', refresh)
+        tree.bind('<<TreeviewSelect>>', show_thumbnail)
+        tree.bind('<Double-1>', open_replay)
+        # The existing catalog lists instantly; the scan then brings it up to date
+        refresh()
+        status.configure(text="Scanning...")
+        threading.Thread(target=scan, name='replay-scan', daemon=True).start()
 
     def export_highlight(self):
-        # Placeholder for highlight export
-        messagebox.showinfo("Replay", "Exporting highlight...")
+        source = self.current_vod or filedialog.askopenfilename(
+            filetypes=[("Video files", "*.mp4 *.avi *.mkv *.mov")]
+        )
+        if not source:
+            return
+        from highlight_export import parse_ranges
+        text = simpledialog.askstring(
+            "Export Highlight",
+            "Segments (e.g. 1:02:30-1:03:00, 2:10:00+30):",
+            parent=self.root
+        )
+        if not text:
+            return
+        try:
+            ranges = parse_ranges(text)
+        except ValueError as e:
+            messagebox.showerror("Export Highlight", f"Could not read segments: {e}")
+            return
+        self.export_highlights(source, ranges)
+
+    def export_highlights(self, source, ranges):
+        from highlight_export import HighlightExporter, format_time
+        if self.highlights is None:
+            # Progress arrives on worker threads; coalescing per job keeps it
+            # to at most one widget update per frame
+            self.highlights = HighlightExporter(
+                on_progress=lambda job: self.bus.coalesce(('highlight', id(job)), self.show_highlight_progress, job),
+                on_done=lambda job: self.bus.post('call', lambda: self.show_highlight_progress(job))
+            )
+        self.open_highlight_window()
+        
+        base = os.path.splitext(os.path.basename(source))[0]
+        for start, end in ranges:
+            name = f"{base}-{format_time(start).replace(':', '')}-{int(end - start)}s.mp4"
+            job = self.highlights.submit(source, start, end, os.path.join('highlights', name))
+            label = tk.Label(self.highlight_window, text=name, bg=self.colors['bg'], fg='white', anchor='w')
+            label.pack(fill='x', padx=10)
+            bar = ttk.Progressbar(self.highlight_window, maximum=1.0, length=400)
+            bar.pack(fill='x', padx=10, pady=(0, 5))
+            self.highlight_rows[id(job)] = (label, bar, name)
+
+    def open_highlight_window(self):
+        if self.highlight_window is not None and self.highlight_window.winfo_exists():
+            self.highlight_window.lift()
+            return
+        self.highlight_rows = {}
+        self.highlight_window = tk.Toplevel(self.root)
+        self.highlight_window.title("Highlight Exports")
+        self.highlight_window.geometry("450x400")
+        self.highlight_window.configure(bg=self.colors['bg'])
+
+    def show_highlight_progress(self, job):
+        row = self.highlight_rows.get(id(job))
+        if row is None or not self.highlight_window.winfo_exists():
+            return
+        label, bar, name = row
+        bar['value'] = job.progress
+        if job.status == 'done':
+            label.configure(text=f"{name} - done ({job.method}, {job.seconds:.1f}s)")
+        elif job.status == 'failed':
+            label.configure(text=f"{name} - failed: {job.error}", fg=self.colors['danger'])
 
     def add_timestamp(self):
-        # Placeholder for VOD timestamp
-        messagebox.showinfo("VOD Review", "Adding timestamp...")
+        if self.vod_notes is None:
+            messagebox.showinfo("VOD Review", "Load a VOD first")
+            return
+        seconds = self.vod_position.get()
+        whole = int(seconds)
+        text = simpledialog.askstring(
+            "Add Timestamp",
+            f"Note at {whole // 3600}:{whole // 60 % 60:02}:{whole % 60:02}:",
+            parent=self.root
+        )
+        if text is None:
+            return
+        self.vod_notes.add(seconds, text)
+        self.show_vod_notes()
 
     def export_vod_notes(self):
-        # Placeholder for VOD notes export
-        messagebox.showinfo("VOD Review", "Exporting VOD notes...")
+        if self.vod_notes is None or not len(self.vod_notes):
+            messagebox.showinfo("VOD Review", "No notes to export")
+            return
+        path = filedialog.asksaveasfilename(
+            initialfile=os.path.splitext(os.path.basename(self.current_vod))[0] + '-chapters.txt',
+            filetypes=[("YouTube chapters", "*.txt"), ("CSV", "*.csv"), ("Edit decision list", "*.edl")]
+        )
+        if not path:
+            return
+        fps = self.vod_strip.fps if self.vod_strip is not None else 30.0
+        extension = os.path.splitext(path)[1].lower()
+        try:
+            if extension == '.csv':
+                count = self.vod_notes.export_csv(path, fps)
+            elif extension == '.edl':
+                count = self.vod_notes.export_edl(path, fps)
+            else:
+                count = self.vod_notes.export_chapters(path)
+        except OSError as e:
+            messagebox.showerror("VOD Review", f"Could not export notes: {e}")
+            return
+        messagebox.showinfo("VOD Review", f"Exported {count} entries to {os.path.basename(path)}")
 
     def show_analysis_tools(self):
-        # Placeholder for analysis tools
-        messagebox.showinfo("VOD Review", "Opening analysis tools...")
+        if not self.current_vod:
+            messagebox.showinfo("VOD Review", "Load a VOD first")
+            return
+        from audio_analysis import AudioAnalyzer
+        from highlight_export import format_time
+        vod = self.current_vod
+        analyzer = AudioAnalyzer(vod)
+        stop = threading.Event()
+        
+        window = tk.Toplevel(self.root)
+        window.title("Audio Highlights")
+        window.geometry("400x450")
+        window.configure(bg=self.colors['bg'])
+        status = tk.Label(window, text="Decoding audio...", bg=self.colors['bg'], fg='white')
+        status.pack(pady=5)
+        listbox = tk.Listbox(window, bg=self.colors['secondary'], fg='white', font=('Arial', 12))
+        listbox.pack(fill='both', expand=True, padx=10)
+        buttons = tk.Frame(window, bg=self.colors['bg'])
+        buttons.pack(fill='x', padx=10, pady=5)
+        candidates = []
+        
+        def jump(event):
+            selected = listbox.curselection()
+            if selected and self.vod_strip is not None and self.current_vod == vod:
+                seconds = candidates[selected[0]][0]
+                self.vod_position.set(seconds)
+                self.on_vod_scrub(seconds)
+        
+        def add_timestamps():
+            from vod_notes import VodNotes
+            # The open VOD's notes, unless another VOD was loaded meanwhile
+            notes = self.vod_notes if self.vod_notes is not None and self.vod_notes.vod_path == vod else VodNotes(vod)
+            notes.add_many([(seconds, f"Audio spike ({score:.1f})") for seconds, score in candidates])
+            if notes is not self.vod_notes:
+                notes.close()
+            else:
+                self.show_vod_notes()
+            status.configure(text=f"Added {len(candidates)} timestamps")
+        
+        def export():
+            # 20s of build-up before each spike, 10s after
+            self.export_highlights(vod, [(max(t - 20, 0), t + 10) for t, _ in candidates])
+        
+        def finished(error=None):
+            if not window.winfo_exists():
+                return
+            if error is not None:
+                status.configure(text=f"Analysis failed: {error}")
+                return
+            candidates.extend(analyzer.candidates())
+            for seconds, score in candidates:
+                listbox.insert('end', f"{format_time(seconds)}   score {score:.1f}")
+            status.configure(text=f"{len(candidates)} candidates in {analyzer.seconds:.0f}s")
+            self.create_button(buttons, "Add to Timestamps", add_timestamps).pack(side='left', expand=True, fill='x')
+            self.create_button(buttons, "Export Highlights", export).pack(side='left', expand=True, fill='x')
+        
+        def run():
+            try:
+                result = analyzer.run(
+                    on_progress=lambda done, total: self.bus.coalesce(
+                        'audio_analysis', lambda: window.winfo_exists() and status.configure(
+                            text=f"Analysing audio: chunk {done}/{total}")),
+                    stop=stop
+                )
+            except Exception as e:
+                self.bus.post('call', lambda error=e: finished(error))
+                return
+            if result is not None:
+                self.bus.post('call', finished)
+        
+        listbox.bind('<Double-1>', jump)
+        window.protocol("WM_DELETE_WINDOW", lambda: (stop.set(), window.destroy()))
+        threading.Thread(target=run, name='audio-analysis', daemon=True).start()
 
 if __name__ == "__main__":
-    app = FortniteCompanion()
+    app = FortniteCompanion(profile_startup='--profile-startup' in sys.argv)
     app.run()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import multiprocessing
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
+def audio_duration(path):
+    out = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', path],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return float(out)
+
+
+def analyze_chunk(path, start, length, sample_rate, frame):
+    # Worker process: decodes one chunk of the audio track to 16-bit mono PCM
+    # and returns its RMS and spectral-flux envelopes, one value per frame.
+    # One extra frame before the chunk is decoded so the flux at the chunk
+    # boundary compares against real audio instead of silence.
+    pad = frame / sample_rate if start > 0 else 0.0
+    pcm = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-ss', f"{start - pad:.3f}", '-t', f"{length + pad:.3f}", '-i', path,
+         '-vn', '-ac', '1', '-ar', str(sample_rate), '-f', 's16le', 'pipe:1'],
+        capture_output=True, check=True
+    ).stdout
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    frames = len(samples) // frame
+    if frames < 2:
+        return start, np.zeros(0, np.float32), np.zeros(0, np.float32)
+    blocks = samples[:frames * frame].reshape(frames, frame)
+    rms = np.sqrt(np.mean(blocks * blocks, axis=1))
+    spectrum = np.abs(np.fft.rfft(blocks * np.hanning(frame).astype(np.float32), axis=1))
+    flux = np.zeros(frames, np.float32)
+    flux[1:] = np.maximum(spectrum[1:] - spectrum[:-1], 0).sum(axis=1)
+    skip = 1 if pad else 0
+    return start, rms[skip:].astype(np.float32), flux[skip:]
+
+
+class AudioAnalyzer:
+    # Finds loud, sudden moments (gunfights, hype) in a VOD's audio track.
+    #
+    # The track is split into fixed-length chunks decoded by ffmpeg inside a
+    # process pool, so a worker only ever holds one chunk of PCM and memory
+    # is bounded by chunk size times workers, whatever the VOD length. Each
+    # chunk comes back as short-window RMS and spectral-flux envelopes
+    # (NumPy, one value per ~64 ms) written into preallocated arrays for the
+    # whole VOD. candidates() scores every frame against a local baseline
+    # and keeps the strongest peaks at least min_gap seconds apart.
+
+    def __init__(self, path, chunk_seconds=300, sample_rate=16000, frame=1024, workers=None):
+        self.path = path
+        self.chunk_seconds = chunk_seconds
+        self.sample_rate = sample_rate
+        self.frame = frame
+        self.workers = workers
+        self.hop = frame / sample_rate
+        self.rms = None
+        self.flux = None
+        self.seconds = None
+
+    def run(self, on_progress=None, stop=None):
+        if shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None:
+            raise RuntimeError("ffmpeg is needed to decode the audio track")
+        started = time.perf_counter()
+        duration = audio_duration(self.path)
+        total = int(duration / self.hop) + 1
+        self.rms = np.zeros(total, np.float32)
+        self.flux = np.zeros(total, np.float32)
+        starts = np.arange(0, duration, self.chunk_seconds)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            futures = [pool.submit(analyze_chunk, self.path, float(start),
+                                   min(self.chunk_seconds, duration - start), self.sample_rate, self.frame)
+                       for start in starts]
+            for done, future in enumerate(as_completed(futures), 1):
+                if stop is not None and stop.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                start, rms, flux = future.result()
+                first = int(round(start / self.hop))
+                count = min(len(rms), total - first)
+                self.rms[first:first + count] = rms[:count]
+                self.flux[first:first + count] = flux[:count]
+                if on_progress is not None:
+                    on_progress(done, len(futures))
+        self.seconds = time.perf_counter() - started
+        return self.rms, self.flux
+
+    def score(self, smooth_seconds=0.5, baseline_seconds=30.0):
+        # Log-energy and normalised flux, each minus its 30 s moving average,
+        # so a spike counts relative to how loud that part of the stream was
+        loudness = 20 * np.log10(self.rms + 1e-5)
+        flux = self.flux / (np.median(self.flux) + 1e-9)
+        signal = _robust_z(loudness - _moving_average(loudness, baseline_seconds / self.hop))
+        signal += _robust_z(flux - _moving_average(flux, baseline_seconds / self.hop))
+        return _moving_average(signal, smooth_seconds / self.hop)
+
+    def candidates(self, count=20, min_gap=20.0, threshold=3.0):
+        # Returns [(seconds, score)] in time order
+        score = self.score()
+        above = np.flatnonzero(score > threshold)
+        if not len(above):
+            return []
+        order = above[np.argsort(score[above])[::-1]]
+        gap = int(min_gap / self.hop)
+        taken = []
+        blocked = np.zeros(len(score), bool)
+        for index in order:
+            if blocked[index]:
+                continue
+            taken.append(index)
+            blocked[max(index - gap, 0):index + gap] = True
+            if len(taken) == count:
+                break
+        return sorted((round(i * self.hop, 2), round(float(score[i]), 2)) for i in taken)
+
+
+def _moving_average(values, width):
+    width = max(int(width), 1)
+    cumulative = np.cumsum(np.concatenate(([0.0], values.astype(np.float64))))
+    half = width // 2
+    high = np.minimum(np.arange(len(values)) + half + 1, len(values))
+    low = np.maximum(np.arange(len(values)) - half, 0)
+    return ((cumulative[high] - cumulative[low]) / (high - low)).astype(np.float32)
+
+
+def _robust_z(values):
+    median = np.median(values)
+    mad = np.median(np.abs(values - median)) * 1.4826 + 1e-9
+    return (values - median) / mad
@@ -0,0 +1,75 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_analysis import AudioAnalyzer
+
+# Usage: bench_audio_analysis.py [hours]
+# Synthesises a long stream audio track (quiet talk-level noise with slow
+# loudness drift) with 40 short loud bursts at known times, encodes it with
+# ffmpeg, and checks how many bursts the analyzer finds, how long it takes
+# and the peak memory of the workers.
+
+RATE = 16000
+
+
+def make_track(path, hours, bursts, seed=7):
+    rng = np.random.default_rng(seed)
+    encoder = subprocess.Popen(
+        ['ffmpeg', '-y', '-v', 'error', '-f', 's16le', '-ar', str(RATE), '-ac', '1', '-i', 'pipe:0',
+         '-c:a', 'aac', '-b:a', '32k', path],
+        stdin=subprocess.PIPE
+    )
+    total = int(hours * 3600)
+    for minute in range(0, total, 60):
+        seconds = min(60, total - minute)
+        t = minute + np.arange(seconds * RATE) / RATE
+        drift = 0.02 * (1.5 + np.sin(t / 900))
+        audio = rng.normal(0, 1, len(t)) * drift
+        for burst in bursts:
+            inside = (t >= burst) & (t < burst + 1.5)
+            if inside.any():
+                audio[inside] += rng.normal(0, 0.5, inside.sum()) * np.sin(t[inside] * 2 * np.pi * 3) ** 2
+        encoder.stdin.write((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+    encoder.stdin.close()
+    encoder.wait()
+
+
+def main():
+    if shutil.which('ffmpeg') is None:
+        print("ffmpeg not found")
+        sys.exit(2)
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 6
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'track.m4a')
+    rng = np.random.default_rng(1)
+    bursts = np.sort(rng.choice(np.arange(60, int(hours * 3600) - 60, 60), 40, replace=False)).astype(float)
+    started = time.perf_counter()
+    make_track(path, hours, bursts)
+    print(f"generated {hours:g}h track in {time.perf_counter() - started:.0f}s")
+
+    analyzer = AudioAnalyzer(path)
+    analyzer.run()
+    found = analyzer.candidates(count=60)
+    times = np.array([t for t, _ in found])
+    hits = sum(1 for b in bursts if len(times) and np.abs(times - b).min() < 3)
+    false = sum(1 for t in times if np.abs(bursts - t).min() >= 3)
+    print(f"analysed in {analyzer.seconds:.1f}s: {len(analyzer.rms):,} frames, "
+          f"{hits}/{len(bursts)} bursts found, {false} other candidates")
+    try:
+        import resource
+        print(f"peak worker RSS {resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024:.0f} MB")
+    except ImportError:
+        pass
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
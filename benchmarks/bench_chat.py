@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from fake_irc_server import FakeIrcServer, make_line
+from twitch_chat import TwitchChatClient, parse_line, sent_latency
+
+
+def bench_parser(lines=200_000):
+    import random
+    rng = random.Random(2)
+    raw = [make_line('#bench', i, rng)[:-2] for i in range(lines)]
+    start = time.perf_counter()
+    for line in raw:
+        parse_line(line)
+    elapsed = time.perf_counter() - start
+    print(f"parser: {lines / elapsed:,.0f} lines/s")
+
+
+def bench_end_to_end(rate=10_000, seconds=5):
+    ready = threading.Event()
+    holder = {}
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        holder['server'] = loop.run_until_complete(FakeIrcServer(port=0, rate=rate).start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait()
+    server = holder['server']
+
+    latencies = []
+    received = [0]
+
+    def on_batch(batch):
+        # Runs on the chat thread; the app forwards this to the event bus
+        now = time.time()
+        received[0] += len(batch)
+        latencies.append(sent_latency(batch[-1], now))
+
+    client = TwitchChatClient('bench', on_batch, host='127.0.0.1', port=server.port)
+    client.start()
+    time.sleep(seconds)
+    client.stop()
+
+    latencies = sorted(l for l in latencies if l is not None)
+    print(f"end to end: {received[0]:,} messages in {seconds}s "
+          f"({received[0] / seconds:,.0f}/s, server sent {server.sent:,}) "
+          f"in {client.stats['batches']} batches")
+    if latencies:
+        print(f"batch latency p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    bench_parser()
+    bench_end_to_end()
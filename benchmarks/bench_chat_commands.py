@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_commands import CommandRouter
+
+
+class Message:
+    __slots__ = ('user_id', 'text')
+
+    def __init__(self, user_id, text):
+        self.user_id = user_id
+        self.text = text
+
+
+def measure(command_count, user_count, messages=300_000):
+    rng = random.Random(command_count * 7 + user_count)
+    router = CommandRouter(max_users=100_000)
+    names = [f'cmd{i}' for i in range(command_count)]
+    for name in names:
+        router.register(name, lambda user, args: "ok", aliases=(name + 'x',), user_cooldown=30)
+
+    # Half commands, half plain chatter, spread over user_count users
+    batch = []
+    for _ in range(messages):
+        user = str(rng.randrange(user_count))
+        if rng.random() < 0.5:
+            batch.append(Message(user, f"!{rng.choice(names)} arg"))
+        else:
+            batch.append(Message(user, "gg that was insane"))
+
+    now = 0.0
+    start = time.perf_counter()
+    for i in range(0, messages, 1000):
+        # Simulated clock: 1000 messages per simulated second
+        router.dispatch_batch(batch[i:i + 1000], now)
+        now += 1.0
+    elapsed = time.perf_counter() - start
+    return elapsed / messages * 1e9, len(router.users)
+
+
+def run():
+    print(f"{'commands':>9} {'users':>10} {'ns/msg':>8} {'tracked users':>14}")
+    for commands in (10, 100, 1000):
+        for users in (1_000, 100_000, 1_000_000):
+            cost, tracked = measure(commands, users)
+            print(f"{commands:>9} {users:>10,} {cost:8.0f} {tracked:>14,}")
+
+
+if __name__ == "__main__":
+    run()
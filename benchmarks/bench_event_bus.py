@@ -0,0 +1,83 @@
+import heapq
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_bus import EventBus
+
+
+class FakeRoot:
+    # Minimal stand-in for Tk's after() so the pump runs headless
+
+    def __init__(self):
+        self.timers = []
+        self.counter = 0
+
+    def after(self, ms, callback):
+        self.counter += 1
+        heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, self.counter, callback))
+        return self.counter
+
+    def after_cancel(self, after_id):
+        self.timers = [t for t in self.timers if t[1] != after_id]
+        heapq.heapify(self.timers)
+
+    def run_for(self, seconds, frame_cost=0.002):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end and self.timers:
+            due, _, callback = heapq.heappop(self.timers)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            callback()
+            # Pretend Tk spends some time redrawing each frame
+            time.sleep(frame_cost)
+
+
+def run(seconds=3.0, workers=4, rate=5000):
+    root = FakeRoot()
+    bus = EventBus(root)
+    counts = {'elim': 0, 'labels': 0}
+    bus.subscribe('elim', lambda delta: counts.__setitem__('elim', counts['elim'] + delta))
+
+    def set_label(value):
+        counts['labels'] += 1
+
+    stop = threading.Event()
+
+    def worker(n):
+        # Each worker posts `rate` events/s and a label update per event
+        interval = 1 / rate
+        next_post = time.perf_counter()
+        while not stop.is_set():
+            bus.post('elim', 1)
+            bus.coalesce(f'label-{n}', set_label, next_post)
+            next_post += interval
+            delay = next_post - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+    bus.start()
+    for t in threads:
+        t.start()
+    root.run_for(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    bus.drain()
+
+    ticks = bus.stats['ticks']
+    print(f"{counts['elim']:,} events from {workers} threads in {seconds:.1f}s "
+          f"({counts['elim'] / seconds:,.0f}/s)")
+    print(f"{ticks} pump ticks ({ticks / seconds:.0f} fps), "
+          f"{bus.stats['applied']:,} label updates applied, {bus.stats['coalesced']:,} coalesced away")
+    print(f"lag last {bus.stats['lag_ms']:.1f} ms, max {bus.stats['max_lag_ms']:.1f} ms, "
+          f"backlog {bus.stats['backlog']}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from highlight_export import HighlightExporter, ffmpeg_available, format_time
+
+# Usage: bench_highlight_export.py [hours] [vod]
+# Generates an H.264 test VOD with ffmpeg (2s GOPs, audio track) unless one
+# is given, then exports ten 30-second highlights spread across it on the
+# worker pool. Compare the wall time with reading the output bytes back:
+# a smart cut should be close to disk speed, not to a full re-encode.
+
+
+def make_vod(path, hours):
+    subprocess.run(
+        ['ffmpeg', '-y', '-loglevel', 'error',
+         '-f', 'lavfi', '-i', 'testsrc2=size=1280x720:rate=30',
+         '-f', 'lavfi', '-i', 'sine=frequency=440',
+         '-t', str(int(hours * 3600)), '-c:v', 'libx264', '-preset', 'ultrafast', '-g', '60',
+         '-c:a', 'aac', '-shortest', path],
+        check=True
+    )
+
+
+def main():
+    if not ffmpeg_available():
+        print("ffmpeg not found: exports would use the cv2 re-encode fallback")
+        sys.exit(2)
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    folder = tempfile.mkdtemp()
+    if len(sys.argv) > 2:
+        vod = sys.argv[2]
+    else:
+        vod = os.path.join(folder, 'vod.mp4')
+        started = time.perf_counter()
+        make_vod(vod, hours)
+        print(f"generated {hours}h VOD ({os.path.getsize(vod) / 1e9:.2f} GB) "
+              f"in {time.perf_counter() - started:.0f}s")
+
+    length = hours * 3600
+    exporter = HighlightExporter(workers=3)
+    started = time.perf_counter()
+    jobs = []
+    for i in range(10):
+        # Off-keyframe starts so every cut has partial GOPs at both edges
+        start = length * (i + 0.5) / 10 + 0.37
+        jobs.append(exporter.submit(vod, start, start + 30, os.path.join(folder, f"highlight-{i}.mp4")))
+    exporter.shutdown(wait=True)
+    wall = time.perf_counter() - started
+
+    written = 0
+    for job in jobs:
+        size = os.path.getsize(job.output) if job.status == 'done' else 0
+        written += size
+        print(f"{format_time(job.start)} +30s: {job.status} via {job.method} in {job.seconds:.2f}s, "
+              f"{size / 1e6:.1f} MB" + (f" ({job.error})" if job.error else ""))
+    print(f"10 highlights in {wall:.2f}s, {written / 1e6 / wall:.0f} MB/s of output")
+
+    started = time.perf_counter()
+    for job in jobs:
+        if job.status == 'done':
+            with open(job.output, 'rb') as f:
+                while f.read(1 << 20):
+                    pass
+    print(f"reading the outputs back: {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lazy_imports
+from frame_sources import test_pattern, video_file
+from hud_detector import HudDetector, DEFAULT_REGIONS
+
+# Usage:
+#   bench_hud_detector.py                      synthetic 1080p30 match
+#   bench_hud_detector.py clip.mp4 labels.json recorded clip
+# labels.json holds {"events": [["elim", 12.4], ["top_10", 300.2], ...]};
+# an event counts as found if the detector emits the same kind within 2s.
+# The synthetic match draws the HUD with the fallback template font, so its
+# accuracy is a best case; throughput is what matters there.
+
+
+def draw_number(cv2, frame, region, value):
+    height, width = frame.shape[:2]
+    x, y, w, h = region
+    x0, y0 = int(x * width), int(y * height)
+    x1, y1 = int((x + w) * width), int((y + h) * height)
+    frame[y0:y1, x0:x1] = 20
+    scale = (y1 - y0) / 30
+    cv2.putText(frame, str(value), (x0 + 2, y1 - 4), cv2.FONT_HERSHEY_DUPLEX, scale, (255, 255, 255), 2)
+
+
+def synthetic_match(seconds=180, fps=30):
+    cv2 = lazy_imports.cv2()
+    rng = np.random.default_rng(3)
+    elim_times = np.sort(rng.uniform(20, seconds - 20, 9))
+    events = [('new_game', 5.0)] + [('elim', float(t)) for t in elim_times]
+    players_at = lambda t: 100 if t < 5 else max(1, int(100 - (t - 5) / (seconds - 20) * 99))
+    top_10_time = next(t / fps for t in range(seconds * fps) if players_at(t / fps) < 10)
+    events += [('top_10', top_10_time), ('victory', seconds - 10.0)]
+
+    def frames():
+        for timestamp, frame in test_pattern(1920, 1080, fps, seconds=seconds, realtime=False):
+            frame = frame.copy()
+            # Lobby below 90 players until the match starts at 5s
+            players = 60 if timestamp < 4 else players_at(timestamp)
+            draw_number(cv2, frame, DEFAULT_REGIONS['players'], players)
+            draw_number(cv2, frame, DEFAULT_REGIONS['elims'], int((elim_times <= timestamp).sum()))
+            if timestamp >= seconds - 10:
+                x, y, w, h = DEFAULT_REGIONS['victory']
+                frame[int(y * 1080):int((y + h) * 1080), int(x * 1920):int((x + w) * 1920)] = (0, 200, 255)
+            yield timestamp, frame
+
+    return frames(), events
+
+
+def main():
+    if len(sys.argv) > 2:
+        source = video_file(sys.argv[1])
+        with open(sys.argv[2], 'r') as f:
+            expected = [tuple(e) for e in json.load(f)['events']]
+    else:
+        source, expected = synthetic_match()
+
+    emitted = []
+    clock = {'t': 0.0}
+    detector = HudDetector(lambda kind, *args: emitted.append((kind, clock['t'])))
+    frames = 0
+    for timestamp, frame in source:
+        clock['t'] = timestamp
+        detector.process(frame)
+        frames += 1
+
+    stats = detector.stats
+    per_frame = stats['seconds'] / max(frames, 1)
+    print(f"{frames} frames, {per_frame * 1000:.2f} ms/frame in process() -> {1 / per_frame:.0f} fps on one core")
+    print(f"regions read {stats['regions_read']}, skipped as unchanged {stats['regions_skipped']}")
+
+    found = 0
+    unmatched = list(emitted)
+    for kind, t in expected:
+        match = next((e for e in unmatched if e[0] == kind and abs(e[1] - t) <= 2.0), None)
+        if match is not None:
+            unmatched.remove(match)
+            found += 1
+        else:
+            print(f"  missed {kind} at {t:.1f}s")
+    for kind, t in unmatched:
+        print(f"  unexpected {kind} at {t:.1f}s")
+    print(f"accuracy: {found}/{len(expected)} expected events found, {len(unmatched)} false events")
+
+
+if __name__ == "__main__":
+    main()
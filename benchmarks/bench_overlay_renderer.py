@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from overlay_renderer import OverlayRenderer, read_frame, format_timer, frame_path
+
+
+def bench(overlay_type, frames, step):
+    folder = tempfile.mkdtemp()
+    renderer = OverlayRenderer(overlay_type, frame_path(overlay_type, folder))
+    renderer.update(challenge="No shield wins", custom_text="Thanks for the follows!")
+    renderer.render()
+    full = renderer.width * renderer.height
+
+    costs = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        step(renderer, frame)
+        renderer.render()
+        costs.append(time.perf_counter() - start)
+
+    seq, pixels = read_frame(renderer.path)
+    assert seq == renderer.seq and pixels.shape == (renderer.height, renderer.width, 4)
+    renderer.close()
+
+    costs.sort()
+    stats = renderer.stats
+    rendered = max(stats['frames'], 1)
+    print(f"{overlay_type}: {frames} frames, p50 {costs[len(costs) // 2] * 1000:.3f} ms, "
+          f"max {costs[-1] * 1000:.3f} ms")
+    print(f"  {stats['frames']} redraws, {stats['pixels'] / rendered:,.0f} px/redraw "
+          f"of {full:,} ({stats['pixels'] / rendered / full * 100:.1f}%), "
+          f"{stats['cache_hits']} cache hits")
+
+
+def main():
+    fps = 60
+    frames = fps * 120
+    # Two simulated minutes at 60 fps: the timer box changes once a second
+    bench("Challenge Timer", frames,
+          lambda r, frame: r.update(challenge_timer=format_timer(frame // fps)))
+    # A stat changes every 10th frame, the rest are unchanged
+    bench("Stats Display", frames,
+          lambda r, frame: r.update(eliminations=frame // 10, kd='2.50', victories=3))
+
+
+if __name__ == "__main__":
+    main()
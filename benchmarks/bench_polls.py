@@ -0,0 +1,45 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polls import PollEngine
+
+
+class Vote:
+    __slots__ = ('user_id', 'text')
+
+    def __init__(self, user_id, text):
+        self.user_id = user_id
+        self.text = text
+
+
+def run(votes=1_000_000, voters=150_000, batch_size=500):
+    rng = random.Random(3)
+    options = ["Tilted Towers", "Pleasant Park", "Retail Row", "Lazy Lake", "Random Drop"]
+    # Mix of numeric votes, option names, !vote and plain chatter
+    texts = ['1', '2', '3', '4', '5', 'tilted towers', '!vote 2', 'Retail Row', 'gg', 'lol']
+    messages = [Vote(str(rng.randrange(voters)), rng.choice(texts)) for _ in range(votes)]
+    batches = [messages[i:i + batch_size] for i in range(0, votes, batch_size)]
+
+    pushes = [0]
+    engine = PollEngine(on_update=lambda poll: pushes.__setitem__(0, pushes[0] + 1), push_interval=0.25)
+    poll = engine.start("Landing Spots", options)
+
+    start = time.perf_counter()
+    for batch in batches:
+        engine.ingest(batch)
+    elapsed = time.perf_counter() - start
+    engine.close()
+
+    print(f"{votes:,} messages in {elapsed:.2f}s ({votes / elapsed:,.0f}/s)")
+    print(f"{poll.total:,} unique voters, {poll.rejected:,} duplicate votes rejected, "
+          f"{pushes[0]} UI pushes")
+    print(f"voter set: {poll.voters.nbytes / 1e6:.2f} MB")
+    print(poll.summary())
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictions import PredictionLedger
+
+
+def run(participants=200_000):
+    rng = np.random.default_rng(4)
+    outcomes = rng.integers(0, 2, participants)
+    points = rng.integers(10, 50_000, participants)
+
+    ledger = PredictionLedger("Victory This Game?", ["Yes", "No"])
+    start = time.perf_counter()
+    for user, outcome, stake in zip(range(participants), outcomes.tolist(), points.tolist()):
+        ledger.wager(user, outcome, stake)
+    record = time.perf_counter() - start
+
+    start = time.perf_counter()
+    payouts = ledger.resolve(0)
+    resolve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    path = ledger.save(tempfile.mkdtemp(prefix='predictions-'))
+    save = time.perf_counter() - start
+
+    print(f"{participants:,} wagers recorded in {record:.2f}s")
+    print(f"resolve: {resolve * 1000:.1f} ms, persist: {save * 1000:.1f} ms ({os.path.getsize(path) / 1e6:.1f} MB)")
+    print(f"pool {ledger.pool:,}, paid {int(payouts.sum()):,} to {int((payouts > 0).sum()):,} winners")
+
+
+if __name__ == "__main__":
+    run()
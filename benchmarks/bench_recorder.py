@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import test_pattern, video_file
+from recorder import ReplayRecorder, DROP_NEWEST, DROP_OLDEST
+
+# Usage: bench_recorder.py [video file]
+# Runs the capture -> encode pipeline headless for each drop policy: once at
+# a rate the encoder should keep up with, once at a 1080p60 rate that will
+# usually overrun it, and reports drops, queue depth and throughput. The
+# capture thread's frame pacing is the check that capture never blocked.
+
+
+def run(source, fps, policy, slots, seconds_label):
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'bench.mp4')
+    recorder = ReplayRecorder(source, path, fps=fps, slots=slots, policy=policy)
+    started = time.perf_counter()
+    recorder.start()
+    while recorder.running:
+        time.sleep(0.1)
+    wall = time.perf_counter() - started
+    m = recorder.metrics()
+    size = os.path.getsize(path) / 1e6 if os.path.exists(path) else 0.0
+    print(f"{seconds_label} {policy:<11} captured {m['captured']:>5}, written {m['written']:>5}, "
+          f"dropped {m['dropped']:>5} ({m['drop_rate'] * 100:4.1f}%), max in flight {m['max_in_flight']:>2}/{slots}, "
+          f"encode {m['encode_fps']:5.1f} fps, {size:.1f} MB in {wall:.1f}s")
+
+
+def main():
+    seconds = 10
+    if len(sys.argv) > 1:
+        for policy in (DROP_NEWEST, DROP_OLDEST):
+            run(video_file(sys.argv[1], realtime=True), 30, policy, 16, "video")
+        return
+    for policy in (DROP_NEWEST, DROP_OLDEST):
+        run(test_pattern(1280, 720, 30, seconds=seconds), 30, policy, 16, "720p30 ")
+        run(test_pattern(1920, 1080, 60, seconds=seconds), 60, policy, 8, "1080p60")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lazy_imports
+from frame_sources import test_pattern, video_file
+from replay_buffer import ReplayBuffer
+
+# Usage: bench_replay_buffer.py [video file]
+# Encodes frames from the test pattern (or the video) up front, then replays
+# them into the buffer at 60 fps while clips are saved, measuring how long
+# push() ever blocks and how long a clip takes to reach disk.
+
+
+def main():
+    cv2 = lazy_imports.cv2()
+    fps = 60
+    if len(sys.argv) > 1:
+        frames = video_file(sys.argv[1])
+    else:
+        frames = test_pattern(1280, 720, fps, seconds=10, realtime=False)
+    packets = [cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+               for _, frame in frames]
+    average = sum(len(p) for p in packets) / len(packets)
+    print(f"{len(packets)} packets, {average / 1024:.0f} KiB average")
+
+    buffer = ReplayBuffer(seconds=30, max_bytes=128 * 1024 * 1024)
+    push_times = []
+    stop = threading.Event()
+
+    def capture():
+        i = 0
+        started = time.perf_counter()
+        while not stop.is_set():
+            delay = started + i / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            t = time.perf_counter()
+            buffer.push(packets[i % len(packets)], i / fps)
+            push_times.append(time.perf_counter() - t)
+            i += 1
+
+    thread = threading.Thread(target=capture, daemon=True)
+    thread.start()
+    time.sleep(5)
+
+    folder = tempfile.mkdtemp()
+    saves = []
+    for n in range(5):
+        info = buffer.save(os.path.join(folder, f"clip-{n}.mjpeg"))
+        saves.append(info)
+        time.sleep(1)
+    stop.set()
+    thread.join()
+
+    memory = buffer.memory()
+    print(f"buffer: {memory['capacity'] / 1e6:.0f} MB preallocated, {memory['used'] / 1e6:.1f} MB used, "
+          f"{memory['packets']} packets covering {memory['seconds']:.1f}s")
+    for info in saves:
+        print(f"clip {info['duration']:.1f}s {info['bytes'] / 1e6:.1f} MB: snapshot {info['snapshot_ms']:.2f} ms, "
+              f"saved in {info['save_ms']:.0f} ms")
+    push_times.sort()
+    print(f"push p50 {push_times[len(push_times) // 2] * 1e6:.0f} us, "
+          f"p99 {push_times[int(len(push_times) * 0.99)] * 1e6:.0f} us, max {push_times[-1] * 1000:.2f} ms")
+    print(f"stats: {buffer.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lazy_imports
+from frame_sources import test_pattern
+from replay_catalog import ReplayCatalog
+
+# Builds a library of 5,000 replays (a handful of real short videos copied
+# across 50 folders) and times the first scan, an unchanged rescan, a rescan
+# after a few new files, and the viewer's filter/sort queries.
+
+
+def make_video(path, seconds=2):
+    cv2 = lazy_imports.cv2()
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (640, 360))
+    for _, frame in test_pattern(640, 360, 30, seconds=seconds, realtime=False):
+        writer.write(frame)
+    writer.release()
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    root = tempfile.mkdtemp()
+    library = os.path.join(root, 'replays')
+    samples = []
+    for i in range(5):
+        path = os.path.join(root, f"sample-{i}.mp4")
+        make_video(path, seconds=1 + i)
+        samples.append(path)
+    for i in range(files):
+        folder = os.path.join(library, f"week-{i % 50:02}")
+        os.makedirs(folder, exist_ok=True)
+        shutil.copyfile(samples[i % len(samples)], os.path.join(folder, f"replay-{i:05}.mp4"))
+
+    catalog = ReplayCatalog(os.path.join(root, 'replays.db'), folders=[library],
+                            thumbnails=os.path.join(root, 'thumbnails'))
+    first = catalog.scan()
+    print(f"first scan: {first['files']} files, {first['probed']} probed in {first['seconds']:.1f}s")
+    for _ in range(3):
+        again = catalog.scan()
+        print(f"unchanged rescan: {again['probed']} probed in {again['seconds'] * 1000:.1f} ms")
+
+    for i in range(10):
+        shutil.copyfile(samples[0], os.path.join(library, 'week-00', f"new-{i}.mp4"))
+    update = catalog.scan()
+    print(f"rescan with 10 new files: {update['probed']} probed in {update['seconds'] * 1000:.0f} ms")
+
+    for label, kwargs in (
+        ("newest first", {}),
+        ("longest first", {'sort': 'duration'}),
+        ("name search", {'search': 'replay-04', 'sort': 'name'}),
+    ):
+        started = time.perf_counter()
+        rows = catalog.query(**kwargs)
+        print(f"query {label}: {len(rows)} rows in {(time.perf_counter() - started) * 1000:.2f} ms")
+    catalog.close()
+    shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import csv
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrim_import import ScrimStore, iter_results
+
+# Generates a season of scrim exports (12 weeks x 40 lobbies, 5 matches of
+# 100 players each, as a mix of CSV, JSON arrays and JSON Lines), then times
+# a parallel import against a single worker, a no-op re-import, reloading the
+# saved store and per-mode queries. Finally streams one large export to show
+# that parser memory does not grow with file size.
+
+MODES = ("Box Fighting", "Build Battles", "Zone Wars", "Realistic 1v1", "Duo Scrims", "Trio Arena", "Squad Custom")
+
+
+def lobby_rows(rng, pool, lobby, matches=5, players=100):
+    mode = rng.choice(MODES)
+    lobby_players = rng.sample(pool, players)
+    for match in range(matches):
+        for place, player in enumerate(rng.sample(lobby_players, players), 1):
+            yield {
+                'match_id': f"{lobby}-{match}", 'mode': mode, 'player': player, 'placement': place,
+                'eliminations': max(0, int(rng.gauss(3 - place / 40, 2))),
+                'death_cause': 'storm' if place > 1 and rng.random() < 0.15 else 'player'
+            }
+
+
+def write_season(folder, weeks=12, lobbies_per_week=40, players=2000):
+    rng = random.Random(7)
+    pool = [f"Player{i:04}" for i in range(players)]
+    paths = []
+    for week in range(weeks):
+        for n in range(lobbies_per_week):
+            lobby = f"w{week:02}-l{n:02}"
+            rows = list(lobby_rows(rng, pool, lobby))
+            kind = ('csv', 'json', 'jsonl')[n % 3]
+            path = os.path.join(folder, f"{lobby}.{kind}")
+            with open(path, 'w', newline='') as f:
+                if kind == 'csv':
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                    writer.writeheader()
+                    writer.writerows(rows)
+                elif kind == 'json':
+                    json.dump(rows, f)
+                else:
+                    f.writelines(json.dumps(row) + '\n' for row in rows)
+            paths.append(path)
+    return paths
+
+
+def main():
+    folder = tempfile.mkdtemp()
+    data = os.path.join(folder, 'exports')
+    os.makedirs(data)
+    paths = write_season(data)
+    size = sum(os.path.getsize(p) for p in paths)
+    print(f"season: {len(paths)} files, {size / 1e6:.1f} MB")
+
+    single = ScrimStore(os.path.join(folder, 'single'), workers=1)
+    result = single.import_files(paths)
+    print(f"import, 1 worker: {result['rows']:,} rows in {result['seconds']:.2f}s")
+
+    store = ScrimStore(os.path.join(folder, 'store'))
+    result = store.import_files(paths)
+    print(f"import, {os.cpu_count()} workers: {result['rows']:,} rows in {result['seconds']:.2f}s "
+          f"({result['rows'] / result['seconds']:,.0f} rows/s), {store.count:,} (mode, player) rows")
+    again = store.import_files(paths)
+    print(f"re-import: {again['files']} parsed, {again['skipped']} unchanged, {again['seconds'] * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    store.save()
+    saved = time.perf_counter() - started
+    started = time.perf_counter()
+    reloaded = ScrimStore.load(store.folder)
+    print(f"save {saved * 1000:.0f} ms, load {(time.perf_counter() - started) * 1000:.0f} ms")
+    assert reloaded.query(sort='eliminations', limit=20) == store.query(sort='eliminations', limit=20)
+
+    for mode, sort in (("Zone Wars", 'avg_elims'), ("Duo Scrims", 'avg_placement'),
+                       ("Squad Custom", 'storm_rate'), (None, 'wins')):
+        started = time.perf_counter()
+        for _ in range(100):
+            top = store.query(mode=mode, sort=sort, descending=sort != 'avg_placement', min_matches=10, limit=25)
+        elapsed = (time.perf_counter() - started) / 100
+        print(f"query {mode or 'all modes'} by {sort}: {elapsed * 1000:.2f} ms, "
+              f"top {top[0]['player']} ({top[0][sort]:.2f})")
+
+    # One export far bigger than any lobby, streamed through the parser
+    big = os.path.join(folder, 'big.jsonl')
+    rng = random.Random(3)
+    pool = [f"Player{i:04}" for i in range(2000)]
+    with open(big, 'w') as f:
+        for lobby in range(400):
+            f.writelines(json.dumps(row) + '\n' for row in lobby_rows(rng, pool, lobby))
+    tracemalloc.start()
+    count = sum(1 for _ in iter_results(big))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"streamed {count:,} rows from a {os.path.getsize(big) / 1e6:.0f} MB file, "
+          f"peak parser memory {peak / 1e6:.2f} MB")
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_stats import SessionStats
+
+
+def run(events=2_000_000, push_every=1000):
+    rng = random.Random(1)
+    # Mostly eliminations, like a real session
+    kinds = rng.choices(['elim', 'new_game', 'victory', 'top_10'], [90, 6, 1, 3], k=events)
+
+    stats = SessionStats()
+    pushed = [0]
+    for field in SessionStats.FIELDS:
+        stats.bind(field, lambda text: pushed.__setitem__(0, pushed[0] + 1))
+
+    handlers = {
+        'elim': stats.elim,
+        'new_game': stats.new_game,
+        'victory': stats.victory,
+        'top_10': stats.top_10,
+    }
+
+    start = time.perf_counter()
+    for i, kind in enumerate(kinds):
+        handlers[kind]()
+        if i % push_every == 0:
+            stats.push()
+    elapsed = time.perf_counter() - start
+
+    print(f"{events:,} events in {elapsed:.2f}s ({events / elapsed:,.0f} events/s)")
+    print(f"{pushed[0]:,} label updates over {events // push_every:,} pushes")
+    print(f"K/D {stats.render('K/D Ratio')}, win rate {stats.render('Win Rate')}, "
+          f"avg {stats.avg_elims:.2f} +/- {stats.elim_stddev:.2f} elims/game")
+
+
+if __name__ == "__main__":
+    run()
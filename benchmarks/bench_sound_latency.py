@@ -0,0 +1,79 @@
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+# Must be set before pygame opens the mixer
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sound_engine import SoundEngine
+
+
+def write_tone(path, seconds, frequency=440, rate=44100):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        frames = bytearray()
+        for i in range(int(seconds * rate)):
+            sample = int(12000 * math.sin(2 * math.pi * frequency * i / rate))
+            frames += struct.pack('<hh', sample, sample)
+        f.writeframes(bytes(frames))
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def run(events=5000, pack_size=40):
+    folder = tempfile.mkdtemp(prefix='sound-bench-')
+    write_tone(os.path.join(folder, 'elimination.wav'), 0.4)
+    write_tone(os.path.join(folder, 'victory.wav'), 2.0, 660)
+    for i in range(pack_size):
+        write_tone(os.path.join(folder, f'custom_{i:03}.wav'), 1.0, 300 + i * 10)
+
+    # Cache only fits a handful of the custom effects to exercise eviction
+    engine = SoundEngine(channels=8, voice_limits={'elimination': 3, 'victory': 1},
+                         cache_bytes=2 * 1024 * 1024)
+    engine.load_pack(folder)
+    engine.register('elimination', os.path.join(folder, 'elimination.wav'))
+    engine.register('victory', os.path.join(folder, 'victory.wav'))
+    engine.start()
+    if not engine.ready.wait(10) or engine.failed:
+        print("Sound system unavailable (is pygame installed?)")
+        return
+    while engine._queued:
+        time.sleep(0.01)
+
+    def on_button(name):
+        # Stand-in for the Tk command callback: event -> mixer call
+        return engine.play(name)
+
+    latencies = []
+    for i in range(events):
+        name = 'elimination' if i % 10 else 'victory'
+        start = time.perf_counter()
+        on_button(name)
+        latencies.append(time.perf_counter() - start)
+
+    print(f"{events:,} plays (burst, no pacing)")
+    print(f"event -> mixer call p50 {percentile(latencies, 50) * 1e6:.1f} us, "
+          f"p99 {percentile(latencies, 99) * 1e6:.1f} us, max {max(latencies) * 1e6:.1f} us")
+
+    for i in range(pack_size):
+        on_button(f'custom_{i:03}')
+    time.sleep(1.0)
+    print(f"custom pack: {pack_size} effects, cache {engine.cache_used / 1e6:.1f} MB "
+          f"of {engine.cache_bytes / 1e6:.1f} MB")
+    print(f"engine stats: {engine.stats}")
+    engine.stop()
+
+
+if __name__ == "__main__":
+    run()
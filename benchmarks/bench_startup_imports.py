@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'Fortnite-StreamCompanion.py')
+
+# Each scenario runs in a fresh interpreter so nothing is already imported.
+# The app module is executed without __main__, so no window is opened.
+CHILD = r'''
+import importlib.util
+import sys
+import time
+
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location('companion', {app!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+import lazy_imports
+for name in {eager!r}:
+    lazy_imports.load(name)
+elapsed = time.perf_counter() - start
+
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+except ImportError:
+    rss_mb = float('nan')
+print(elapsed, rss_mb)
+'''
+
+
+def measure(eager, runs=5):
+    times = []
+    rss = []
+    for _ in range(runs):
+        code = CHILD.format(root=ROOT, app=APP, eager=eager)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        elapsed, rss_mb = map(float, result.stdout.split())
+        times.append(elapsed)
+        rss.append(rss_mb)
+    times.sort()
+    return (times[len(times) // 2], max(rss)), None
+
+
+def run():
+    scenarios = [
+        ("lazy (startup)", ()),
+        ("eager cv2 + pygame", ('cv2', 'pygame')),
+    ]
+    print(f"{'scenario':<22} {'import ms':>10} {'max RSS MB':>11}")
+    baseline = None
+    for name, eager in scenarios:
+        result, error = measure(eager)
+        if error:
+            print(f"{name:<22} failed: {error}")
+            continue
+        elapsed, rss_mb = result
+        print(f"{name:<22} {elapsed * 1000:10.1f} {rss_mb:11.1f}")
+        if baseline is None:
+            baseline = result
+        else:
+            print(f"{'lazy saves':<22} {(elapsed - baseline[0]) * 1000:10.1f} {rss_mb - baseline[1]:11.1f}")
+
+
+if __name__ == "__main__":
+    run()
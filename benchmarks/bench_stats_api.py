@@ -0,0 +1,83 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_stats_api import FakeStatsApi
+from stats_api import StatsApiClient, normalize_stats
+
+# Runs the stats client against the local stand-in API: a burst of lookups
+# for a skewed set of players from several threads (coalescing + memory
+# cache), the same after the TTL expired (ETag revalidation), and again from
+# a fresh client on the same cache folder (disk tier after a restart).
+
+
+def burst(client, players, lookups, threads=8):
+    rng = random.Random(4)
+    # Few streamers looked up a lot, many rarely
+    names = [players[min(int(rng.paretovariate(1.2)) - 1, len(players) - 1)] for _ in range(lookups)]
+    chunks = [names[i::threads] for i in range(threads)]
+    errors = []
+
+    def worker(chunk):
+        for name in chunk:
+            try:
+                stats = normalize_stats(client.fetch('/v2/stats/br/v2', {'name': name, 'timeWindow': 'lifetime'}))
+                assert stats['games_played'] > 0
+            except Exception as e:
+                errors.append(e)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, errors
+
+
+def report(label, client, api, seconds, errors, lookups, upstream_before):
+    upstream = api.requests - upstream_before
+    s = client.stats
+    print(f"{label}: {lookups} lookups in {seconds:.2f}s, {upstream} upstream requests "
+          f"({(1 - upstream / lookups) * 100:.1f}% saved), errors {len(errors)}")
+    print(f"  memory hits {s['memory_hits']}, disk hits {s['disk_hits']}, coalesced {s['coalesced']}, "
+          f"304s {s['not_modified']}, rate-limit waits {s['rate_limited']}, stale served {s['stale_served']}")
+
+
+def main():
+    api = FakeStatsApi(port=0, latency=0.05, limit=300, max_age=60).start()
+    folder = tempfile.mkdtemp()
+    players = [f"player{i}" for i in range(60)]
+    url = f"http://127.0.0.1:{api.port}"
+    lookups = 2000
+
+    client = StatsApiClient(url, api_key='bench', ttl=2.0, cache_dir=folder, requests_per_minute=600, burst=20)
+    seconds, errors = burst(client, players, lookups)
+    report("cold", client, api, seconds, errors, lookups, 0)
+
+    time.sleep(2.5)
+    before = api.requests
+    seconds, errors = burst(client, players, lookups)
+    report("after TTL (revalidate)", client, api, seconds, errors, lookups, before)
+    print(f"  server connections opened so far: {len(api.connections)}")
+    client.close()
+
+    restarted = StatsApiClient(url, api_key='bench', ttl=600.0, cache_dir=folder)
+    before = api.requests
+    seconds, errors = burst(restarted, players, lookups)
+    report("restart (disk tier)", restarted, api, seconds, errors, lookups, before)
+    restarted.close()
+
+    api.stop()
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tournament import Tournament, ScoringRules, TOURNAMENT_RULES
+
+# Replays a 10-match session for 100 teams (and a 500-team multi-lobby
+# variant) through the incremental leaderboard, timing each result and each
+# rank/top-10 read, and compares against re-sorting every team after every
+# result. Also checks that both orders agree and that undoing a match
+# restores the previous board.
+
+
+def session(teams, matches, seed=1):
+    rng = random.Random(seed)
+    names = [f"Team {i:03}" for i in range(teams)]
+    skill = {name: rng.random() for name in names}
+    for _ in range(matches):
+        # Better teams tend to place higher and take more fights
+        order = sorted(names, key=lambda n: skill[n] + rng.random())[::-1]
+        yield [(name, place, max(0, int(rng.gauss(skill[name] * 6, 2)))) for place, name in enumerate(order, 1)]
+
+
+def full_sort(tournament):
+    return sorted(s.sort_key() for s in tournament.teams.values())
+
+
+def run(label, rules, teams, matches=10):
+    results = list(session(teams, matches))
+    updates = []
+    tournament = Tournament(label, rules, on_update=lambda t: updates.append(t.leaderboard(10)))
+
+    started = time.perf_counter()
+    for match in results:
+        tournament.add_match(match)
+    incremental = time.perf_counter() - started
+
+    # Baseline: same results, full re-sort after every single result
+    baseline = Tournament(label, rules)
+    started = time.perf_counter()
+    for match in results:
+        for row in match:
+            baseline._apply(*row, 1)
+            full_sort(baseline)
+    resorting = time.perf_counter() - started
+
+    assert tournament.order == full_sort(tournament)
+    started = time.perf_counter()
+    for name in tournament.teams:
+        tournament.rank(name)
+    ranks = time.perf_counter() - started
+    before = list(tournament.order)
+    tournament.add_match(results[0])
+    tournament.undo_match()
+    assert tournament.order == before
+
+    count = teams * matches
+    print(f"{label}: {count} results, incremental {incremental * 1000:.1f} ms "
+          f"({incremental / count * 1e6:.1f} us/result), re-sort per result {resorting * 1000:.1f} ms "
+          f"({resorting / incremental:.0f}x slower), rank lookup {ranks / teams * 1e6:.2f} us, "
+          f"{len(updates)} overlay pushes")
+    leader = tournament.top(1)[0]
+    print(f"  leader {leader.team}: {leader.points} pts, {leader.wins} wins, "
+          f"avg place {leader.avg_placement:.1f}, {leader.eliminations} elims")
+
+
+def main():
+    run("Solo Cash Cup, 100 teams", TOURNAMENT_RULES["Solo Cash Cup"], 100)
+    run("Multi-lobby scrim, 500 teams", ScoringRules(TOURNAMENT_RULES["Solo Cash Cup"].placement, 2, 1, 500), 500)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vod_notes import VodNotes, KeyframeIndex
+
+# A 6-hour VOD with 50,000 automatic markers plus hand-written notes: times
+# bulk and single inserts, playhead range queries, keyframe lookups, reload
+# from the sidecar and the three exports. The keyframe index is synthetic
+# (2s GOPs) so no video or ffprobe is needed.
+
+
+def timed(label, fn, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = time.perf_counter() - started
+    per = f", {elapsed / repeat * 1e6:.1f} us each" if repeat > 1 else ""
+    print(f"{label}: {elapsed * 1000:.1f} ms{per}")
+    return result
+
+
+def main():
+    markers = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    length = 6 * 3600
+    folder = tempfile.mkdtemp()
+    vod = os.path.join(folder, 'vod.mp4')
+    open(vod, 'w').close()
+    rng = random.Random(5)
+
+    times = array('d', (i * 2.0 for i in range(length // 2)))
+    positions = array('q', (i * 1_500_000 for i in range(length // 2)))
+    notes = VodNotes(vod, KeyframeIndex(times, positions))
+
+    auto = [(rng.uniform(0, length), f"auto marker {i}") for i in range(markers)]
+    timed(f"add_many {markers:,} markers", lambda: notes.add_many(auto))
+    timed("1,000 single notes", lambda: [notes.add(rng.uniform(0, length), "note") for _ in range(1000)])
+
+    def around_playhead():
+        position = rng.uniform(0, length)
+        return notes.between(position - 300, position + 300, limit=200)
+
+    timed("range query +/-5 min (first 200)", around_playhead, 10_000)
+    timed("keyframe lookup", lambda: notes.seek_point(rng.uniform(0, length)), 100_000)
+    notes.close()
+
+    reloaded = timed(f"reload {len(notes):,} notes from sidecar", lambda: VodNotes(vod))
+    reloaded.keyframes = notes.keyframes
+    timed("export YouTube chapters", lambda: reloaded.export_chapters(os.path.join(folder, 'chapters.txt')))
+    timed("export CSV", lambda: reloaded.export_csv(os.path.join(folder, 'notes.csv')))
+    timed("export EDL", lambda: reloaded.export_edl(os.path.join(folder, 'notes.edl')))
+    print(f"sidecar {os.path.getsize(notes.path) / 1e6:.1f} MB")
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
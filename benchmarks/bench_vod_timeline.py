@@ -0,0 +1,85 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lazy_imports
+from frame_sources import test_pattern
+from vod_timeline import ThumbnailStrip, FrameReader
+
+# Usage: bench_vod_timeline.py [minutes] [vod]
+# Generates a long 640x360 test VOD (or uses the one given), then times the
+# first open (probe + filling the whole thumbnail strip), a re-open from the
+# memmap cache, and scrubbing through FrameReader.
+
+
+def make_vod(path, minutes):
+    cv2 = lazy_imports.cv2()
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (640, 360))
+    for _, frame in test_pattern(640, 360, 30, seconds=minutes * 60, realtime=False):
+        writer.write(frame)
+    writer.release()
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    folder = tempfile.mkdtemp()
+    if len(sys.argv) > 2:
+        vod = sys.argv[2]
+    else:
+        vod = os.path.join(folder, 'vod.mp4')
+        started = time.perf_counter()
+        make_vod(vod, minutes)
+        print(f"generated {minutes:g} min VOD in {time.perf_counter() - started:.0f}s")
+    cache = os.path.join(folder, 'cache')
+
+    started = time.perf_counter()
+    strip = ThumbnailStrip(vod, cache_dir=cache)
+    opened = time.perf_counter() - started
+    first_quarter = []
+    strip.fill(on_thumbnail=lambda i: len(first_quarter) < strip.count // 4 and first_quarter.append(
+        time.perf_counter() - started))
+    filled = time.perf_counter() - started
+    print(f"first open: {opened * 1000:.0f} ms to open, coarse strip (1/4) after {first_quarter[-1]:.2f}s, "
+          f"all {strip.count} thumbnails after {filled:.2f}s")
+    del strip
+
+    started = time.perf_counter()
+    strip = ThumbnailStrip(vod, cache_dir=cache)
+    middle = strip.thumbs[strip.count // 2].copy()
+    reopened = time.perf_counter() - started
+    print(f"re-open: {reopened * 1000:.2f} ms (cache reused: {strip.reused}, complete: {strip.complete}, "
+          f"thumb mean {middle.mean():.0f})")
+
+    done = threading.Event()
+    frames = []
+
+    def on_frame(seconds, frame):
+        frames.append(seconds)
+        if seconds == final:
+            done.set()
+
+    reader = FrameReader(vod, on_frame)
+    final = strip.duration * 0.99
+    started = time.perf_counter()
+    # A fast drag: 200 positions in 2 seconds, most superseded before decoding
+    for i in range(200):
+        reader.request(strip.duration * i / 200)
+        time.sleep(0.01)
+    reader.request(final)
+    done.wait(10)
+    reader.close()
+    stats = reader.stats
+    print(f"scrub: {stats['requests']} requests, {stats['decoded']} decoded, {stats['skipped']} skipped, "
+          f"{stats['decode_seconds'] / max(stats['decoded'], 1) * 1000:.0f} ms per seek+decode, "
+          f"settled {time.perf_counter() - started - 2:.2f}s after the drag")
+    del strip
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
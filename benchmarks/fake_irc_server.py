@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import random
+import time
+
+# Local stand-in for irc.chat.twitch.tv. After a client joins it streams
+# PRIVMSG lines with Twitch-style IRCv3 tags at a fixed rate. Point the app at
+# it with TWITCH_IRC_HOST=127.0.0.1 TWITCH_IRC_PORT=6667 to test chat offline.
+
+WORDS = ['gg', 'W', 'L', 'POGGERS', 'KEKW', '!elims', '!wins', '1', '2', 'yes', 'no',
+         'clip it', 'no way', 'tilted?', 'what a shot', 'ez']
+
+
+def make_line(channel, n, rng):
+    user = f'viewer{rng.randrange(100_000)}'
+    text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 6)))
+    tags = (
+        f"@badge-info=;badges=subscriber/12;color=#1E90FF;display-name={user};"
+        f"emotes=;first-msg=0;flags=;id=msg-{n};mod=0;room-id=1234;subscriber=1;"
+        f"tmi-sent-ts={int(time.time() * 1000)};turbo=0;user-id={user[6:]};user-type="
+    )
+    return f"{tags} :{user}!{user}@{user}.tmi.twitch.tv PRIVMSG {channel} :{text}\r\n"
+
+
+class FakeIrcServer:
+    def __init__(self, host='127.0.0.1', port=6667, rate=5000, total=None, seed=1):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.total = total
+        self.seed = seed
+        self.server = None
+        self.sent = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def _client(self, reader, writer):
+        channel = None
+        while channel is None:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.startswith(b'JOIN '):
+                channel = line.split()[1].decode()
+        writer.write(f":tmi.twitch.tv 001 justinfan :Welcome, GLHF!\r\n"
+                     f":justinfan!justinfan@justinfan.tmi.twitch.tv JOIN {channel}\r\n".encode())
+
+        rng = random.Random(self.seed)
+        tick = 0.01
+        per_tick = max(int(self.rate * tick), 1)
+        next_tick = time.perf_counter()
+        try:
+            while self.total is None or self.sent < self.total:
+                count = per_tick if self.total is None else min(per_tick, self.total - self.sent)
+                writer.write(''.join(make_line(channel, self.sent + i, rng) for i in range(count)).encode())
+                self.sent += count
+                if self.sent % (per_tick * 500) < per_tick:
+                    writer.write(b"PING :tmi.twitch.tv\r\n")
+                await writer.drain()
+                next_tick += tick
+                await asyncio.sleep(max(next_tick - time.perf_counter(), 0))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Twitch IRC server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6667)
+    parser.add_argument('--rate', type=int, default=5000, help="messages per second")
+    args = parser.parse_args()
+
+    async def serve():
+        server = await FakeIrcServer(args.host, args.port, args.rate).start()
+        print(f"Fake Twitch IRC on {args.host}:{server.port} at {args.rate} msg/s")
+        await server.server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
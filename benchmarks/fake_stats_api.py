@@ -0,0 +1,126 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-in for the fortnite-api.com stats endpoint. Serves
+# /v2/stats/br/v2?name=... with stable per-player numbers, an ETag, a
+# Cache-Control max-age and X-RateLimit headers, answers 429 once a client
+# exceeds `limit` requests per window, and adds a fixed latency per request.
+# Point the app at it with FORTNITE_API_URL=http://127.0.0.1:8899.
+
+
+class FakeStatsApi:
+    def __init__(self, host='127.0.0.1', port=8899, latency=0.05, limit=120, window=60.0, max_age=60):
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.max_age = max_age
+        self.requests = 0
+        self.not_modified = 0
+        self.throttled = 0
+        self.connections = set()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _admit(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            self.requests += 1
+            remaining = self.limit - self._window_count
+            reset = self.window - (now - self._window_start)
+            return remaining, reset
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                api.connections.add(self.client_address)
+                remaining, reset = api._admit()
+                time.sleep(api.latency)
+                if remaining < 0:
+                    api.throttled += 1
+                    self._send(429, b'{"status":429}', {'Retry-After': f"{reset:.1f}"})
+                    return
+                url = urlparse(self.path)
+                name = parse_qs(url.query).get('name', [''])[0]
+                if url.path != '/v2/stats/br/v2' or not name:
+                    self._send(404, b'{"status":404}')
+                    return
+                seed = int(hashlib.sha1(name.encode()).hexdigest()[:8], 16)
+                matches = 200 + seed % 3000
+                body = json.dumps({'status': 200, 'data': {
+                    'account': {'id': hex(seed), 'name': name},
+                    'stats': {'all': {'overall': {
+                        'wins': matches // 12, 'kills': matches * 2, 'matches': matches,
+                        'top10': matches // 4, 'kd': 2.1, 'winRate': 8.3
+                    }}}
+                }}).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                headers = {
+                    'ETag': etag,
+                    'Cache-Control': f"max-age={api.max_age}",
+                    'X-RateLimit-Remaining': str(max(remaining, 0)),
+                    'X-RateLimit-Reset': f"{reset:.1f}"
+                }
+                if self.headers.get('If-None-Match') == etag:
+                    api.not_modified += 1
+                    self._send(304, b'', headers)
+                    return
+                self._send(200, body, headers)
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8899)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--limit', type=int, default=120)
+    args = parser.parse_args()
+    api = FakeStatsApi(port=args.port, latency=args.latency, limit=args.limit).start()
+    print(f"Fake stats API on http://127.0.0.1:{api.port}")
+    try:
+        api.thread.join()
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
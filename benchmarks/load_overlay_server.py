@@ -0,0 +1,85 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from overlay_server import OverlayServer, OVERLAY_TYPES
+
+
+async def ws_client(port, slug, results, stop):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(
+        f"GET /ws/{slug} HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\n"
+        f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+    )
+    await reader.readuntil(b'\r\n\r\n')
+    messages = 0
+    latencies = []
+    try:
+        while not stop.is_set():
+            header = await asyncio.wait_for(reader.readexactly(2), 1)
+            length = header[1] & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', await reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', await reader.readexactly(8))[0]
+            payload = json.loads(await reader.readexactly(length))
+            messages += 1
+            if 'sent' in payload:
+                latencies.append(time.perf_counter() - payload['sent'])
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    writer.close()
+    results.append((messages, latencies))
+
+
+async def main(clients=60, seconds=5, rate=60):
+    server = OverlayServer(port=0)
+    # Every overlay also renders "sent" so the load test can measure latency
+    for slug, fields in server._slugs.items():
+        server._slugs[slug] = fields + ('sent',)
+    server.start()
+
+    slugs = [slug for slug, _ in OVERLAY_TYPES.values()]
+    stop = asyncio.Event()
+    results = []
+    tasks = [asyncio.ensure_future(ws_client(server.port, slugs[i % len(slugs)], results, stop))
+             for i in range(clients)]
+    await asyncio.sleep(0.5)
+
+    update_cost = []
+    elims = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        elims += 1
+        start = time.perf_counter()
+        # Simulated Tk frame: one changed stat, several unchanged ones
+        server.update(eliminations=elims, victories=elims // 100, kd='2.5', sent=start)
+        update_cost.append(time.perf_counter() - start)
+        await asyncio.sleep(1 / rate)
+
+    await asyncio.sleep(0.5)
+    stop.set()
+    await asyncio.gather(*tasks)
+    server.stop()
+
+    total = sum(m for m, _ in results)
+    latencies = sorted(l for _, ls in results for l in ls)
+    update_cost.sort()
+    print(f"{clients} clients, {elims} updates at {rate}/s: {total:,} messages delivered")
+    print(f"update() on caller thread p50 {update_cost[len(update_cost) // 2] * 1e6:.0f} us, "
+          f"max {update_cost[-1] * 1e6:.0f} us")
+    if latencies:
+        print(f"delivery latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    print(f"server stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
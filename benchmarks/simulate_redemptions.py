@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redemptions import RedemptionQueue
+
+REWARDS = ["Challenge: No Building", "Challenge: Pistols Only", "Sound: victory", "Poll: One More Game?"]
+
+
+def make_redemption(n, rng, users):
+    return {
+        'id': f"redemption-{n}",
+        'reward': rng.choice(REWARDS),
+        'user': f"viewer{rng.randrange(users)}",
+        'input': ''
+    }
+
+
+def run(bursts=5, burst_size=2000, users=400, handler_ms=2.0):
+    rng = random.Random(5)
+    path = os.path.join(tempfile.mkdtemp(prefix='redemptions-'), 'redemptions.log')
+    handled = []
+    lock = threading.Lock()
+
+    def handler(redemption):
+        # Stand-in for posting the action to the UI and waiting for it
+        time.sleep(handler_ms / 1000)
+        with lock:
+            handled.append(redemption['id'])
+
+    q = RedemptionQueue(path, handler, workers=4, max_pending=500, max_per_user=3)
+    q.start()
+    n = 0
+    submit_times = []
+    for burst in range(bursts):
+        for _ in range(burst_size):
+            # Twitch sometimes redelivers; resend ~5% of recent ids
+            if n and rng.random() < 0.05:
+                redemption = make_redemption(rng.randrange(max(n - 50, 0), n), rng, users)
+            else:
+                redemption = make_redemption(n, rng, users)
+                n += 1
+            start = time.perf_counter()
+            q.submit(redemption)
+            submit_times.append(time.perf_counter() - start)
+        print(f"burst {burst + 1}: backlog {q.backlog}, stats {q.stats}")
+        time.sleep(0.5)
+
+    # Simulated crash in the middle of a burst: stop workers without
+    # draining, then restart from the log
+    for _ in range(burst_size):
+        q.submit(make_redemption(n, rng, users))
+        n += 1
+    q.stop(drain=False)
+    left = q.backlog
+    restarted = RedemptionQueue(path, handler, workers=4)
+    print(f"restart: {left} waiting before crash, {restarted.stats['recovered']} recovered from log")
+    restarted.start()
+    while restarted.backlog:
+        time.sleep(0.05)
+    restarted.stop()
+
+    submit_times.sort()
+    print(f"handled {len(handled):,} ({len(set(handled)):,} unique ids)")
+    print(f"submit latency p50 {submit_times[len(submit_times) // 2] * 1e6:.0f} us, "
+          f"p99 {submit_times[int(len(submit_times) * 0.99)] * 1e6:.0f} us (includes fsync)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import tkinter as tk
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from popups import PopupManager
+
+COLORS = {'bg': '#121212', 'success': '#00FF00', 'warning': '#FFA500'}
+
+
+def run(events=10_000):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Needs a display: {e}")
+        return 2
+    root.withdraw()
+
+    def create_button(parent, text, command):
+        return tk.Button(parent, text=text, command=command)
+
+    popups = PopupManager(root, COLORS, create_button, toasts=2)
+
+    def fire(i):
+        # Short durations so toasts cycle through the pool during the run
+        if i % 3:
+            popups.toast("VICTORY ROYALE!", COLORS['success'], duration=1, key='victory')
+        else:
+            popups.toast("TOP 10!", COLORS['warning'], duration=1, key='top_10')
+        if i % 50 == 0:
+            popups.dialog("Poll", f"Question {i}", ["Yes", "No"])
+            dialog = popups.dialogs[0]
+            popups._choose(dialog, "Yes")
+
+    # Warm up so both pools are fully built before measuring
+    for i in range(200):
+        fire(i)
+        root.update()
+    baseline_widgets = popups.widget_count()
+    tracemalloc.start()
+    baseline_memory = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    peak_widgets = baseline_widgets
+    for i in range(events):
+        fire(i)
+        if i % 10 == 0:
+            root.update()
+            peak_widgets = max(peak_widgets, popups.widget_count())
+    elapsed = time.perf_counter() - start
+    root.update()
+
+    memory = tracemalloc.get_traced_memory()[0] - baseline_memory
+    print(f"{events:,} events in {elapsed:.2f}s")
+    print(f"widgets: baseline {baseline_widgets}, peak {peak_widgets}, final {popups.widget_count()}")
+    print(f"python heap growth {memory / 1024:.1f} KiB, merged {popups.merged:,}, dropped {popups.dropped:,}")
+    root.destroy()
+
+    if peak_widgets != baseline_widgets:
+        print("FAIL: widget count grew")
+        return 1
+    print("OK: widget count constant")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,171 @@
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+
+class TokenBucket:
+    # Refills `rate` tokens per second up to `capacity`. State is a plain
+    # (tokens, stamp) tuple so per-user buckets can live in a dict cheaply.
+
+    def __init__(self, capacity, rate):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        # Seconds until an empty bucket is full again; idle state older than
+        # this is indistinguishable from a fresh bucket and can be dropped
+        self.horizon = self.capacity / self.rate if self.rate else float('inf')
+
+    def take(self, state, now):
+        if state is None:
+            tokens = self.capacity
+        else:
+            tokens, stamp = state
+            tokens = min(self.capacity, tokens + (now - stamp) * self.rate)
+        if tokens < 1.0:
+            return False, (tokens, now)
+        return True, (tokens - 1.0, now)
+
+
+class BucketTable:
+    # Per-key token bucket state with bounded memory. Entries are kept in
+    # last-used order, so expired ones are always at the front and pruning is
+    # amortised O(1); max_keys caps memory even when millions of distinct
+    # users are active within one refill horizon.
+
+    def __init__(self, bucket, max_keys=100_000):
+        self.bucket = bucket
+        self.max_keys = max_keys
+        self.states = OrderedDict()
+
+    def take(self, key, now):
+        states = self.states
+        allowed, state = self.bucket.take(states.pop(key, None), now)
+        states[key] = state
+        self._prune(now)
+        return allowed
+
+    def _prune(self, now):
+        states = self.states
+        horizon = self.bucket.horizon
+        while states:
+            key, (_, stamp) = next(iter(states.items()))
+            if len(states) <= self.max_keys and now - stamp < horizon:
+                break
+            del states[key]
+
+    def __len__(self):
+        return len(self.states)
+
+
+class ChatCommand:
+    def __init__(self, name, handler, aliases=(), global_cooldown=0.0, user_cooldown=0.0,
+                 description=''):
+        self.name = name
+        self.handler = handler
+        self.aliases = tuple(aliases)
+        self.description = description
+        self.global_cooldown = global_cooldown
+        self.user_cooldown = user_cooldown
+        self.global_bucket = TokenBucket(1, 1 / global_cooldown) if global_cooldown else None
+        self.global_state = None
+        self.user_buckets = None
+        if user_cooldown:
+            self.user_buckets = BucketTable(TokenBucket(1, 1 / user_cooldown))
+
+
+class CommandRouter:
+    # Dispatches "!command args" chat messages.
+    #
+    # Names and aliases share one dict, so an exact match is a single lookup
+    # however many commands are registered. A sorted name list backs
+    # unambiguous prefix matches ("!ele" -> "!elims") with bisect. Spam is
+    # limited by a per-user token bucket shared by all commands, plus optional
+    # global and per-user cooldowns on each command.
+
+    def __init__(self, prefix='!', user_burst=3, user_rate=0.5, max_users=100_000,
+                 allow_prefix_match=True):
+        self.prefix = prefix
+        self.allow_prefix_match = allow_prefix_match
+        self.commands = []
+        self.index = {}
+        self.names = []
+        self.users = BucketTable(TokenBucket(user_burst, user_rate), max_users)
+        self.stats = {'dispatched': 0, 'ignored': 0, 'rate_limited': 0, 'cooldown': 0}
+
+    def register(self, name, handler, aliases=(), global_cooldown=0.0, user_cooldown=0.0,
+                 description=''):
+        command = ChatCommand(name, handler, aliases, global_cooldown, user_cooldown, description)
+        self.commands.append(command)
+        for key in (name,) + command.aliases:
+            self.index[key.lower()] = command
+        self.names = sorted(self.index)
+        return command
+
+    def resolve(self, word):
+        command = self.index.get(word)
+        if command is not None or not self.allow_prefix_match or not word:
+            return command
+        names = self.names
+        i = bisect_left(names, word)
+        if i == len(names) or not names[i].startswith(word):
+            return None
+        match = self.index[names[i]]
+        # Every name sharing the prefix must point at the same command
+        i += 1
+        while i < len(names) and names[i].startswith(word):
+            if self.index[names[i]] is not match:
+                return None
+            i += 1
+        return match
+
+    def dispatch(self, user, text, now=None):
+        if not text.startswith(self.prefix):
+            return None
+        word, _, args = text[len(self.prefix):].partition(' ')
+        command = self.resolve(word.lower())
+        if command is None:
+            self.stats['ignored'] += 1
+            return None
+
+        now = now if now is not None else time.monotonic()
+        if not self.users.take(user, now):
+            self.stats['rate_limited'] += 1
+            return None
+        if command.global_bucket is not None:
+            allowed, command.global_state = command.global_bucket.take(command.global_state, now)
+            if not allowed:
+                self.stats['cooldown'] += 1
+                return None
+        if command.user_buckets is not None and not command.user_buckets.take(user, now):
+            self.stats['cooldown'] += 1
+            return None
+
+        self.stats['dispatched'] += 1
+        try:
+            return command.handler(user, args.strip())
+        except Exception as e:
+            print(f"Error running chat command {command.name}: {e}")
+            return None
+
+    def dispatch_batch(self, messages, now=None):
+        now = now if now is not None else time.monotonic()
+        replies = []
+        prefix = self.prefix
+        for message in messages:
+            text = message.text
+            if text.startswith(prefix):
+                reply = self.dispatch(message.user_id, text, now)
+                if reply:
+                    replies.append(reply)
+        return replies
+
+    def help_text(self):
+        lines = []
+        for command in self.commands:
+            names = ', '.join(self.prefix + n for n in (command.name,) + command.aliases)
+            line = names
+            if command.description:
+                line += f" - {command.description}"
+            if command.global_cooldown or command.user_cooldown:
+                line += f" (cooldown {command.global_cooldown:g}s / {command.user_cooldown:g}s per user)"
+            lines.append(line)
+        return '\n'.join(lines)
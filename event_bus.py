@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import deque
+
+
+class EventBus:
+    # Thread-safe path from workers to the Tk thread.
+    #
+    # Worker threads and asyncio tasks call post() or coalesce(); both only
+    # append to in-memory structures and never touch Tk. A single pump,
+    # rescheduled with root.after, drains posted events in batches and runs
+    # subscribers on the Tk thread. coalesce() keeps only the latest update per
+    # key until the next pump, so a counter changing a thousand times within a
+    # frame redraws once. The pump also measures how late each tick fires,
+    # which is the event-loop lag the UI actually sees.
+
+    def __init__(self, root, interval_ms=16, budget_ms=8, lag_warning_ms=100):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000
+        self.lag_warning = lag_warning_ms / 1000
+
+        self.handlers = {}
+        self._events = deque()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._after_id = None
+        self._next_tick = None
+
+        self.stats = {
+            'dispatched': 0, 'coalesced': 0, 'applied': 0,
+            'ticks': 0, 'lag_ms': 0.0, 'max_lag_ms': 0.0, 'backlog': 0
+        }
+
+    def subscribe(self, kind, handler):
+        self.handlers.setdefault(kind, []).append(handler)
+
+    # Producer side (any thread)
+    def post(self, kind, *args):
+        # deque.append is atomic, no lock needed
+        self._events.append((kind, args))
+
+    def coalesce(self, key, callback, *args):
+        with self._lock:
+            if key in self._latest:
+                self.stats['coalesced'] += 1
+            self._latest[key] = (callback, args)
+
+    # Tk side
+    def start(self):
+        if self._after_id is None:
+            self._next_tick = time.perf_counter()
+            self._after_id = self.root.after(0, self.pump)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def pump(self):
+        now = time.perf_counter()
+        lag = max(now - self._next_tick, 0.0)
+        self.stats['lag_ms'] = lag * 1000
+        self.stats['max_lag_ms'] = max(self.stats['max_lag_ms'], lag * 1000)
+        if lag > self.lag_warning:
+            print(f"Warning: UI event loop lagging by {lag * 1000:.0f} ms")
+
+        try:
+            self.drain(now + self.budget)
+        finally:
+            self.stats['ticks'] += 1
+            self._next_tick = time.perf_counter() + self.interval_ms / 1000
+            self._after_id = self.root.after(self.interval_ms, self.pump)
+
+    def drain(self, deadline=None):
+        events = self._events
+        handlers = self.handlers
+        dispatched = 0
+        while events:
+            kind, args = events.popleft()
+            for handler in handlers.get(kind, ()):
+                try:
+                    handler(*args)
+                except Exception as e:
+                    print(f"Error handling {kind} event: {e}")
+            dispatched += 1
+            # Check the clock every few events; leftovers wait for the next tick
+            if deadline is not None and dispatched % 64 == 0 and time.perf_counter() > deadline:
+                break
+        self.stats['dispatched'] += dispatched
+        self.stats['backlog'] = len(events)
+
+        with self._lock:
+            latest, self._latest = self._latest, {}
+        for callback, args in latest.values():
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error applying UI update: {e}")
+        self.stats['applied'] += len(latest)
+        return dispatched
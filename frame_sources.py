@@ -0,0 +1,103 @@
+import os
+import time
+
+import numpy as np
+
+import lazy_imports
+
+# Frame sources are generators of (timestamp, frame): the timestamp is media
+# time in seconds from the start of the source and the frame is an HxWx3
+# BGR uint8 array, the layout cv2 uses. Replay, recording and vision code take
+# any of them, so they run the same on a capture device, a recorded VOD or a
+# synthetic pattern on a headless machine.
+
+
+def test_pattern(width=1280, height=720, fps=30, seconds=None, realtime=True):
+    # Scrolling colour bars with a progress strip, different every frame so
+    # encoders cannot skip anything
+    colors = np.array([
+        (255, 255, 255), (0, 255, 255), (255, 255, 0), (0, 255, 0),
+        (255, 0, 255), (0, 0, 255), (255, 0, 0), (0, 0, 0)
+    ], dtype=np.uint8)
+    bars = colors[np.arange(width) * len(colors) // width]
+    base = np.repeat(bars[np.newaxis], height, axis=0)
+    strip = max(height // 20, 1)
+    total = None if seconds is None else int(seconds * fps)
+    started = time.perf_counter()
+    i = 0
+    while total is None or i < total:
+        timestamp = i / fps
+        if realtime:
+            delay = started + timestamp - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        frame = np.roll(base, (i * 8) % width, axis=1)
+        frame[:strip, :(i % fps + 1) * width // fps] = 32
+        yield timestamp, frame
+        i += 1
+
+
+def video_file(path, realtime=False, start_seconds=0.0):
+    # Opened here rather than inside the generator, so a missing or
+    # unreadable file raises to the caller instead of on the first next()
+    # in some worker thread
+    cv2 = lazy_imports.cv2()
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise OSError(f"Could not open video {path}")
+    if start_seconds:
+        capture.set(cv2.CAP_PROP_POS_MSEC, start_seconds * 1000)
+    return _video_frames(cv2, capture, realtime, start_seconds)
+
+
+def _video_frames(cv2, capture, realtime, start_seconds):
+    try:
+        started = time.perf_counter()
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            if realtime:
+                delay = started + timestamp - start_seconds - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield timestamp, frame
+    finally:
+        capture.release()
+
+
+def capture_device(index=0, width=None, height=None):
+    cv2 = lazy_imports.cv2()
+    capture = cv2.VideoCapture(index)
+    if not capture.isOpened():
+        raise OSError(f"Could not open capture device {index}")
+    if width and height:
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    return _device_frames(capture)
+
+
+def _device_frames(capture):
+    try:
+        started = time.monotonic()
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            yield time.monotonic() - started, frame
+    finally:
+        capture.release()
+
+
+def open_source(spec, **options):
+    # "test" -> test pattern, "0"/"1"/... -> capture device (OBS virtual
+    # camera, capture card), anything else -> video file played in real time
+    spec = str(spec).strip()
+    if spec == 'test':
+        return test_pattern(**options)
+    if spec.isdigit():
+        return capture_device(int(spec), **options)
+    if not os.path.exists(spec):
+        raise OSError(f"No such video source: {spec}")
+    return video_file(spec, realtime=True, **options)
@@ -0,0 +1,313 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import lazy_imports
+
+# ffmpeg encoders used to re-encode the partial GOPs at the clip edges so they
+# can be joined to the stream-copied middle without a codec change
+EDGE_ENCODERS = {'h264': 'libx264', 'hevc': 'libx265', 'mpeg4': 'mpeg4', 'vp9': 'libvpx-vp9'}
+KEYFRAME_WINDOW = 12.0
+
+# ffprobe profile names -> encoder -profile:v values
+H264_PROFILES = {
+    'Constrained Baseline': 'baseline', 'Baseline': 'baseline', 'Main': 'main', 'High': 'high',
+    'High 10': 'high10', 'High 4:2:2': 'high422', 'High 4:4:4 Predictive': 'high444'
+}
+HEVC_PROFILES = {'Main': 'main', 'Main 10': 'main10', 'Main Still Picture': 'mainstillpicture'}
+
+
+def ffmpeg_available():
+    return shutil.which('ffmpeg') is not None and shutil.which('ffprobe') is not None
+
+
+def probe_video(path):
+    out = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', 'stream=codec_name,profile,level,pix_fmt,width,height', '-of', 'json', path],
+        capture_output=True, text=True, check=True
+    ).stdout
+    streams = json.loads(out).get('streams') or [{}]
+    return streams[0]
+
+
+def edge_codec(video):
+    # Encoder arguments for the re-encoded edges that reproduce the source's
+    # profile, level and pixel format, so the decoder configuration matches
+    # the stream-copied middle. None if that cannot be guaranteed.
+    codec = video.get('codec_name')
+    encoder = EDGE_ENCODERS.get(codec)
+    if encoder is None:
+        return None
+    args = ['-c:v', encoder, '-pix_fmt', video.get('pix_fmt') or 'yuv420p']
+    level = video.get('level')
+    if codec == 'h264':
+        profile = H264_PROFILES.get(video.get('profile'))
+        if profile is None:
+            return None
+        args += ['-profile:v', profile]
+        if isinstance(level, int) and level > 0:
+            args += ['-level:v', f"{level / 10:.1f}"]
+    elif codec == 'hevc':
+        profile = HEVC_PROFILES.get(video.get('profile'))
+        if profile is None:
+            return None
+        args += ['-profile:v', profile]
+        if isinstance(level, int) and level > 0:
+            # HEVC reports level_idc, which is 30 x the level number
+            args += ['-x265-params', f"level-idc={level / 30:.1f}"]
+    return args + ['-c:a', 'copy']
+
+
+def junction_errors(path, joins, window=1.0):
+    # Decodes a short stretch around each join and returns ffmpeg's error
+    # output; empty means every junction decodes cleanly
+    errors = []
+    for seconds in joins:
+        result = subprocess.run(
+            ['ffmpeg', '-v', 'error', '-ss', f"{max(seconds - window, 0):.3f}", '-i', path,
+             '-t', f"{window * 2:.3f}", '-map', '0:v:0', '-f', 'null', '-'],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0 or result.stderr.strip():
+            errors.append(f"{format_time(seconds)}: {result.stderr.strip()[-200:]}")
+    return errors
+
+
+def keyframes_near(path, seconds, window=KEYFRAME_WINDOW):
+    # Lists keyframe times within +/- window of a cut point. -read_intervals
+    # seeks there and only packet headers are read, nothing is decoded, so
+    # this costs the same on a 3-hour VOD as on a short clip.
+    start = max(seconds - window, 0.0)
+    out = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+         '-read_intervals', f"{start:.3f}%{seconds + window:.3f}",
+         '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', path],
+        capture_output=True, text=True, check=True
+    ).stdout
+    keyframes = []
+    for line in out.splitlines():
+        pts, _, flags = line.partition(',')
+        if 'K' in flags and pts not in ('', 'N/A'):
+            keyframes.append(float(pts))
+    keyframes.sort()
+    return keyframes
+
+
+class HighlightJob:
+    def __init__(self, source, start, end, output):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.output = output
+        self.status = 'queued'
+        self.progress = 0.0
+        self.method = None
+        self.error = None
+        self.seconds = None
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+class HighlightExporter:
+    # Exports highlight segments from long VODs on a small worker pool.
+    #
+    # With ffmpeg available a segment is cut on keyframe boundaries: the
+    # GOP-aligned middle is stream-copied (no decode, limited by disk I/O),
+    # and only the partial GOPs before the first and after the last keyframe
+    # inside the segment are re-encoded, with the source codec, profile, level
+    # and pixel format. Parts are cut as MPEG-TS, which carries SPS/PPS in
+    # band, so each part brings its own decoder setup into the join, and the
+    # joins are test-decoded afterwards. If the codec or profile has no
+    # matching encoder, the segment holds no full GOP or a join does not
+    # decode cleanly, the cut snaps back to the previous keyframe and is
+    # copied whole. Without ffmpeg, cv2 decodes and re-encodes
+    # just the segment (video only). The work runs in ffmpeg processes, so
+    # threads are enough for the pool; progress is reported per job through
+    # on_progress(job) from the worker threads.
+
+    def __init__(self, workers=3, on_progress=None, on_done=None, smart_cut=True):
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.smart_cut = smart_cut
+        self.use_ffmpeg = ffmpeg_available()
+        self.jobs = []
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='highlight')
+        self._lock = threading.Lock()
+
+    def submit(self, source, start, end, output):
+        job = HighlightJob(source, start, end, output)
+        with self._lock:
+            self.jobs.append(job)
+        self._pool.submit(self._run, job)
+        return job
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait)
+
+    def _report(self, job, progress):
+        job.progress = min(max(progress, 0.0), 1.0)
+        if self.on_progress is not None:
+            self.on_progress(job)
+
+    def _run(self, job):
+        job.status = 'running'
+        started = time.perf_counter()
+        try:
+            os.makedirs(os.path.dirname(job.output) or '.', exist_ok=True)
+            if self.use_ffmpeg:
+                self._export_ffmpeg(job)
+            else:
+                self._export_cv2(job)
+            job.status = 'done'
+            self._report(job, 1.0)
+        except Exception as e:
+            job.status = 'failed'
+            job.error = e
+            print(f"Error exporting highlight {job.output}: {e}")
+        job.seconds = time.perf_counter() - started
+        if self.on_done is not None:
+            self.on_done(job)
+
+    def _export_ffmpeg(self, job):
+        video = probe_video(job.source)
+        edge = edge_codec(video)
+        near_start = keyframes_near(job.source, job.start)
+        near_end = near_start if job.duration <= KEYFRAME_WINDOW else keyframes_near(job.source, job.end)
+        first = next((k for k in near_start if job.start <= k < job.end), None)
+        last = next((k for k in reversed(near_end) if job.start < k <= job.end), None)
+
+        if not self.smart_cut or edge is None or first is None or last is None or last <= first:
+            self._export_copy(job, near_start)
+            return
+
+        job.method = 'smart'
+        parts = []
+        if first - job.start > 0.001:
+            parts.append(('head', job.start, first, edge))
+        parts.append(('middle', first, last, ['-c', 'copy']))
+        if job.end - last > 0.001:
+            parts.append(('tail', last, job.end, edge))
+
+        folder = tempfile.mkdtemp(prefix='highlight-')
+        try:
+            done = 0.0
+            listing = []
+            for name, start, end, codec in parts:
+                path = os.path.join(folder, name + '.ts')
+                weight = (end - start) / job.duration
+                self._ffmpeg(job, ['-ss', f"{start:.3f}", '-i', job.source, '-t', f"{end - start:.3f}",
+                                   '-map', '0:v:0', '-map', '0:a?'] + codec +
+                             ['-avoid_negative_ts', 'make_zero', path], done, weight)
+                done += weight
+                listing.append(f"file '{path}'\n")
+            list_path = os.path.join(folder, 'parts.txt')
+            with open(list_path, 'w') as f:
+                f.writelines(listing)
+            self._ffmpeg(job, ['-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy',
+                               '-movflags', '+faststart', job.output], done, 0.0)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+        joins = [first - job.start] if parts[0][0] == 'head' else []
+        if parts[-1][0] == 'tail':
+            joins.append(last - job.start)
+        errors = junction_errors(job.output, joins)
+        if errors:
+            print(f"Warning: Smart cut of {job.output} does not decode cleanly at "
+                  f"{'; '.join(errors)}; exporting with stream copy instead")
+            self._export_copy(job, near_start)
+
+    def _export_copy(self, job, near_start):
+        # Copy from the keyframe at or before the start: a little longer than
+        # asked, but nothing is re-encoded
+        before = [k for k in near_start if k <= job.start]
+        start = before[-1] if before else job.start
+        job.method = 'copy'
+        self._ffmpeg(job, ['-ss', f"{start:.3f}", '-i', job.source, '-t', f"{job.end - start:.3f}",
+                           '-map', '0:v:0', '-map', '0:a?', '-c', 'copy',
+                           '-avoid_negative_ts', 'make_zero', job.output], 0.0, 1.0)
+
+    def _ffmpeg(self, job, args, base, weight):
+        # Runs one ffmpeg step, mapping its -progress output onto the job's
+        # overall progress between base and base + weight
+        process = subprocess.Popen(
+            ['ffmpeg', '-y', '-nostats', '-loglevel', 'error', '-progress', 'pipe:1'] + args,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        length = None
+        for i, arg in enumerate(args):
+            if arg == '-t':
+                length = float(args[i + 1])
+        for line in process.stdout:
+            key, _, value = line.strip().partition('=')
+            if key == 'out_time_us' and length and value.isdigit():
+                self._report(job, base + weight * min(int(value) / 1e6 / length, 1.0))
+        errors = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {errors.strip()[-300:]}")
+
+    def _export_cv2(self, job):
+        cv2 = lazy_imports.cv2()
+        job.method = 'reencode'
+        capture = cv2.VideoCapture(job.source)
+        if not capture.isOpened():
+            raise OSError(f"Could not open {job.source}")
+        writer = None
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 30
+            capture.set(cv2.CAP_PROP_POS_MSEC, job.start * 1000)
+            total = max(int(job.duration * fps), 1)
+            for frame_number in range(total):
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                if writer is None:
+                    height, width = frame.shape[:2]
+                    writer = cv2.VideoWriter(job.output, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+                writer.write(frame)
+                if frame_number % 30 == 0:
+                    self._report(job, frame_number / total)
+        finally:
+            capture.release()
+            if writer is not None:
+                writer.release()
+
+
+def parse_ranges(text):
+    # "1:02:30-1:03:00, 2:10:00+30" -> [(3750.0, 3780.0), (7800.0, 7830.0)]
+    ranges = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '+' in part:
+            start, length = part.split('+', 1)
+            start = parse_time(start)
+            ranges.append((start, start + float(length)))
+        else:
+            start, end = part.split('-', 1)
+            ranges.append((parse_time(start), parse_time(end)))
+    for start, end in ranges:
+        if end <= start:
+            raise ValueError(f"Highlight ends before it starts: {format_time(start)}")
+    return ranges
+
+
+def parse_time(text):
+    seconds = 0.0
+    for field in text.strip().split(':'):
+        seconds = seconds * 60 + float(field)
+    return seconds
+
+
+def format_time(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02}:{seconds % 60:02}"
@@ -0,0 +1,258 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import lazy_imports
+
+# HUD regions as (x, y, width, height) fractions of the frame, for the default
+# 16:9 HUD layout. A hud_regions.json with the same keys overrides them for
+# other HUD scales or aspect ratios.
+DEFAULT_REGIONS = {
+    'players': (0.862, 0.212, 0.038, 0.030),
+    'elims': (0.928, 0.212, 0.038, 0.030),
+    'victory': (0.300, 0.120, 0.400, 0.110),
+}
+GLYPH_SIZE = (10, 16)  # width, height every digit is normalised to
+READ_HEIGHT = 24       # number crops are downscaled to this height first
+
+
+def load_regions(path='hud_regions.json'):
+    regions = dict(DEFAULT_REGIONS)
+    try:
+        with open(path, 'r') as f:
+            regions.update({k: tuple(v) for k, v in json.load(f).items()})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load HUD regions: {e}")
+    return regions
+
+
+def _glyph(cv2, ink):
+    rows = np.flatnonzero(ink.any(axis=1))
+    if not len(rows):
+        return None
+    ink = ink[rows[0]:rows[-1] + 1]
+    return cv2.resize(ink.astype(np.float32), GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def digit_templates(folder='hud_templates'):
+    # Templates captured from the real HUD (hud_templates/digit_0.png ...)
+    # match best; digits rendered with a bold Hershey font are the fallback
+    cv2 = lazy_imports.cv2()
+    templates = []
+    for digit in range(10):
+        path = os.path.join(folder, f"digit_{digit}.png")
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE) if os.path.exists(path) else None
+        if image is None:
+            image = np.zeros((40, 30), np.uint8)
+            cv2.putText(image, str(digit), (3, 34), cv2.FONT_HERSHEY_DUPLEX, 1.2, 255, 3)
+        ink = image > 127
+        columns = np.flatnonzero(ink.any(axis=0))
+        templates.append(_glyph(cv2, ink[:, columns[0]:columns[-1] + 1]))
+    return np.stack(templates)
+
+
+class DigitReader:
+    # Reads a white HUD number from a grayscale crop: threshold, split glyphs
+    # on empty columns, then score every glyph against all ten templates in
+    # one broadcast (glyphs x templates x pixels) instead of a loop per digit.
+
+    def __init__(self, templates, threshold=170, max_distance=0.12, max_digits=3):
+        self.templates = templates
+        self.threshold = threshold
+        self.max_distance = max_distance
+        self.max_digits = max_digits
+
+    def read(self, gray):
+        cv2 = lazy_imports.cv2()
+        ink = gray > self.threshold
+        columns = np.concatenate(([0], ink.any(axis=0).view(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(columns))
+        starts, ends = edges[::2], edges[1::2]
+        if not 0 < len(starts) <= self.max_digits:
+            return None
+        glyphs = [_glyph(cv2, ink[:, start:end]) for start, end in zip(starts, ends) if end - start > 1]
+        if not glyphs or any(g is None for g in glyphs):
+            return None
+        distances = ((np.stack(glyphs)[:, None] - self.templates[None]) ** 2).mean(axis=(2, 3))
+        best = distances.argmin(axis=1)
+        if distances[np.arange(len(best)), best].max() > self.max_distance:
+            return None
+        return int(''.join(str(d) for d in best))
+
+
+class _Debounce:
+    # A reading is only accepted after `frames` identical samples in a row
+    def __init__(self, frames):
+        self.frames = frames
+        self.candidate = None
+        self.count = 0
+
+    def update(self, value):
+        if value == self.candidate:
+            self.count += 1
+        else:
+            self.candidate = value
+            self.count = 1
+        return self.candidate if self.count >= self.frames else None
+
+
+class HudDetector:
+    # Turns HUD frames into elim / top 10 / victory / new game events.
+    #
+    # Only the HUD regions are cropped from each frame (never the full
+    # frame), converted to grayscale and downscaled. Each crop is first
+    # reduced to a 16x8 signature; if that is within change_threshold of the
+    # previous one the region is skipped and its last reading reused, so the
+    # common case - nothing on the HUD changed - costs a few tiny resizes.
+    # Readings must be stable for stable_frames samples before they count,
+    # and each event is emitted once per match through emit(kind, *args),
+    # which the app connects to EventBus.post.
+
+    def __init__(self, emit, regions=None, templates=None, stable_frames=3, change_threshold=3.0,
+                 victory_template=None, victory_threshold=0.7):
+        self.emit = emit
+        self.regions = regions or load_regions()
+        self.reader = DigitReader(templates if templates is not None else digit_templates())
+        self.change_threshold = change_threshold
+        self.victory_template = victory_template
+        self.victory_threshold = victory_threshold
+        if victory_template is None and os.path.exists(os.path.join('hud_templates', 'victory.png')):
+            cv2 = lazy_imports.cv2()
+            self.victory_template = cv2.imread(os.path.join('hud_templates', 'victory.png'), cv2.IMREAD_GRAYSCALE)
+
+        self.signatures = {}
+        self.readings = {}
+        self.debounce = {name: _Debounce(stable_frames) for name in self.regions}
+        self.elims = 0
+        self.players = None
+        self.top_10_sent = False
+        self.victory_sent = False
+        self.stats = {'frames': 0, 'regions_read': 0, 'regions_skipped': 0, 'events': 0, 'seconds': 0.0}
+
+    def _emit(self, kind, *args):
+        self.stats['events'] += 1
+        self.emit(kind, *args)
+
+    def process(self, frame):
+        cv2 = lazy_imports.cv2()
+        started = time.perf_counter()
+        height, width = frame.shape[:2]
+        for name, (x, y, w, h) in self.regions.items():
+            crop = frame[int(y * height):int((y + h) * height), int(x * width):int((x + w) * width)]
+            if not crop.size:
+                continue
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+            signature = cv2.resize(gray, (16, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+            previous = self.signatures.get(name)
+            if previous is not None and np.abs(signature - previous).mean() < self.change_threshold:
+                self.stats['regions_skipped'] += 1
+                reading = self.readings.get(name)
+            else:
+                self.signatures[name] = signature
+                self.stats['regions_read'] += 1
+                reading = self.readings[name] = self._read(cv2, name, crop, gray)
+            confirmed = self.debounce[name].update(reading)
+            if confirmed is not None:
+                self._apply(name, confirmed)
+        self.stats['frames'] += 1
+        self.stats['seconds'] += time.perf_counter() - started
+
+    def _read(self, cv2, name, crop, gray):
+        if name == 'victory':
+            return self._victory_score(cv2, crop, gray) >= self.victory_threshold
+        scale = READ_HEIGHT / gray.shape[0]
+        small = cv2.resize(gray, (max(int(gray.shape[1] * scale), 1), READ_HEIGHT), interpolation=cv2.INTER_AREA)
+        return self.reader.read(small)
+
+    def _victory_score(self, cv2, crop, gray):
+        if self.victory_template is not None:
+            template = self.victory_template
+            if template.shape[0] > gray.shape[0] or template.shape[1] > gray.shape[1]:
+                scale = min(gray.shape[0] / template.shape[0], gray.shape[1] / template.shape[1])
+                template = cv2.resize(template, (max(int(template.shape[1] * scale), 1),
+                                                 max(int(template.shape[0] * scale), 1)))
+            return float(cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED).max())
+        # No template: the banner is mostly saturated gold
+        small = cv2.resize(crop, (64, 16), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        gold = cv2.inRange(hsv, (15, 120, 150), (40, 255, 255))
+        return float(np.count_nonzero(gold)) / gold.size * 2
+
+    def _apply(self, name, value):
+        if name == 'elims':
+            if value is None:
+                return
+            if self.elims < value <= self.elims + 10:
+                self._emit('elim', value - self.elims)
+                self.elims = value
+            elif value < self.elims:
+                # Counter went back (new match or spectating someone): resync
+                self.elims = value
+        elif name == 'players':
+            if value is None:
+                return
+            if self.players is not None and self.players < 90 <= value:
+                self.new_match()
+            elif (self.players is not None and value < 10 <= self.players
+                  and not self.top_10_sent and not self.victory_sent):
+                self.top_10_sent = True
+                self._emit('top_10')
+            self.players = value
+        elif name == 'victory' and value and not self.victory_sent:
+            self.victory_sent = True
+            self._emit('victory')
+
+    def new_match(self):
+        self.elims = 0
+        self.top_10_sent = False
+        self.victory_sent = False
+        self._emit('new_game')
+
+
+class HudWatcher:
+    # Runs a HudDetector over a frame source on a daemon thread, sampling at
+    # most `fps` frames per second of media time.
+
+    def __init__(self, detector, source, fps=30):
+        self.detector = detector
+        self.source = source
+        self.interval = 1.0 / fps
+        self.thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, name='hud-detector', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.thread = None
+
+    def _run(self):
+        next_sample = 0.0
+        try:
+            for timestamp, frame in self.source:
+                if self._stop.is_set():
+                    break
+                if timestamp < next_sample:
+                    continue
+                next_sample = timestamp + self.interval
+                self.detector.process(frame)
+        except Exception as e:
+            print(f"Error detecting HUD events: {e}")
+        finally:
+            close = getattr(self.source, 'close', None)
+            if close is not None:
+                close()
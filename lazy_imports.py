@@ -0,0 +1,32 @@
+import importlib
+import threading
+
+# Heavy optional subsystems (OpenCV, pygame) are imported on first use
+# instead of at startup. Imports are cached and serialised so a worker
+# thread and the Tk thread asking at the same time only import once.
+
+_modules = {}
+_lock = threading.Lock()
+
+
+def load(name):
+    module = _modules.get(name)
+    if module is None:
+        with _lock:
+            module = _modules.get(name)
+            if module is None:
+                module = importlib.import_module(name)
+                _modules[name] = module
+    return module
+
+
+def is_loaded(name):
+    return name in _modules
+
+
+def cv2():
+    return load('cv2')
+
+
+def pygame():
+    return load('pygame')
@@ -0,0 +1,189 @@
+import mmap
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Frame buffer file layout: 32-byte header followed by height rows of
+# width * 4 RGBA bytes. The sequence number is odd while a frame is being
+# written and even once it is stable, so a reader copies the pixels only when
+# it reads the same even value before and after.
+HEADER = struct.Struct('<4sIIIQQ')
+MAGIC = b'FNOV'
+
+ROW_HEIGHT = 44
+LABEL_WIDTH = 220
+PADDING = 12
+
+# Overlay type -> rows of (field, static label). A None label means the value
+# spans the full width.
+LAYOUTS = {
+    "Stats Display": [
+        ('victories', 'Victories'), ('eliminations', 'Eliminations'),
+        ('games_played', 'Games'), ('kd', 'K/D'), ('win_rate', 'Win Rate'), ('top_10s', 'Top 10s')
+    ],
+    "Victory Counter": [('victories', 'Wins')],
+    "Challenge Timer": [('challenge', None), ('challenge_timer', 'Time')],
+    "Custom Text": [('custom_text', None)],
+    "Tournament Overlay": [('tournament_name', None)] + [
+        (f'leaderboard_{i}', f'#{i + 1}') for i in range(5)
+    ],
+    "Poll Results": [('poll_question', None)] + [
+        (f'poll_option_{i}', None) for i in range(4)
+    ],
+}
+
+
+def _load_font(size):
+    for name in ('arialbd.ttf', 'Arial Bold.ttf', 'DejaVuSans-Bold.ttf', 'arial.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+class OverlayRenderer:
+    # Renders one overlay type into a memory-mapped RGBA frame buffer.
+    #
+    # The background and every static label are drawn once into a base layer.
+    # Each value gets a fixed box; update() only marks boxes whose text
+    # changed, and render() redraws just those boxes: the cached background
+    # crop is copied, the text drawn on it and the box written straight into
+    # the mapped buffer through a NumPy view, so untouched pixels are never
+    # rewritten. Rendered boxes are kept in a small LRU keyed by text, so
+    # values that flip back and forth (a reset timer, a K/D hovering around
+    # the same figure) reuse earlier renders.
+
+    def __init__(self, overlay_type, path, width=480, font_size=28,
+                 background=(18, 18, 18, 200), label_color=(255, 255, 255, 255),
+                 value_color=(0, 255, 0, 255), cache_size=256):
+        self.overlay_type = overlay_type
+        self.path = path
+        self.layout = LAYOUTS[overlay_type]
+        self.width = width
+        self.height = PADDING * 2 + ROW_HEIGHT * len(self.layout)
+        self.value_color = value_color
+        self.font = _load_font(font_size)
+        self.cache_size = cache_size
+
+        self.base = Image.new('RGBA', (self.width, self.height), background)
+        draw = ImageDraw.Draw(self.base)
+        self.boxes = {}
+        for row, (field, label) in enumerate(self.layout):
+            top = PADDING + row * ROW_HEIGHT
+            left = PADDING
+            if label is not None:
+                draw.text((left, top + 6), label, font=self.font, fill=label_color)
+                left += LABEL_WIDTH
+            box = (left, top, self.width - PADDING, top + ROW_HEIGHT)
+            self.boxes[field] = (box, self.base.crop(box))
+
+        self.values = {}
+        self.dirty = set()
+        self.cache = OrderedDict()
+        self.stats = {'frames': 0, 'boxes': 0, 'cache_hits': 0, 'pixels': 0}
+        self._open_buffer()
+
+    def _open_buffer(self):
+        size = HEADER.size + self.width * self.height * 4
+        with open(self.path, 'wb') as f:
+            f.truncate(size)
+        self._file = open(self.path, 'r+b')
+        self.buffer = mmap.mmap(self._file.fileno(), size)
+        self.seq = 0
+        self._begin()
+        self.pixels = np.frombuffer(self.buffer, dtype=np.uint8, count=self.width * self.height * 4,
+                                    offset=HEADER.size).reshape(self.height, self.width, 4)
+        self.pixels[:] = np.asarray(self.base)
+        self._publish()
+
+    def close(self):
+        self.pixels = None
+        self.buffer.close()
+        self._file.close()
+
+    def update(self, **fields):
+        for field, value in fields.items():
+            if field not in self.boxes:
+                continue
+            text = '' if value is None else str(value)
+            if self.values.get(field) != text:
+                self.values[field] = text
+                self.dirty.add(field)
+
+    def render(self):
+        if not self.dirty:
+            return []
+        rects = []
+        self._begin()
+        for field in self.dirty:
+            box = self.boxes[field][0]
+            left, top, right, bottom = box
+            self.pixels[top:bottom, left:right] = self._box_pixels(field, self.values[field])
+            rects.append(box)
+            self.stats['pixels'] += (right - left) * (bottom - top)
+        self.dirty.clear()
+        self.stats['boxes'] += len(rects)
+        self.stats['frames'] += 1
+        self._publish(len(rects))
+        return rects
+
+    def _box_pixels(self, field, text):
+        key = (field, text)
+        pixels = self.cache.get(key)
+        if pixels is not None:
+            self.cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return pixels
+        image = self.boxes[field][1].copy()
+        ImageDraw.Draw(image).text((0, 6), text, font=self.font, fill=self.value_color)
+        pixels = np.asarray(image)
+        self.cache[key] = pixels
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return pixels
+
+    def _begin(self):
+        # Odd sequence: readers must not trust the pixels until it is even again
+        self.seq += 1
+        HEADER.pack_into(self.buffer, 0, MAGIC, self.width, self.height, self.width * 4, self.seq, 0)
+
+    def _publish(self, dirty_count=0):
+        self.seq += 1
+        HEADER.pack_into(self.buffer, 0, MAGIC, self.width, self.height, self.width * 4,
+                         self.seq, dirty_count)
+
+
+def read_frame(path, attempts=100):
+    # Reference reader for capture tools: returns (seq, HxWx4 array copy), or
+    # None if no stable frame could be read. The pixels are copied and the
+    # sequence number checked again afterwards; if the writer started a frame
+    # in between, the copy may be torn and is retried.
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        for _ in range(attempts):
+            magic, width, height, stride, seq, _ = HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC:
+                return None
+            if seq % 2:
+                continue
+            pixels = np.frombuffer(buffer, dtype=np.uint8, count=height * stride, offset=HEADER.size).copy()
+            if HEADER.unpack_from(buffer, 0)[4] == seq:
+                return seq, pixels.reshape(height, width, 4)
+        return None
+    finally:
+        buffer.close()
+
+
+def format_timer(seconds):
+    seconds = max(int(seconds), 0)
+    return f"{seconds // 60:02}:{seconds % 60:02}"
+
+
+def frame_path(overlay_type, folder='.'):
+    slug = overlay_type.lower().replace(' ', '-')
+    return os.path.join(folder, f"overlay-{slug}.rgba")
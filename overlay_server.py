@@ -0,0 +1,334 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Overlay type (as shown in setup_overlay_tab) -> URL slug and the state
+# fields its page renders. Pages only receive diffs for their own fields.
+OVERLAY_TYPES = {
+    "Tournament Overlay": ('tournament', ('tournament_name', 'leaderboard')),
+    "Stats Display": ('stats', ('victories', 'eliminations', 'games_played', 'kd', 'win_rate', 'top_10s')),
+    "Victory Counter": ('victories', ('victories',)),
+    "Challenge Timer": ('challenge-timer', ('challenge', 'challenge_started_at')),
+    "Custom Text": ('custom-text', ('custom_text',)),
+    "Poll Results": ('poll', ('poll',)),
+}
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ margin: 0; background: transparent; color: #fff; font: bold 32px Arial, sans-serif;
+       text-shadow: 2px 2px 4px #000; }}
+#overlay {{ padding: 12px; }}
+.hidden {{ display: none; }}
+.row span {{ color: #00FF00; }}
+</style></head>
+<body><div id="overlay" class="hidden"></div>
+<script>
+const slug = "{slug}";
+const fields = {fields};
+const state = {{}};
+const root = document.getElementById("overlay");
+function fmt(v) {{ return typeof v === "object" ? JSON.stringify(v) : v; }}
+// Values come from chat, result files and user input, so every string is
+// written with textContent and never parsed as HTML
+function line(text, value) {{
+  const row = document.createElement("div");
+  row.textContent = text;
+  if (value !== undefined) {{
+    const span = document.createElement("span");
+    row.className = "row";
+    row.append(" ");
+    span.textContent = value;
+    row.appendChild(span);
+  }}
+  root.appendChild(row);
+}}
+function render() {{
+  root.classList.toggle("hidden", !state["visible:" + slug]);
+  root.textContent = "";
+  if (slug === "challenge-timer") {{
+    if (!state.challenge) return;
+    const s = Math.max(0, Math.floor(Date.now() / 1000 - state.challenge_started_at));
+    root.textContent = state.challenge + " " + Math.floor(s / 60) + ":" + String(s % 60).padStart(2, "0");
+  }} else if (slug === "poll") {{
+    const poll = state.poll;
+    if (!poll) return;
+    line(poll.question + (poll.closed ? " (closed)" : ""));
+    poll.options.forEach((o, i) => line((i + 1) + ". " + o[0], o[1] + " (" + o[2] + "%)"));
+  }} else if (slug === "tournament") {{
+    line(state.tournament_name || "");
+    (state.leaderboard || []).forEach((r, i) => line((i + 1) + ". " + r[0], r[1]));
+  }} else {{
+    fields.forEach(f => {{ if (state[f] !== undefined) line(f.replace(/_/g, " "), fmt(state[f])); }});
+  }}
+}}
+function connect() {{
+  const ws = new WebSocket("ws://" + location.host + "/ws/" + slug);
+  ws.onmessage = e => {{ Object.assign(state, JSON.parse(e.data)); render(); }};
+  ws.onclose = () => setTimeout(connect, 1000);
+}}
+connect();
+if (slug === "challenge-timer") setInterval(render, 1000);
+</script></body></html>
+"""
+
+
+class _Client:
+    def __init__(self, writer, slug, fields, max_queue):
+        self.writer = writer
+        self.slug = slug
+        self.fields = set(fields) | {'visible:' + slug}
+        self.queue = asyncio.Queue(max_queue)
+        self.resync = False
+
+
+class OverlayServer:
+    # Local HTTP + WebSocket server for OBS browser sources.
+    #
+    # GET /overlay/<slug> serves the page for one overlay type and the page
+    # opens /ws/<slug>. update() may be called from any thread: changes are
+    # merged into a pending dict and flushed once per loop iteration, and only
+    # fields whose value actually changed are sent, each client getting just
+    # the subset its overlay renders. Every client has its own bounded send
+    # queue; a client that falls behind is skipped and later resynced with its
+    # full state instead of slowing the others down.
+
+    def __init__(self, host='127.0.0.1', port=8765, max_queue=64):
+        self.host = host
+        self.port = port
+        self.max_queue = max_queue
+        self.state = {}
+        self.clients = set()
+        self.loop = None
+        self.thread = None
+        self.server = None
+        self.stats = {'updates': 0, 'flushes': 0, 'messages': 0, 'resyncs': 0}
+
+        self._pending = {}
+        self._flush_scheduled = False
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._slugs = {slug: fields for slug, fields in OVERLAY_TYPES.values()}
+        self._titles = {slug: title for title, (slug, _) in OVERLAY_TYPES.items()}
+
+    def url(self, overlay_type):
+        slug = OVERLAY_TYPES[overlay_type][0]
+        return f"http://{self.host}:{self.port}/overlay/{slug}"
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._thread_main, name='overlay-server', daemon=True)
+            self.thread.start()
+            self._ready.wait(5)
+
+    def stop(self):
+        if self.loop is not None and self.thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=2)
+        self.thread = None
+        self.loop = None
+        # A flush scheduled on the stopped loop never runs; without this reset
+        # every later update() would think one is still pending
+        with self._lock:
+            self._flush_scheduled = False
+
+    def _thread_main(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._connection, self.host, self.port)
+            )
+            self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as e:
+            print(f"Error starting overlay server: {e}")
+            self.thread = None
+            self.loop.close()
+            self.loop = None
+            with self._lock:
+                self._flush_scheduled = False
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            for client in list(self.clients):
+                client.writer.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    # Producer side (any thread)
+    def update(self, **fields):
+        with self._lock:
+            self._pending.update(fields)
+            self.stats['updates'] += 1
+            if self._flush_scheduled or self.loop is None:
+                return
+            self._flush_scheduled = True
+        self.loop.call_soon_threadsafe(self._flush)
+
+    # Server loop
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+        diff = {k: v for k, v in pending.items() if self.state.get(k, _MISSING) != v}
+        if not diff:
+            return
+        self.state.update(diff)
+        self.stats['flushes'] += 1
+        # Clients of the same overlay type share one encoded frame
+        frames = {}
+        for client in self.clients:
+            if client.resync:
+                client.resync = False
+                self.stats['resyncs'] += 1
+                self._send(client, {k: v for k, v in self.state.items() if k in client.fields})
+                continue
+            frame = frames.get(client.slug)
+            if frame is None:
+                payload = {k: v for k, v in diff.items() if k in client.fields}
+                frame = frames[client.slug] = _frame(json.dumps(payload, separators=(',', ':'))) if payload else b''
+            if frame:
+                self._put(client, frame)
+
+    def _send(self, client, payload):
+        if payload:
+            self._put(client, _frame(json.dumps(payload, separators=(',', ':'))))
+
+    def _put(self, client, frame):
+        try:
+            client.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            client.resync = True
+
+    async def _connection(self, reader, writer):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        path = parts[1] if len(parts) > 1 else '/'
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        if path.startswith('/ws/') and headers.get('upgrade', '').lower() == 'websocket':
+            await self._websocket(reader, writer, path[4:], headers)
+        elif path.startswith('/overlay/') and path[9:] in self._slugs:
+            slug = path[9:]
+            body = PAGE.format(
+                title=self._titles[slug], slug=slug, fields=json.dumps(self._slugs[slug])
+            ).encode()
+            self._respond(writer, '200 OK', 'text/html; charset=utf-8', body)
+        elif path == '/':
+            links = ''.join(
+                f'<li><a href="/overlay/{slug}">{title}</a></li>' for slug, title in self._titles.items()
+            )
+            self._respond(writer, '200 OK', 'text/html; charset=utf-8', f'<ul>{links}</ul>'.encode())
+        else:
+            self._respond(writer, '404 Not Found', 'text/plain', b'Not found')
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    def _respond(self, writer, status, content_type, body):
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+
+    async def _websocket(self, reader, writer, slug, headers):
+        if slug not in self._slugs or 'sec-websocket-key' not in headers:
+            self._respond(writer, '400 Bad Request', 'text/plain', b'Bad request')
+            writer.close()
+            return
+        accept = base64.b64encode(
+            hashlib.sha1((headers['sec-websocket-key'] + WS_GUID).encode()).digest()
+        ).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+
+        client = _Client(writer, slug, self._slugs[slug], self.max_queue)
+        self.clients.add(client)
+        # New clients start from the full state for their overlay
+        self._send(client, {k: v for k, v in self.state.items() if k in client.fields})
+        sender = asyncio.ensure_future(self._sender(client))
+        try:
+            await self._receiver(reader, writer)
+        finally:
+            self.clients.discard(client)
+            sender.cancel()
+            writer.close()
+
+    async def _sender(self, client):
+        writer = client.writer
+        try:
+            while True:
+                frame = await client.queue.get()
+                writer.write(frame)
+                self.stats['messages'] += 1
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def _receiver(self, reader, writer):
+        # Browser sources only send pings and close frames. Cancellation at
+        # shutdown ends the connection normally rather than propagating.
+        try:
+            while True:
+                header = await reader.readexactly(2)
+                opcode = header[0] & 0x0F
+                length = header[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack('!H', await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack('!Q', await reader.readexactly(8))[0]
+                mask = await reader.readexactly(4) if header[1] & 0x80 else b''
+                payload = await reader.readexactly(length)
+                if mask:
+                    payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+                if opcode == 0x8:
+                    writer.write(_frame(payload, 0x8))
+                    return
+                if opcode == 0x9:
+                    writer.write(_frame(payload, 0xA))
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            return
+
+
+_MISSING = object()
+
+
+def _frame(data, opcode=0x1):
+    if isinstance(data, str):
+        data = data.encode()
+    length = len(data)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + data
@@ -0,0 +1,202 @@
+import time
+from array import array
+
+
+class VoterSet:
+    # Exact set of voter ids stored as 64-bit hashes in an open-addressing
+    # table backed by array('Q'). That is 16-32 bytes per voter depending on
+    # load, versus ~60+ for a Python set of strings, so a 100k-voter poll
+    # stays within a few MB. Slot value 0 marks an empty slot.
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < capacity * 2:
+            size <<= 1
+        self.table = array('Q', bytes(8 * size))
+        self.mask = size - 1
+        self.count = 0
+
+    @staticmethod
+    def _key(user_id):
+        key = hash(user_id) & 0xFFFFFFFFFFFFFFFF
+        return key or 1
+
+    def add(self, user_id):
+        # Returns False when the id was already present
+        key = self._key(user_id)
+        table = self.table
+        mask = self.mask
+        i = (key ^ (key >> 29)) & mask
+        while True:
+            slot = table[i]
+            if slot == 0:
+                break
+            if slot == key:
+                return False
+            i = (i + 1) & mask
+        table[i] = key
+        self.count += 1
+        if self.count * 2 > len(table):
+            self._grow()
+        return True
+
+    def _grow(self):
+        old = self.table
+        self.table = array('Q', bytes(16 * len(old)))
+        self.mask = len(self.table) - 1
+        table = self.table
+        mask = self.mask
+        for key in old:
+            if key:
+                i = (key ^ (key >> 29)) & mask
+                while table[i]:
+                    i = (i + 1) & mask
+                table[i] = key
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return self.table.itemsize * len(self.table)
+
+
+class Poll:
+    def __init__(self, question, options, duration=None, now=None):
+        self.question = question
+        self.options = list(options)
+        self.tallies = [0] * len(self.options)
+        self.voters = VoterSet()
+        self.started_at = now if now is not None else time.monotonic()
+        self.ends_at = self.started_at + duration if duration else None
+        self.closed = False
+        self.rejected = 0
+
+        # Every accepted spelling of a vote maps straight to an option index
+        self.lookup = {}
+        for i, option in enumerate(self.options):
+            for text in (str(i + 1), option.lower(), f"!vote {i + 1}", f"!vote {option.lower()}"):
+                self.lookup[text] = i
+
+    def is_open(self, now=None):
+        if self.closed:
+            return False
+        if self.ends_at is None:
+            return True
+        return (now if now is not None else time.monotonic()) < self.ends_at
+
+    def vote(self, user_id, text):
+        index = self.lookup.get(text.strip().lower())
+        if index is None:
+            return False
+        if not self.voters.add(user_id):
+            self.rejected += 1
+            return False
+        self.tallies[index] += 1
+        return True
+
+    @property
+    def total(self):
+        return len(self.voters)
+
+    def results(self):
+        total = self.total
+        return [
+            (option, count, count / total if total else 0.0)
+            for option, count in zip(self.options, self.tallies)
+        ]
+
+    def winner(self):
+        if not self.total:
+            return None
+        best = max(range(len(self.options)), key=self.tallies.__getitem__)
+        return self.options[best]
+
+    def overlay_state(self):
+        # JSON-friendly form for the overlay server
+        return {
+            'question': self.question,
+            'options': [[option, count, round(share * 100)] for option, count, share in self.results()],
+            'total': self.total,
+            'closed': self.closed
+        }
+
+    def summary(self):
+        lines = [self.question]
+        for i, (option, count, share) in enumerate(self.results()):
+            lines.append(f"{i + 1}. {option}: {count} ({share * 100:.0f}%)")
+        return '\n'.join(lines)
+
+
+class PollEngine:
+    # Counts chat votes for the active poll.
+    #
+    # ingest() takes the message batches delivered by the chat client (anything
+    # with user_id and text attributes). Votes are O(1): one dict lookup to
+    # resolve the option and one VoterSet probe to enforce one vote per user.
+    # Result pushes to the UI and overlay are throttled to push_interval so a
+    # vote storm does not turn into a redraw storm; the final result is always
+    # pushed when the poll closes. tick() also flushes a throttled push, so
+    # the last votes before chat goes quiet are not left pending.
+
+    def __init__(self, on_update=None, on_close=None, push_interval=0.25):
+        self.on_update = on_update
+        self.on_close = on_close
+        self.push_interval = push_interval
+        self.poll = None
+        self._last_push = 0.0
+        self._dirty = False
+
+    def start(self, question, options, duration=None):
+        if self.poll is not None and not self.poll.closed:
+            self.close()
+        self.poll = Poll(question, options, duration)
+        self._dirty = True
+        self.maybe_push(force=True)
+        return self.poll
+
+    def ingest(self, messages, now=None):
+        poll = self.poll
+        if poll is None or poll.closed:
+            return 0
+        now = now if now is not None else time.monotonic()
+        if not poll.is_open(now):
+            self.close()
+            return 0
+        accepted = 0
+        vote = poll.vote
+        for message in messages:
+            if vote(message.user_id, message.text):
+                accepted += 1
+        if accepted:
+            self._dirty = True
+        self.maybe_push(now)
+        return accepted
+
+    def tick(self, now=None):
+        # Called periodically so time-boxed polls close without new votes
+        poll = self.poll
+        if poll is not None and not poll.closed and not poll.is_open(now):
+            self.close()
+        else:
+            self.maybe_push(now)
+
+    def maybe_push(self, now=None, force=False):
+        if not self._dirty or self.on_update is None:
+            return
+        now = now if now is not None else time.monotonic()
+        if force or now - self._last_push >= self.push_interval:
+            self._last_push = now
+            self._dirty = False
+            self.on_update(self.poll)
+
+    def close(self):
+        poll = self.poll
+        if poll is None or poll.closed:
+            return poll
+        poll.closed = True
+        self._dirty = True
+        self.maybe_push(force=True)
+        if self.on_close is not None:
+            self.on_close(poll)
+        return poll
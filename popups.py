@@ -0,0 +1,203 @@
+import tkinter as tk
+from collections import deque
+
+
+class _Toast:
+    def __init__(self, root):
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.label = tk.Label(self.window)
+        self.label.pack(expand=True, fill='both')
+        self.event = None
+        self.timer = None
+
+
+class _Dialog:
+    def __init__(self, root, colors):
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.configure(bg=colors['bg'])
+        self.label = tk.Label(
+            self.window,
+            bg=colors['bg'],
+            fg='white',
+            font=('Arial', 16),
+            wraplength=360
+        )
+        self.label.pack(pady=20)
+        self.options_frame = tk.Frame(self.window, bg=colors['bg'])
+        self.options_frame.pack(expand=True)
+        self.buttons = []
+        self.event = None
+        self.on_choice = None
+
+
+class PopupManager:
+    # Reusable toast and dialog windows.
+    #
+    # Windows are built once, withdrawn when dismissed and reconfigured for the
+    # next event, so the widget count stays flat no matter how many events a
+    # session produces. Events that arrive while every window is busy wait in a
+    # bounded queue; repeats of the same toast (e.g. several top 10s in a row)
+    # are merged into one toast with a counter instead of queueing copies.
+
+    def __init__(self, root, colors, create_button, toasts=1, dialogs=1, max_queue=20):
+        self.root = root
+        self.colors = colors
+        self.create_button = create_button
+        self.max_toasts = toasts
+        self.max_dialogs = dialogs
+        self.max_queue = max_queue
+
+        self.toasts = []
+        self.dialogs = []
+        self.toast_queue = deque()
+        self.dialog_queue = deque()
+        self.merged = 0
+        self.dropped = 0
+
+    # Toasts
+    def toast(self, text, bg, duration=3000, key=None, fg='black',
+              font=('Arial', 24, 'bold'), size="300x200"):
+        key = key or text
+        for toast in self.toasts:
+            if toast.event is not None and toast.event['key'] == key:
+                toast.event['count'] += 1
+                self.merged += 1
+                self._render_toast(toast)
+                self._arm_timer(toast)
+                return
+        for event in self.toast_queue:
+            if event['key'] == key:
+                event['count'] += 1
+                self.merged += 1
+                return
+
+        event = {
+            'key': key, 'text': text, 'bg': bg, 'fg': fg, 'font': font,
+            'size': size, 'duration': duration, 'count': 1
+        }
+        toast = self._idle_toast()
+        if toast is None:
+            self._enqueue(self.toast_queue, event)
+        else:
+            self._show_toast(toast, event)
+
+    def _idle_toast(self):
+        for toast in self.toasts:
+            if toast.event is None:
+                return toast
+        if len(self.toasts) < self.max_toasts:
+            toast = _Toast(self.root)
+            self.toasts.append(toast)
+            return toast
+        return None
+
+    def _show_toast(self, toast, event):
+        toast.event = event
+        toast.window.geometry(event['size'])
+        toast.window.configure(bg=event['bg'])
+        self._render_toast(toast)
+        toast.window.deiconify()
+        toast.window.lift()
+        self._arm_timer(toast)
+
+    def _render_toast(self, toast):
+        event = toast.event
+        text = event['text']
+        if event['count'] > 1:
+            text = f"{text} x{event['count']}"
+        toast.label.configure(text=text, bg=event['bg'], fg=event['fg'], font=event['font'])
+
+    def _arm_timer(self, toast):
+        if toast.timer is not None:
+            self.root.after_cancel(toast.timer)
+        toast.timer = self.root.after(toast.event['duration'], lambda: self._hide_toast(toast))
+
+    def _hide_toast(self, toast):
+        toast.timer = None
+        toast.event = None
+        if self.toast_queue:
+            self._show_toast(toast, self.toast_queue.popleft())
+        else:
+            toast.window.withdraw()
+
+    # Dialogs
+    def dialog(self, title, question, options, on_choice=None, size="400x300"):
+        event = {
+            'title': title, 'question': question, 'options': list(options),
+            'on_choice': on_choice, 'size': size
+        }
+        dialog = self._idle_dialog()
+        if dialog is None:
+            self._enqueue(self.dialog_queue, event)
+        else:
+            self._show_dialog(dialog, event)
+        return event
+
+    def update_dialog(self, event, question):
+        # Live text (e.g. poll tallies) for a dialog that is showing or queued
+        event['question'] = question
+        for dialog in self.dialogs:
+            if dialog.event is event:
+                dialog.label.configure(text=question)
+
+    def _idle_dialog(self):
+        for dialog in self.dialogs:
+            if dialog.on_choice is None:
+                return dialog
+        if len(self.dialogs) < self.max_dialogs:
+            dialog = _Dialog(self.root, self.colors)
+            dialog.window.protocol("WM_DELETE_WINDOW", lambda: self._choose(dialog, None))
+            self.dialogs.append(dialog)
+            return dialog
+        return None
+
+    def _show_dialog(self, dialog, event):
+        # on_choice doubles as the busy flag, so keep it non-None while shown
+        dialog.on_choice = event['on_choice'] or (lambda choice: None)
+        dialog.event = event
+        dialog.window.title(event['title'])
+        dialog.window.geometry(event['size'])
+        dialog.label.configure(text=event['question'])
+
+        options = event['options']
+        while len(dialog.buttons) < len(options):
+            dialog.buttons.append(self.create_button(dialog.options_frame, "", None))
+        for i, button in enumerate(dialog.buttons):
+            if i < len(options):
+                option = options[i]
+                button.configure(text=option, command=lambda o=option: self._choose(dialog, o))
+                button.pack(side=tk.LEFT, padx=10)
+            else:
+                button.pack_forget()
+
+        dialog.window.deiconify()
+        dialog.window.lift()
+
+    def _choose(self, dialog, option):
+        on_choice, dialog.on_choice = dialog.on_choice, None
+        dialog.event = None
+        if self.dialog_queue:
+            self._show_dialog(dialog, self.dialog_queue.popleft())
+        else:
+            dialog.window.withdraw()
+        if on_choice is not None:
+            on_choice(option)
+
+    def _enqueue(self, queue, event):
+        if len(queue) >= self.max_queue:
+            queue.popleft()
+            self.dropped += 1
+        queue.append(event)
+
+    def widget_count(self):
+        count = 0
+        stack = [self.root]
+        while stack:
+            widget = stack.pop()
+            children = widget.winfo_children()
+            count += len(children)
+            stack.extend(children)
+        return count
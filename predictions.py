@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+
+class PredictionLedger:
+    # Viewer point wagers for one prediction.
+    #
+    # Wagers live in preallocated NumPy columns (user id, outcome, points)
+    # that grow by doubling, with a dict from user to row so a viewer can top
+    # up but not switch outcomes. resolve() computes every payout in a single
+    # vectorized pass: winners split the whole pool in proportion to their
+    # stake, losers get nothing, and if nobody picked the winning outcome every
+    # wager is refunded. No Python loop runs per participant at settlement.
+
+    def __init__(self, question, outcomes, capacity=1024):
+        self.question = question
+        self.outcomes = list(outcomes)
+        self.created_at = time.time()
+        self.locked = False
+        self.winner = None
+
+        self.users = np.zeros(capacity, dtype=np.int64)
+        self.choices = np.zeros(capacity, dtype=np.int8)
+        self.points = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self.rows = {}
+        self.user_names = []
+        self.totals = [0] * len(self.outcomes)
+        self.payouts = None
+
+        # "!predict 1 500", "!predict yes 500", "!bet 2 100"
+        self.lookup = {}
+        for i, outcome in enumerate(self.outcomes):
+            self.lookup[str(i + 1)] = i
+            self.lookup[outcome.lower()] = i
+
+    def wager(self, user, outcome, points):
+        if self.locked or points <= 0:
+            return False
+        row = self.rows.get(user)
+        if row is None:
+            if self.count == len(self.points):
+                self._grow()
+            row = self.count
+            self.count += 1
+            self.rows[user] = row
+            self.user_names.append(user)
+            self.users[row] = _user_key(user)
+            self.choices[row] = outcome
+        elif self.choices[row] != outcome:
+            return False
+        self.points[row] += points
+        self.totals[outcome] += points
+        return True
+
+    def _grow(self):
+        size = len(self.points) * 2
+        for name in ('users', 'choices', 'points'):
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def ingest(self, messages):
+        accepted = 0
+        for message in messages:
+            text = message.text
+            if not (text.startswith('!predict ') or text.startswith('!bet ')):
+                continue
+            parts = text.split()
+            if len(parts) != 3:
+                continue
+            outcome = self.lookup.get(parts[1].lower())
+            if outcome is None or not parts[2].isdigit():
+                continue
+            if self.wager(message.user_id, outcome, int(parts[2])):
+                accepted += 1
+        return accepted
+
+    @property
+    def pool(self):
+        return sum(self.totals)
+
+    def resolve(self, winner):
+        self.locked = True
+        self.winner = winner
+        points = self.points[:self.count]
+        pool = int(points.sum())
+        winning = self.choices[:self.count] == winner
+        winning_total = int(points[winning].sum())
+
+        if winning_total == 0:
+            # Nobody backed the winner: refund everyone
+            self.payouts = points.copy()
+        else:
+            # Float math avoids int64 overflow on points * pool
+            ratio = pool / winning_total
+            self.payouts = np.where(winning, np.floor(points * ratio), 0).astype(np.int64)
+        return self.payouts
+
+    def summary(self):
+        lines = [self.question]
+        pool = self.pool
+        for i, outcome in enumerate(self.outcomes):
+            share = self.totals[i] / pool if pool else 0.0
+            lines.append(f"{i + 1}. {outcome}: {self.totals[i]:,} pts ({share * 100:.0f}%)")
+        lines.append(f"{self.count:,} predictors, {pool:,} points")
+        return '\n'.join(lines)
+
+    def top_payouts(self, n=5):
+        if self.payouts is None or not self.count:
+            return []
+        n = min(n, self.count)
+        best = np.argpartition(self.payouts, -n)[-n:]
+        best = best[np.argsort(self.payouts[best])[::-1]]
+        return [(self.user_names[i], int(self.payouts[i])) for i in best]
+
+    def save(self, folder='predictions'):
+        os.makedirs(folder, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.created_at))
+        path = os.path.join(folder, f"prediction-{stamp}.npz")
+        meta = {
+            'question': self.question,
+            'outcomes': self.outcomes,
+            'winner': self.winner,
+            'created_at': self.created_at,
+            'user_names': self.user_names
+        }
+        columns = {
+            'users': self.users[:self.count],
+            'choices': self.choices[:self.count],
+            'points': self.points[:self.count],
+            'meta': np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)
+        }
+        if self.payouts is not None:
+            columns['payouts'] = self.payouts
+        np.savez(path, **columns)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].tobytes().decode())
+            ledger = cls(meta['question'], meta['outcomes'], capacity=max(len(data['points']), 1))
+            ledger.count = len(data['points'])
+            ledger.users[:ledger.count] = data['users']
+            ledger.choices[:ledger.count] = data['choices']
+            ledger.points[:ledger.count] = data['points']
+            if 'payouts' in data:
+                ledger.payouts = data['payouts'].copy()
+        ledger.winner = meta['winner']
+        ledger.locked = ledger.winner is not None
+        ledger.created_at = meta['created_at']
+        ledger.user_names = meta['user_names']
+        ledger.rows = {name: i for i, name in enumerate(ledger.user_names)}
+        for i in range(len(ledger.outcomes)):
+            ledger.totals[i] = int(ledger.points[:ledger.count][ledger.choices[:ledger.count] == i].sum())
+        return ledger
+
+
+def _user_key(user):
+    # Twitch user ids are numeric; fall back to a stable hash for nicks
+    if isinstance(user, int):
+        return user
+    if user.isdigit():
+        return int(user)
+    digest = hashlib.blake2b(user.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') & 0x7FFFFFFFFFFFFFFF
@@ -0,0 +1,192 @@
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import lazy_imports
+
+DROP_NEWEST = 'drop-newest'
+DROP_OLDEST = 'drop-oldest'
+
+
+def _encoder_main(shm_name, shape, fps, fourcc, filled, free, written):
+    # Encoder process: frames arrive as slot numbers in shared memory, so no
+    # pixels are pickled. A frame tagged with a new path closes the current
+    # file and starts the next one.
+    cv2 = lazy_imports.cv2()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    size = (shape[2], shape[1])
+    writer = None
+    path = None
+    try:
+        while True:
+            item = filled.get()
+            if item is None:
+                break
+            slot, _, item_path = item
+            if item_path != path:
+                if writer is not None:
+                    writer.release()
+                path = item_path
+                writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+            writer.write(frames[slot])
+            free.put(slot)
+            with written.get_lock():
+                written.value += 1
+    finally:
+        if writer is not None:
+            writer.release()
+        del frames
+        shm.close()
+
+
+class ReplayRecorder:
+    # Capture -> encode -> write pipeline for match replays.
+    #
+    # A capture thread pulls frames from a frame source and copies each into
+    # one of `slots` preallocated shared-memory frames; the slot number goes
+    # through a queue to an encoder process running cv2.VideoWriter, so
+    # encoding is not limited by the GIL and never runs on the Tk thread.
+    # The slots are the bounded queue: when the encoder falls behind and none
+    # is free, the capture thread never waits. With drop-newest the incoming
+    # frame is discarded; with drop-oldest the oldest queued frame is taken
+    # back and its slot reused. Either way the drop is counted.
+
+    def __init__(self, source, path, fps=30, slots=16, policy=DROP_NEWEST, fourcc='mp4v'):
+        if policy not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.source = source
+        self.path = path
+        self.fps = fps
+        self.slots = slots
+        self.policy = policy
+        self.fourcc = fourcc
+        self.thread = None
+        self.process = None
+        self.error = None
+        self.started_at = None
+        self.stopped_at = None
+        self.stats = {'captured': 0, 'queued': 0, 'dropped': 0, 'reclaimed': 0, 'max_in_flight': 0}
+
+        context = multiprocessing.get_context('spawn')
+        self._context = context
+        self._filled = context.Queue()
+        self._free = context.Queue()
+        self._written = context.Value('q', 0)
+        self._shm = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self._capture, name='replay-recorder', daemon=True)
+        self.thread.start()
+
+    def rotate(self, path):
+        # Frames captured from now on go to a new file; returns the old path
+        old_path, self.path = self.path, path
+        return old_path
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.thread = None
+
+    def _capture(self):
+        frames = None
+        try:
+            for timestamp, frame in self.source:
+                if self._stop.is_set():
+                    break
+                if frames is None:
+                    frames = self._open(frame.shape)
+                self.stats['captured'] += 1
+                slot = self._acquire()
+                if slot is None:
+                    self.stats['dropped'] += 1
+                    continue
+                if frame.shape != frames.shape[1:]:
+                    cv2 = lazy_imports.cv2()
+                    frame = cv2.resize(frame, (frames.shape[2], frames.shape[1]))
+                frames[slot] = frame
+                self._filled.put((slot, timestamp, self.path))
+                self.stats['queued'] += 1
+                in_flight = self.stats['queued'] - self.stats['reclaimed'] - self._written.value
+                if in_flight > self.stats['max_in_flight']:
+                    self.stats['max_in_flight'] = in_flight
+        except Exception as e:
+            self.error = e
+            print(f"Error recording replay: {e}")
+        finally:
+            close = getattr(self.source, 'close', None)
+            if close is not None:
+                close()
+            del frames
+            self._close()
+            self.stopped_at = time.perf_counter()
+
+    def _open(self, shape):
+        shape = (self.slots,) + tuple(shape)
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self.process = self._context.Process(
+            target=_encoder_main,
+            args=(self._shm.name, shape, self.fps, self.fourcc, self._filled, self._free, self._written),
+            name='replay-encoder',
+            daemon=True
+        )
+        self.process.start()
+        return np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+
+    def _acquire(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        if self.policy == DROP_OLDEST:
+            try:
+                slot, _, _ = self._filled.get_nowait()
+                self.stats['reclaimed'] += 1
+                # The frame being replaced is the one dropped
+                self.stats['dropped'] += 1
+                return slot
+            except queue.Empty:
+                pass
+        return None
+
+    def _close(self):
+        if self.process is not None:
+            # The encoder finishes the frames already queued, then exits
+            self._filled.put(None)
+            self.process.join(10)
+            if self.process.is_alive():
+                print("Warning: Replay encoder did not finish in time")
+                self.process.terminate()
+            self.process = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def metrics(self):
+        end = self.stopped_at or time.perf_counter()
+        elapsed = max(end - self.started_at, 1e-9) if self.started_at else 1e-9
+        written = self._written.value
+        captured = self.stats['captured']
+        return dict(
+            self.stats,
+            written=written,
+            drop_rate=self.stats['dropped'] / captured if captured else 0.0,
+            capture_fps=captured / elapsed,
+            encode_fps=written / elapsed
+        )
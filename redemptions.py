@@ -0,0 +1,187 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+
+class RedemptionQueue:
+    # Durable FIFO of channel-points redemptions.
+    #
+    # submit() appends an "E <json>" line to the log and fsyncs it before the
+    # redemption is accepted; a worker acks it with an "A <id>" line once the
+    # handler succeeded. On restart every enqueued-but-unacked redemption is
+    # delivered again (at-least-once), and redemption ids already seen are
+    # rejected as duplicates; compaction keeps the last remember_ids of them
+    # as "S <id>" lines so that still holds across restarts. When the backlog
+    # reaches max_pending, or a user already has max_per_user redemptions
+    # waiting, new ones are refused so a hype-moment spam wave cannot grow
+    # the backlog without bound.
+
+    def __init__(self, path, handler, workers=2, max_pending=500, max_per_user=3,
+                 max_attempts=3, retry_delay=1.0, remember_ids=50_000, compact_after=1000):
+        self.path = path
+        self.handler = handler
+        self.worker_count = workers
+        self.max_pending = max_pending
+        self.max_per_user = max_per_user
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.remember_ids = remember_ids
+        self.compact_after = compact_after
+
+        self.pending = OrderedDict()
+        self.per_user = {}
+        self.seen = OrderedDict()
+        self.acked_since_compact = 0
+        self.stats = {'accepted': 0, 'duplicates': 0, 'rejected': 0, 'processed': 0,
+                      'failed': 0, 'retries': 0, 'recovered': 0, 'corrupt': 0}
+
+        self._lock = threading.Lock()
+        self._work = queue.Queue()
+        self._threads = []
+        self._log = None
+        self._abandon = False
+        self._recover()
+
+    def _recover(self):
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break
+                    op, _, payload = line[:-1].partition(' ')
+                    try:
+                        if op == 'E':
+                            redemption = json.loads(payload)
+                            self.pending[redemption['id']] = redemption
+                            self._remember(redemption['id'])
+                        elif op == 'A':
+                            self.pending.pop(payload, None)
+                            self._remember(payload)
+                        elif op == 'S':
+                            self._remember(payload)
+                        else:
+                            raise ValueError(f"unknown op {op!r}")
+                    except (ValueError, KeyError, TypeError):
+                        # e.g. a torn write with a later append glued onto it
+                        self.stats['corrupt'] += 1
+        except FileNotFoundError:
+            pass
+        if self.stats['corrupt']:
+            print(f"Warning: Skipped {self.stats['corrupt']} corrupt lines in {self.path}")
+        for redemption in self.pending.values():
+            user = redemption.get('user')
+            self.per_user[user] = self.per_user.get(user, 0) + 1
+        self.stats['recovered'] = len(self.pending)
+        # Rewrite the log with the seen ids and the survivors (also drops a
+        # torn last line and any corrupt ones)
+        self._compact()
+
+    def start(self):
+        for redemption in self.pending.values():
+            self._work.put(redemption)
+        for i in range(self.worker_count):
+            thread = threading.Thread(target=self._worker, name=f'redemptions-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, drain=True):
+        # drain=False leaves queued redemptions unacked in the log, exactly as
+        # a crash would; they are delivered again on the next start
+        self._abandon = not drain
+        for _ in self._threads:
+            self._work.put(None)
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def submit(self, redemption):
+        rid = redemption['id']
+        user = redemption.get('user')
+        with self._lock:
+            if rid in self.seen:
+                self.stats['duplicates'] += 1
+                return 'duplicate'
+            if len(self.pending) >= self.max_pending or self.per_user.get(user, 0) >= self.max_per_user:
+                self.stats['rejected'] += 1
+                return 'rejected'
+            self._append(f"E {json.dumps(redemption, separators=(',', ':'))}\n")
+            self.pending[rid] = redemption
+            self.per_user[user] = self.per_user.get(user, 0) + 1
+            self._remember(rid)
+            self.stats['accepted'] += 1
+        self._work.put(redemption)
+        return 'accepted'
+
+    def _remember(self, rid):
+        self.seen[rid] = None
+        while len(self.seen) > self.remember_ids:
+            self.seen.popitem(last=False)
+
+    def _append(self, line):
+        if self._log is None:
+            self._log = open(self.path, 'a')
+        self._log.write(line)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def _ack(self, redemption):
+        rid = redemption['id']
+        with self._lock:
+            if self.pending.pop(rid, None) is None:
+                return
+            user = redemption.get('user')
+            self.per_user[user] -= 1
+            if not self.per_user[user]:
+                del self.per_user[user]
+            self._append(f"A {rid}\n")
+            self.acked_since_compact += 1
+            if self.acked_since_compact >= self.compact_after:
+                self._compact()
+
+    def _compact(self):
+        # Caller holds the lock (or is __init__)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.writelines(f"S {rid}\n" for rid in self.seen if rid not in self.pending)
+            for redemption in self.pending.values():
+                f.write(f"E {json.dumps(redemption, separators=(',', ':'))}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.acked_since_compact = 0
+
+    def _worker(self):
+        while True:
+            redemption = self._work.get()
+            if redemption is None or self._abandon:
+                break
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    self.handler(redemption)
+                    self.stats['processed'] += 1
+                    break
+                except Exception as e:
+                    if self._abandon:
+                        # Stopping without draining: keep it for redelivery
+                        return
+                    if attempt == self.max_attempts:
+                        print(f"Giving up on redemption {redemption['id']}: {e}")
+                        self.stats['failed'] += 1
+                    else:
+                        self.stats['retries'] += 1
+                        time.sleep(self.retry_delay * attempt)
+            self._ack(redemption)
+
+    @property
+    def backlog(self):
+        return len(self.pending)
@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import lazy_imports
+
+
+class ReplayBuffer:
+    # Instant replay: the last `seconds` of encoded frames in one preallocated
+    # byte ring.
+    #
+    # Packets are copied into a bytearray of max_bytes allocated up front, so
+    # memory stays fixed however long capture runs; the oldest packets are
+    # evicted once they fall out of the time window or would be overwritten.
+    # The lock is only held for one packet copy on push and for copying the
+    # small packet index on snapshot. Clips are written from the ring without
+    # the lock: the writer reserves its bytes (advances head) before copying,
+    # so a reader can tell after copying a packet out whether it was lapped,
+    # and drops it instead of making capture wait for the disk.
+
+    def __init__(self, seconds=30, max_bytes=256 * 1024 * 1024):
+        self.seconds = seconds
+        self.capacity = max_bytes
+        self.data = bytearray(max_bytes)
+        self.view = memoryview(self.data)
+        # (position, length, timestamp); positions count every byte ever
+        # written, the ring offset is position % capacity
+        self.index = deque()
+        self.head = 0
+        self.used = 0
+        self.stats = {'packets': 0, 'evicted': 0, 'oversize': 0, 'clips': 0, 'lapped': 0}
+        self._lock = threading.Lock()
+
+    def push(self, packet, timestamp):
+        packet = memoryview(packet).cast('B')
+        length = len(packet)
+        if length > self.capacity:
+            self.stats['oversize'] += 1
+            return False
+        with self._lock:
+            index = self.index
+            limit = self.head + length - self.capacity
+            while index and (index[0][0] < limit or index[0][2] < timestamp - self.seconds):
+                self.used -= index.popleft()[1]
+                self.stats['evicted'] += 1
+            position = self.head
+            self.head = position + length
+            offset = position % self.capacity
+            first = min(length, self.capacity - offset)
+            self.view[offset:offset + first] = packet[:first]
+            if first < length:
+                self.view[:length - first] = packet[first:]
+            index.append((position, length, timestamp))
+            self.used += length
+            self.stats['packets'] += 1
+        return True
+
+    def snapshot(self, seconds=None):
+        with self._lock:
+            entries = list(self.index)
+        if seconds is not None and entries:
+            cutoff = entries[-1][2] - seconds
+            entries = [entry for entry in entries if entry[2] >= cutoff]
+        return entries
+
+    def read(self, entry):
+        position, length, _ = entry
+        offset = position % self.capacity
+        first = min(length, self.capacity - offset)
+        data = bytes(self.view[offset:offset + first])
+        if first < length:
+            data += bytes(self.view[:length - first])
+        # Intact unless the writer has reserved bytes past this packet's slot
+        if self.head - position > self.capacity:
+            return None
+        return data
+
+    def save(self, path, seconds=None):
+        # Writes the packets back to back (an MJPEG stream for JPEG packets)
+        # plus a JSON sidecar with per-packet timestamps and sizes
+        started = time.perf_counter()
+        entries = self.snapshot(seconds)
+        snapshot_ms = (time.perf_counter() - started) * 1000
+        if not entries:
+            return None
+        first_timestamp = entries[0][2]
+        timestamps = []
+        sizes = []
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for entry in entries:
+                data = self.read(entry)
+                if data is None:
+                    self.stats['lapped'] += 1
+                    continue
+                f.write(data)
+                timestamps.append(round(entry[2] - first_timestamp, 4))
+                sizes.append(len(data))
+        os.replace(tmp_path, path)
+        duration = timestamps[-1] if timestamps else 0.0
+        meta = {
+            'packets': len(sizes),
+            'duration': duration,
+            'fps': round((len(sizes) - 1) / duration, 3) if duration else 0.0,
+            'timestamps': timestamps,
+            'sizes': sizes
+        }
+        with open(os.path.splitext(path)[0] + '.json', 'w') as f:
+            json.dump(meta, f)
+        self.stats['clips'] += 1
+        return {
+            'path': path,
+            'packets': len(sizes),
+            'bytes': sum(sizes),
+            'duration': duration,
+            'snapshot_ms': snapshot_ms,
+            'save_ms': (time.perf_counter() - started) * 1000
+        }
+
+    def memory(self):
+        return {
+            'capacity': self.capacity,
+            'used': self.used,
+            'packets': len(self.index),
+            'seconds': self.index[-1][2] - self.index[0][2] if len(self.index) > 1 else 0.0
+        }
+
+
+class ReplayCapture:
+    # Feeds a ReplayBuffer from a frame source on a daemon thread. Frames are
+    # JPEG encoded (optionally downscaled) before they go in; cv2 releases the
+    # GIL while encoding, so Tk keeps running.
+
+    def __init__(self, buffer, source, quality=80, max_width=1280):
+        self.buffer = buffer
+        self.source = source
+        self.quality = quality
+        self.max_width = max_width
+        self.thread = None
+        self.error = None
+        self.stats = {'frames': 0, 'encode_seconds': 0.0}
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, name='replay-capture', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        self.thread = None
+
+    def _run(self):
+        cv2 = lazy_imports.cv2()
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        try:
+            for timestamp, frame in self.source:
+                if self._stop.is_set():
+                    break
+                started = time.perf_counter()
+                if frame.shape[1] > self.max_width:
+                    height = frame.shape[0] * self.max_width // frame.shape[1]
+                    frame = cv2.resize(frame, (self.max_width, height), interpolation=cv2.INTER_AREA)
+                ok, packet = cv2.imencode('.jpg', frame, params)
+                self.stats['encode_seconds'] += time.perf_counter() - started
+                if ok:
+                    self.buffer.push(packet, timestamp)
+                    self.stats['frames'] += 1
+        except Exception as e:
+            self.error = e
+            print(f"Error capturing replay frames: {e}")
+        finally:
+            close = getattr(self.source, 'close', None)
+            if close is not None:
+                close()
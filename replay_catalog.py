@@ -0,0 +1,233 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import lazy_imports
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.mjpeg')
+SORT_COLUMNS = ('recorded_at', 'duration', 'size', 'eliminations', 'victories', 'name', 'mode')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS replays (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    recorded_at REAL,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    fps REAL,
+    mode TEXT,
+    eliminations INTEGER,
+    victories INTEGER,
+    thumbnail TEXT
+);
+CREATE INDEX IF NOT EXISTS replays_recorded_at ON replays(recorded_at);
+CREATE INDEX IF NOT EXISTS replays_mode ON replays(mode, recorded_at);
+CREATE INDEX IF NOT EXISTS replays_duration ON replays(duration);
+"""
+
+
+def probe(path, thumbnail_path, thumbnail_width=320):
+    # Runs in a worker process: reads the container metadata and grabs one
+    # frame 10% in as a PNG thumbnail (PNG so Tk can show it directly)
+    cv2 = lazy_imports.cv2()
+    info = {'duration': None, 'width': None, 'height': None, 'fps': None, 'thumbnail': None}
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        return info
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+        frames = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        info['width'] = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)) or None
+        info['height'] = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)) or None
+        info['fps'] = fps or None
+        if fps and frames > 0:
+            info['duration'] = frames / fps
+            capture.set(cv2.CAP_PROP_POS_FRAMES, int(frames * 0.1))
+        ok, frame = capture.read()
+        if ok:
+            height = frame.shape[0] * thumbnail_width // frame.shape[1]
+            thumbnail = cv2.resize(frame, (thumbnail_width, height), interpolation=cv2.INTER_AREA)
+            if cv2.imwrite(thumbnail_path, thumbnail):
+                info['thumbnail'] = thumbnail_path
+    finally:
+        capture.release()
+    return info
+
+
+class ReplayCatalog:
+    # SQLite index over the replay folders.
+    #
+    # A scan walks the folders with os.scandir and compares each file's
+    # (size, mtime) with the catalog in one query, so an unchanged library
+    # costs a directory walk and no video is opened. Only new or changed
+    # files are probed with cv2, in a process pool that also writes their
+    # thumbnails into the cache folder; rows for deleted files are dropped.
+    # Stats saved next to a replay (the .json sidecar written by Save Last
+    # Match) are merged into its row. Listing, filtering and sorting are
+    # plain indexed queries and never touch the files.
+
+    def __init__(self, db_path='replays.db', folders=('replays', 'clips'), thumbnails='thumbnails',
+                 workers=None):
+        self.db_path = db_path
+        self.folders = list(folders)
+        self.thumbnails = thumbnails
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.last_scan = None
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    def _walk(self, folder, found):
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self._walk(entry.path, found)
+            elif entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                st = entry.stat()
+                found[entry.path] = (st.st_size, st.st_mtime_ns)
+
+    def scan(self, on_progress=None):
+        started = time.perf_counter()
+        found = {}
+        for folder in self.folders:
+            # Absolute roots give absolute entry paths with no per-file join
+            self._walk(os.path.abspath(folder), found)
+        with self._lock:
+            known = {row[0]: (row[1], row[2]) for row in self.db.execute(
+                'SELECT path, size, mtime_ns FROM replays'
+            )}
+        changed = [path for path, signature in found.items() if known.get(path) != signature]
+        removed = [path for path in known if path not in found]
+
+        if removed:
+            self._remove(removed)
+        if changed:
+            self._probe_all(changed, found, on_progress)
+
+        self.last_scan = {
+            'files': len(found),
+            'probed': len(changed),
+            'removed': len(removed),
+            'seconds': time.perf_counter() - started
+        }
+        return self.last_scan
+
+    def _remove(self, paths):
+        with self._lock:
+            for path in paths:
+                row = self.db.execute('SELECT thumbnail FROM replays WHERE path = ?', (path,)).fetchone()
+                if row is not None and row[0]:
+                    _unlink(row[0])
+            self.db.executemany('DELETE FROM replays WHERE path = ?', [(p,) for p in paths])
+            self.db.commit()
+
+    def _probe_all(self, paths, found, on_progress):
+        os.makedirs(self.thumbnails, exist_ok=True)
+        rows = []
+        done = 0
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            futures = {}
+            for path in paths:
+                size, mtime_ns = found[path]
+                key = hashlib.sha1(f"{path}|{mtime_ns}".encode()).hexdigest()[:20]
+                thumbnail = os.path.join(self.thumbnails, key + '.png')
+                futures[pool.submit(probe, path, thumbnail)] = path
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    info = future.result()
+                except Exception as e:
+                    print(f"Warning: Could not probe {path}: {e}")
+                    info = {'duration': None, 'width': None, 'height': None, 'fps': None, 'thumbnail': None}
+                rows.append(self._row(path, found[path], info))
+                done += 1
+                # Commit in batches so the viewer sees progress on big scans
+                if len(rows) >= 100:
+                    self._upsert(rows)
+                    rows = []
+                if on_progress is not None:
+                    on_progress(done, len(paths))
+        if rows:
+            self._upsert(rows)
+
+    def _row(self, path, signature, info):
+        size, mtime_ns = signature
+        sidecar = {}
+        try:
+            with open(os.path.splitext(path)[0] + '.json', 'r') as f:
+                sidecar = json.load(f)
+        except (OSError, ValueError):
+            pass
+        return (
+            path, os.path.basename(path), size, mtime_ns,
+            sidecar.get('saved_at', mtime_ns / 1e9),
+            info['duration'] if info['duration'] is not None else sidecar.get('duration'),
+            info['width'], info['height'], info['fps'] or sidecar.get('fps'),
+            sidecar.get('mode') or '',
+            sidecar.get('eliminations'), sidecar.get('victories'),
+            info['thumbnail']
+        )
+
+    def _upsert(self, rows):
+        with self._lock:
+            # Thumbnails of the previous version of a changed file are stale
+            for row in rows:
+                old = self.db.execute('SELECT thumbnail FROM replays WHERE path = ?', (row[0],)).fetchone()
+                if old is not None and old[0] and old[0] != row[-1]:
+                    _unlink(old[0])
+            self.db.executemany(
+                'INSERT OR REPLACE INTO replays VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            self.db.commit()
+
+    def query(self, mode=None, search=None, sort='recorded_at', descending=True, limit=1000, offset=0):
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort replays by {sort}")
+        clauses = []
+        params = []
+        if mode:
+            clauses.append('mode = ?')
+            params.append(mode)
+        if search:
+            clauses.append('name LIKE ?')
+            params.append(f"%{search}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        order = 'DESC' if descending else 'ASC'
+        sql = f"SELECT * FROM replays {where} ORDER BY {sort} {order} LIMIT ? OFFSET ?"
+        with self._lock:
+            return [dict(row) for row in self.db.execute(sql, params + [limit, offset])]
+
+    def modes(self):
+        with self._lock:
+            return [row[0] for row in self.db.execute(
+                "SELECT DISTINCT mode FROM replays WHERE mode != '' ORDER BY mode"
+            )]
+
+    def count(self):
+        with self._lock:
+            return self.db.execute('SELECT COUNT(*) FROM replays').fetchone()[0]
+
+
+def _unlink(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
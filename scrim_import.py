@@ -0,0 +1,428 @@
+import csv
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+RESULT_EXTENSIONS = ('.csv', '.json', '.jsonl')
+
+# Header spellings seen in tournament tools and custom-lobby exports
+ALIASES = {
+    'player': ('player', 'player_name', 'name', 'epic_name', 'display_name'),
+    'match': ('match_id', 'match', 'game', 'game_id', 'session_id'),
+    'mode': ('mode', 'playlist', 'game_mode'),
+    'placement': ('placement', 'place', 'rank'),
+    'eliminations': ('eliminations', 'elims', 'kills'),
+    'storm_death': ('storm_death', 'died_to_storm', 'death_cause', 'eliminated_by'),
+}
+FIELDS = {alias: field for field, aliases in ALIASES.items() for alias in aliases}
+
+# Per (mode, player) counters, in the order parse_file returns them
+COUNTERS = ('matches', 'eliminations', 'placement_total', 'wins', 'top_10s', 'storm_deaths')
+SORT_COLUMNS = COUNTERS + ('best_placement', 'avg_elims', 'avg_placement', 'win_rate', 'storm_rate')
+NO_PLACEMENT = 32767
+
+
+def _field(key):
+    return FIELDS.get(str(key).strip().lower().replace(' ', '_'))
+
+
+def _csv_rows(f):
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    # Headers are resolved once; each row is then a plain index lookup
+    columns = [(field, i) for i, field in enumerate(map(_field, header)) if field is not None]
+    for row in reader:
+        yield {field: row[i] for field, i in columns if i < len(row)}
+
+
+def _json_values(f, chunk_size=1 << 16):
+    # Yields the elements of a top-level JSON array, or each value of a
+    # JSON Lines file, reading the file in chunks. Only the value being
+    # decoded is ever held in memory, never the whole document.
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    in_array = None
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(chunk_size), 0
+            eof = not buffer
+        if pos >= len(buffer):
+            return
+        if in_array is None:
+            in_array = buffer[pos] == '['
+            if in_array:
+                pos += 1
+                continue
+        if in_array and buffer[pos] == ']':
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Value continues past the buffer; grow geometrically so one
+            # huge value is not re-decoded once per chunk
+            more = f.read(max(chunk_size, len(buffer) - pos))
+            eof = not more
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        pos = end
+        yield value
+
+
+def _json_rows(f):
+    for value in _json_values(f):
+        if not isinstance(value, dict):
+            continue
+        # Match objects carrying their players' rows
+        players = value.get('players') or value.get('results')
+        if isinstance(players, list):
+            shared = {_field(k): v for k, v in value.items() if _field(k) in ('match', 'mode')}
+            for player in players:
+                if isinstance(player, dict):
+                    row = dict(shared)
+                    row.update((_field(k), v) for k, v in player.items() if _field(k) is not None)
+                    yield row
+        else:
+            yield {_field(k): v for k, v in value.items() if _field(k) is not None}
+
+
+def _storm(value):
+    if value is None or value is False:
+        return False
+    text = str(value).strip().lower()
+    return text in ('1', 'true', 'yes', 'y') or 'storm' in text
+
+
+def iter_results(path, default_mode='Unknown'):
+    # Generator over (match, mode, player, placement, eliminations,
+    # storm_death) for one CSV, JSON array or JSON Lines file; rows that
+    # cannot be read yield None so callers can count them
+    match = os.path.splitext(os.path.basename(path))[0]
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        rows = _csv_rows(f) if path.lower().endswith('.csv') else _json_rows(f)
+        for row in rows:
+            player = row.get('player')
+            try:
+                placement = int(row.get('placement'))
+                eliminations = int(row.get('eliminations') or 0)
+            except (TypeError, ValueError):
+                yield None
+                continue
+            if not player:
+                yield None
+                continue
+            yield (str(row.get('match') or match), str(row.get('mode') or default_mode),
+                   str(player).strip(), placement, eliminations, _storm(row.get('storm_death')))
+
+
+def parse_file(path, default_mode='Unknown'):
+    # Runs in a worker process. Rows are folded into per-(mode, player)
+    # totals as they stream past, so memory depends on the players in the
+    # file rather than its length, and only the totals cross back over IPC.
+    totals = {}
+    lobbies = {}
+    rows = bad = 0
+    for result in iter_results(path, default_mode):
+        if result is None:
+            bad += 1
+            continue
+        match, mode, player, placement, eliminations, storm = result
+        rows += 1
+        lobbies.setdefault(mode, set()).add(match)
+        counters = totals.get((mode, player))
+        if counters is None:
+            counters = totals[(mode, player)] = [0, 0, 0, 0, 0, 0, NO_PLACEMENT]
+        counters[0] += 1
+        counters[1] += eliminations
+        counters[2] += placement
+        counters[3] += placement == 1
+        counters[4] += placement <= 10
+        counters[5] += storm
+        if placement < counters[6]:
+            counters[6] = placement
+    return {
+        'path': path,
+        'totals': totals,
+        'lobbies': {mode: len(matches) for mode, matches in lobbies.items()},
+        'rows': rows,
+        'bad': bad
+    }
+
+
+def find_result_files(folder):
+    found = []
+    for root, dirs, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(RESULT_EXTENSIONS):
+                found.append(os.path.join(root, name))
+    return sorted(found)
+
+
+class ScrimStore:
+    # Per-player scrim aggregates in a columnar layout.
+    #
+    # Each (mode, player) pair is one row across preallocated NumPy columns
+    # (mode id, player id and one int64 column per counter) that grow by
+    # doubling; names live once in the players/modes lists. Result files are
+    # parsed by a process pool, each worker streaming its file into totals,
+    # and merging a file is a single fancy-indexed add per column. Queries
+    # mask by mode or bincount across modes, derive the per-match rates for
+    # the whole column at once, and only build Python objects for the rows
+    # returned. Imported files are remembered by size and mtime so a
+    # re-import only parses new files; if an imported file changed, its old
+    # totals cannot be taken back out, so everything is rebuilt.
+
+    def __init__(self, folder='scrims', capacity=4096, workers=None):
+        self.folder = folder
+        self.workers = workers
+        self._lock = threading.Lock()
+        self.last_import = None
+        self.reset(capacity)
+
+    def reset(self, capacity=4096):
+        self.players = []
+        self.player_index = {}
+        self.modes = []
+        self.mode_index = {}
+        self.rows = {}
+        self.files = {}
+        self.lobbies = {}
+        self.count = 0
+        self.mode_ids = np.zeros(capacity, dtype=np.int32)
+        self.player_ids = np.zeros(capacity, dtype=np.int32)
+        self.columns = {name: np.zeros(capacity, dtype=np.int64) for name in COUNTERS}
+        self.best = np.full(capacity, NO_PLACEMENT, dtype=np.int32)
+
+    @classmethod
+    def load(cls, folder='scrims', workers=None):
+        store = cls(folder, workers=workers)
+        try:
+            with open(os.path.join(folder, 'scrims.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with np.load(os.path.join(folder, 'scrims.npz')) as data:
+                count = len(data['mode_ids'])
+                store._grow(count)
+                store.mode_ids[:count] = data['mode_ids']
+                store.player_ids[:count] = data['player_ids']
+                store.best[:count] = data['best']
+                for name in COUNTERS:
+                    store.columns[name][:count] = data[name]
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Warning: Could not load scrim results, starting empty: {e}")
+            store.reset()
+            return store
+        store.count = count
+        store.players = meta['players']
+        store.modes = meta['modes']
+        store.files = meta['files']
+        store.lobbies = meta['lobbies']
+        store.player_index = {name: i for i, name in enumerate(store.players)}
+        store.mode_index = {name: i for i, name in enumerate(store.modes)}
+        store.rows = {(int(m), int(p)): row for row, (m, p) in
+                      enumerate(zip(store.mode_ids[:count], store.player_ids[:count]))}
+        return store
+
+    def save(self):
+        os.makedirs(self.folder, exist_ok=True)
+        with self._lock:
+            n = self.count
+            arrays = {name: column[:n] for name, column in self.columns.items()}
+            arrays.update(mode_ids=self.mode_ids[:n], player_ids=self.player_ids[:n], best=self.best[:n])
+            meta = {'players': self.players, 'modes': self.modes, 'files': self.files, 'lobbies': self.lobbies}
+            base = os.path.join(self.folder, 'scrims')
+            with open(base + '.tmp.npz', 'wb') as f:
+                np.savez(f, **arrays)
+            with open(base + '.json.tmp', 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(base + '.tmp.npz', base + '.npz')
+            os.replace(base + '.json.tmp', base + '.json')
+
+    def _grow(self, needed):
+        size = len(self.mode_ids)
+        if needed <= size:
+            return
+        while size < needed:
+            size *= 2
+
+        def grown(column, fill=0):
+            bigger = np.full(size, fill, dtype=column.dtype)
+            bigger[:len(column)] = column
+            return bigger
+
+        self.mode_ids = grown(self.mode_ids)
+        self.player_ids = grown(self.player_ids)
+        self.best = grown(self.best, NO_PLACEMENT)
+        self.columns = {name: grown(column) for name, column in self.columns.items()}
+
+    def _id(self, names, index, name):
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(names)
+            names.append(name)
+        return i
+
+    def merge(self, part):
+        totals = part['totals']
+        with self._lock:
+            self._grow(self.count + len(totals))
+            rows = np.empty(len(totals), dtype=np.int64)
+            for i, (mode, player) in enumerate(totals):
+                key = (self._id(self.modes, self.mode_index, mode),
+                       self._id(self.players, self.player_index, player))
+                row = self.rows.get(key)
+                if row is None:
+                    row = self.rows[key] = self.count
+                    self.mode_ids[row], self.player_ids[row] = key
+                    self.count += 1
+                rows[i] = row
+            # Keys are unique within a file, so plain fancy indexing is safe
+            values = np.array(list(totals.values()), dtype=np.int64).reshape(len(totals), len(COUNTERS) + 1)
+            for j, name in enumerate(COUNTERS):
+                self.columns[name][rows] += values[:, j]
+            self.best[rows] = np.minimum(self.best[rows], values[:, -1])
+            for mode, count in part['lobbies'].items():
+                self.lobbies[mode] = self.lobbies.get(mode, 0) + count
+
+    def import_files(self, paths, default_mode=None, on_progress=None, stop=None):
+        started = time.perf_counter()
+        default_mode = default_mode or 'Unknown'
+        paths = {os.path.abspath(path) for path in paths}
+        jobs = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                print(f"Warning: Could not read {path}: {e}")
+                continue
+            # The mode is part of the signature, so a file imported before
+            # under another mode is re-imported rather than skipped
+            signature = [stat.st_size, stat.st_mtime_ns, default_mode]
+            if self.files.get(path) != signature:
+                jobs[path] = signature
+
+        if any(path in self.files for path in jobs):
+            print("Warning: Previously imported scrim files changed, rebuilding all results")
+            previous = self.files
+            with self._lock:
+                self.reset()
+            for path, signature in previous.items():
+                if path not in jobs and os.path.exists(path):
+                    jobs[path] = signature
+        skipped = len(paths - jobs.keys())
+
+        rows = bad = done = 0
+        if jobs:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                futures = {pool.submit(parse_file, path, signature[2]): path for path, signature in jobs.items()}
+                for future in as_completed(futures):
+                    if stop is not None and stop.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    path = futures[future]
+                    try:
+                        part = future.result()
+                    except Exception as e:
+                        print(f"Warning: Could not import {path}: {e}")
+                        continue
+                    self.merge(part)
+                    self.files[path] = jobs[path]
+                    rows += part['rows']
+                    bad += part['bad']
+                    done += 1
+                    if on_progress is not None:
+                        on_progress(done, len(jobs))
+
+        self.last_import = {
+            'files': done,
+            'skipped': skipped,
+            'rows': rows,
+            'bad_rows': bad,
+            'seconds': time.perf_counter() - started
+        }
+        return self.last_import
+
+    def query(self, mode=None, search='', sort='eliminations', descending=True, min_matches=1, limit=100):
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort}")
+        with self._lock:
+            n = self.count
+            if mode is not None:
+                mode_id = self.mode_index.get(mode)
+                if mode_id is None:
+                    return []
+                rows = np.flatnonzero(self.mode_ids[:n] == mode_id)
+                players = self.player_ids[rows]
+                data = {name: column[rows] for name, column in self.columns.items()}
+                data['best_placement'] = self.best[rows]
+            else:
+                # Across modes: one weighted bincount per counter
+                players = np.arange(len(self.players))
+                ids = self.player_ids[:n]
+                data = {name: np.bincount(ids, weights=column[:n], minlength=len(self.players)).astype(np.int64)
+                        for name, column in self.columns.items()}
+                best = np.full(len(self.players), NO_PLACEMENT, dtype=np.int32)
+                np.minimum.at(best, ids, self.best[:n])
+                data['best_placement'] = best
+            names = self.players
+
+        matches = np.maximum(data['matches'], 1)
+        data['avg_elims'] = data['eliminations'] / matches
+        data['avg_placement'] = data['placement_total'] / matches
+        data['win_rate'] = data['wins'] / matches
+        data['storm_rate'] = data['storm_deaths'] / matches
+
+        keep = data['matches'] >= max(min_matches, 1)
+        if search:
+            needle = search.lower()
+            keep &= np.fromiter((needle in names[p].lower() for p in players), dtype=bool, count=len(players))
+        selected = np.flatnonzero(keep)
+        order = selected[np.argsort(data[sort][selected], kind='stable')]
+        if descending:
+            order = order[::-1]
+        results = []
+        for i in order[:limit]:
+            row = {'player': names[players[i]]}
+            for name in SORT_COLUMNS:
+                value = data[name][i]
+                row[name] = float(value) if value.dtype.kind == 'f' else int(value)
+            results.append(row)
+        return results
+
+    def summary(self, mode=None):
+        with self._lock:
+            n = self.count
+            if mode is None:
+                rows = slice(0, n)
+                lobbies = sum(self.lobbies.values())
+                players = len(np.unique(self.player_ids[:n]))
+            else:
+                mode_id = self.mode_index.get(mode)
+                if mode_id is None:
+                    return {'lobbies': 0, 'players': 0, 'results': 0, 'eliminations': 0, 'storm_deaths': 0}
+                rows = self.mode_ids[:n] == mode_id
+                lobbies = self.lobbies.get(mode, 0)
+                players = int(rows.sum())
+            return {
+                'lobbies': lobbies,
+                'players': players,
+                'results': int(self.columns['matches'][rows].sum()),
+                'eliminations': int(self.columns['eliminations'][rows].sum()),
+                'storm_deaths': int(self.columns['storm_deaths'][rows].sum())
+            }
@@ -0,0 +1,139 @@
+class SessionStats:
+    # Running session aggregates that the Stats tab displays.
+    #
+    # Every event updates counters in O(1) and marks only the display fields it
+    # can affect as dirty. push() formats the dirty fields and calls the bound
+    # setter only when the rendered text differs from what was last pushed, so
+    # Tk never redraws a label whose value did not change. No Tk imports here;
+    # setters are plain callables (StringVar.set in the app).
+
+    FIELDS = (
+        'Victories', 'Eliminations', 'Games Played', 'K/D Ratio',
+        'Win Rate', 'Top 10s', 'Avg Elims/Game', 'Best Game'
+    )
+
+    def __init__(self):
+        self._setters = {}
+        self._rendered = {}
+        self.reset()
+
+    def reset(self):
+        self.victories = 0
+        self.eliminations = 0
+        self.games_played = 0
+        self.top_10s = 0
+        self.game_elims = 0
+
+        # Per-game elimination distribution over finished games
+        self.elim_histogram = {}
+        self.finished_games = 0
+        self.finished_elims = 0
+        self.finished_elims_sq = 0
+        self.best_game = 0
+
+        self._dirty = set(self.FIELDS)
+
+    def load(self, stats):
+        self.victories = stats.get('victories', 0)
+        self.eliminations = stats.get('eliminations', 0)
+        self.games_played = stats.get('games_played', 0)
+        self.top_10s = stats.get('top_10s', 0)
+        self._dirty = set(self.FIELDS)
+
+    def bind(self, field, setter):
+        self._setters[field] = setter
+        self._rendered.pop(field, None)
+        self._dirty.add(field)
+
+    # Events
+    def elim(self, delta=1):
+        if self.game_elims + delta < 0:
+            return
+        self.game_elims += delta
+        self.eliminations += delta
+        self._dirty.update(('Eliminations', 'K/D Ratio'))
+
+    def victory(self):
+        self.victories += 1
+        self._dirty.update(('Victories', 'K/D Ratio', 'Win Rate'))
+
+    def top_10(self):
+        self.top_10s += 1
+        self._dirty.add('Top 10s')
+
+    def new_game(self):
+        elims = self.game_elims
+        self.elim_histogram[elims] = self.elim_histogram.get(elims, 0) + 1
+        self.finished_games += 1
+        self.finished_elims += elims
+        self.finished_elims_sq += elims * elims
+        if elims > self.best_game:
+            self.best_game = elims
+            self._dirty.add('Best Game')
+        self.game_elims = 0
+        self.games_played += 1
+        self._dirty.update(('Games Played', 'K/D Ratio', 'Win Rate', 'Avg Elims/Game'))
+
+    # Derived values
+    @property
+    def deaths(self):
+        # Every game that did not end in a victory ended in an elimination
+        return max(self.games_played - self.victories, 0)
+
+    @property
+    def kd_ratio(self):
+        return self.eliminations / max(self.deaths, 1)
+
+    @property
+    def win_rate(self):
+        games = max(self.games_played, self.victories)
+        return self.victories / games if games else 0.0
+
+    @property
+    def avg_elims(self):
+        return self.finished_elims / self.finished_games if self.finished_games else 0.0
+
+    @property
+    def elim_stddev(self):
+        if not self.finished_games:
+            return 0.0
+        mean = self.avg_elims
+        return max(self.finished_elims_sq / self.finished_games - mean * mean, 0.0) ** 0.5
+
+    def render(self, field):
+        if field == 'Victories':
+            return str(self.victories)
+        if field == 'Eliminations':
+            return str(self.eliminations)
+        if field == 'Games Played':
+            return str(self.games_played)
+        if field == 'K/D Ratio':
+            return f"{self.kd_ratio:.1f}"
+        if field == 'Win Rate':
+            return f"{self.win_rate * 100:.0f}%"
+        if field == 'Top 10s':
+            return str(self.top_10s)
+        if field == 'Avg Elims/Game':
+            return f"{self.avg_elims:.1f}"
+        if field == 'Best Game':
+            return str(self.best_game)
+        raise KeyError(field)
+
+    def changes(self):
+        # Rendered values that differ from the last push, clearing dirty marks
+        changed = {}
+        for field in self._dirty:
+            text = self.render(field)
+            if self._rendered.get(field) != text:
+                changed[field] = text
+        self._dirty.clear()
+        return changed
+
+    def push(self):
+        changed = self.changes()
+        for field, text in changed.items():
+            self._rendered[field] = text
+            setter = self._setters.get(field)
+            if setter is not None:
+                setter(text)
+        return changed
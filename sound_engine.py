@@ -0,0 +1,185 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+import lazy_imports
+
+SOUND_EXTENSIONS = ('.wav', '.ogg', '.mp3', '.flac')
+
+
+class SoundEngine:
+    # Low-latency sound playback for stream events.
+    #
+    # The mixer is opened with a small buffer and a fixed pool of reserved
+    # channels, so play() never waits for pygame to find a free default
+    # channel. Each effect has a voice limit: a burst of eliminations reuses
+    # the oldest voice of that effect instead of stacking or cutting off other
+    # effects. Files are decoded on a loader thread into an LRU cache bounded
+    # by decoded size, so large custom packs can be registered up front and
+    # only what is actually played stays in memory.
+    #
+    # A play() that missed the cache is replayed once its file is decoded:
+    # on_ready(name) is called from the loader thread and should hand the
+    # name back to the thread that calls play(). Without it the loader plays
+    # it itself, which only suits callers that have no UI thread.
+
+    def __init__(self, channels=8, voice_limits=None, default_voice_limit=2,
+                 cache_bytes=64 * 1024 * 1024, frequency=44100, buffer=512, on_ready=None):
+        self.channel_count = channels
+        self.voice_limits = dict(voice_limits or {})
+        self.default_voice_limit = default_voice_limit
+        self.cache_bytes = cache_bytes
+        self.frequency = frequency
+        self.buffer = buffer
+        self.on_ready = on_ready
+
+        self.files = {}
+        self.cache = OrderedDict()
+        self.cache_used = 0
+        self.channels = []
+        self.voices = {}
+        self.pending = None
+
+        self.ready = threading.Event()
+        self.failed = False
+        self.stats = {'plays': 0, 'steals': 0, 'misses': 0, 'decodes': 0, 'evictions': 0}
+
+        self._pygame = None
+        self._lock = threading.Lock()
+        self._decode_queue = queue.Queue()
+        self._queued = set()
+        self._thread = None
+
+    def register(self, name, path, preload=True):
+        self.files[name] = path
+        if preload:
+            self._request_decode(name)
+
+    def load_pack(self, directory, preload=False):
+        # Every audio file in the folder becomes an effect named after the file
+        for entry in sorted(os.listdir(directory)):
+            base, ext = os.path.splitext(entry)
+            if ext.lower() in SOUND_EXTENSIONS:
+                self.register(base, os.path.join(directory, entry), preload)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='sound-loader', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._decode_queue.put(None)
+
+    # Loader thread
+    def _run(self):
+        try:
+            pygame = lazy_imports.pygame()
+            pygame.mixer.pre_init(self.frequency, -16, 2, self.buffer)
+            pygame.mixer.init()
+            pygame.mixer.set_num_channels(self.channel_count)
+            pygame.mixer.set_reserved(self.channel_count)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+            self._pygame = pygame
+        except Exception as e:
+            print(f"Warning: Sound system initialization failed: {e}")
+            self.failed = True
+            self.ready.set()
+            return
+        self.ready.set()
+
+        while True:
+            name = self._decode_queue.get()
+            if name is None:
+                break
+            try:
+                self._decode(name)
+                with self._lock:
+                    self._queued.discard(name)
+                    pending = self.pending if self.pending == name else None
+                    if pending is not None:
+                        self.pending = None
+                if pending is not None:
+                    (self.on_ready or self.play)(pending)
+            except Exception as e:
+                # Keep the loader alive; later effects still need decoding
+                print(f"Warning: Sound effect {name} failed: {e}")
+
+    def _request_decode(self, name):
+        with self._lock:
+            if name in self.cache or name in self._queued:
+                return
+            self._queued.add(name)
+        self._decode_queue.put(name)
+        self.start()
+
+    def _decode(self, name):
+        path = self.files.get(name)
+        if path is None:
+            return
+        try:
+            sound = self._pygame.mixer.Sound(path)
+        except Exception:
+            print(f"Could not load sound effect: {path}")
+            return
+        frequency, _, channels = self._pygame.mixer.get_init()
+        size = int(sound.get_length() * frequency * channels * 2)
+        with self._lock:
+            self.cache[name] = (sound, size)
+            self.cache_used += size
+            self.stats['decodes'] += 1
+            while self.cache_used > self.cache_bytes and len(self.cache) > 1:
+                evicted, (_, evicted_size) = self.cache.popitem(last=False)
+                self.cache_used -= evicted_size
+                self.stats['evictions'] += 1
+
+    # Playback (Tk thread)
+    def play(self, name):
+        if self.failed:
+            return False
+        with self._lock:
+            entry = self.cache.get(name)
+            if entry is not None:
+                self.cache.move_to_end(name)
+        if entry is None or not self.ready.is_set():
+            # Not decoded yet: play the most recent request as soon as it is
+            self.stats['misses'] += 1
+            self.pending = name
+            self._request_decode(name)
+            return False
+
+        channel = self._pick_channel(name)
+        channel.play(entry[0])
+        self.stats['plays'] += 1
+        return True
+
+    def _pick_channel(self, name):
+        voices = self.voices.setdefault(name, deque())
+        while voices and not voices[0][1].get_busy():
+            voices.popleft()
+
+        limit = self.voice_limits.get(name, self.default_voice_limit)
+        if len(voices) >= limit:
+            # Retrigger this effect's oldest voice rather than stacking another
+            _, channel = voices.popleft()
+            self.stats['steals'] += 1
+        else:
+            channel = self._free_channel()
+        voices.append((time.perf_counter(), channel))
+        return channel
+
+    def _free_channel(self):
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        # Pool exhausted: take the voice that started longest ago
+        oldest_name, oldest = None, None
+        for name, voices in self.voices.items():
+            if voices and (oldest is None or voices[0][0] < oldest[0]):
+                oldest_name, oldest = name, voices[0]
+        if oldest is None:
+            return self.channels[0]
+        self.voices[oldest_name].popleft()
+        self.stats['steals'] += 1
+        return oldest[1]
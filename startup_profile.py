@@ -0,0 +1,43 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    # Collects wall-clock time per startup phase for --profile-startup.
+    # When disabled, section() is a no-op so the timing calls can stay in place.
+
+    def __init__(self, enabled=False, origin=None):
+        self.enabled = enabled
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.sections = []
+        self.reported = False
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.sections.append((name, seconds))
+            if self.reported:
+                # Late sections (lazily built tabs) are reported as they happen
+                print(f"[startup] {name:<32} {seconds * 1000:8.1f} ms")
+
+    def report(self, title="Time to first frame"):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        total = time.perf_counter() - self.origin
+        print("Startup profile")
+        print("-" * 45)
+        for name, seconds in self.sections:
+            print(f"{name:<32} {seconds * 1000:8.1f} ms")
+        print("-" * 45)
+        print(f"{title:<32} {total * 1000:8.1f} ms")
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from chat_commands import TokenBucket
+
+DEFAULT_API_URL = 'https://fortnite-api.com'
+
+
+class ApiError(Exception):
+    pass
+
+
+class _Flight:
+    # One upstream request that duplicate lookups wait on
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class StatsApiClient:
+    # Fortnite stats lookups with pooling, caching and rate limiting.
+    #
+    # All requests share one requests.Session whose adapter keeps a pool of
+    # keep-alive connections. Responses are cached by URL in memory and as
+    # one JSON file per URL under cache_dir, so they survive restarts. A
+    # fresh entry (younger than ttl) is returned without any request; a stale
+    # one is revalidated with If-None-Match and a 304 just renews it. Lookups
+    # for a URL that is already in flight wait for that request instead of
+    # sending their own. Upstream calls go through a token bucket sized to
+    # the API's limit, and a 429 or an exhausted X-RateLimit-Remaining pauses
+    # upstream traffic until the reset; while paused, stale cache entries are
+    # served instead of failing.
+
+    def __init__(self, base_url=None, api_key=None, ttl=300.0, cache_dir='api_cache',
+                 requests_per_minute=60, burst=10, workers=4, timeout=10.0, session=None):
+        self.base_url = (base_url or os.environ.get('FORTNITE_API_URL', DEFAULT_API_URL)).rstrip('/')
+        self.api_key = api_key if api_key is not None else os.environ.get('FORTNITE_API_KEY', '')
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.memory = {}
+        self.blocked_until = 0.0
+        self.stats = {'lookups': 0, 'memory_hits': 0, 'disk_hits': 0, 'upstream': 0, 'not_modified': 0,
+                      'coalesced': 0, 'rate_limited': 0, 'stale_served': 0, 'errors': 0}
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if self.api_key:
+            self.session.headers['Authorization'] = self.api_key
+
+        self._bucket = TokenBucket(burst, requests_per_minute / 60.0)
+        self._bucket_state = None
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stats-api')
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+    # Async entry points: callback(result, error) runs on a worker thread
+    def fetch_async(self, path, params=None, callback=None):
+        def run():
+            try:
+                result = self.fetch(path, params)
+            except Exception as e:
+                if callback is not None:
+                    callback(None, e)
+                return
+            if callback is not None:
+                callback(result, None)
+        return self._pool.submit(run)
+
+    def player_stats_async(self, name, callback, time_window='lifetime'):
+        def done(result, error):
+            # A body of the wrong shape is reported like a failed request
+            # rather than raising on the worker thread
+            if error is None:
+                try:
+                    result = normalize_stats(result)
+                except Exception as e:
+                    result, error = None, e
+            callback(None if error else result, error)
+        return self.fetch_async('/v2/stats/br/v2', {'name': name, 'timeWindow': time_window}, done)
+
+    def fetch(self, path, params=None):
+        url = self.base_url + path
+        if params:
+            url += '?' + requests.compat.urlencode(sorted(params.items()))
+        self.stats['lookups'] += 1
+
+        entry = self._cached(url)
+        if entry is not None and entry['expires_at'] > time.time():
+            return entry['body']
+
+        with self._lock:
+            flight = self._flights.get(url)
+            leader = flight is None
+            if leader:
+                flight = self._flights[url] = _Flight()
+            else:
+                self.stats['coalesced'] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._upstream(url, entry)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[url]
+            flight.done.set()
+
+    def _cached(self, url):
+        entry = self.memory.get(url)
+        if entry is not None:
+            if entry['expires_at'] > time.time():
+                self.stats['memory_hits'] += 1
+            return entry
+        try:
+            with open(self._cache_path(url), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.memory[url] = entry
+        if entry['expires_at'] > time.time():
+            self.stats['disk_hits'] += 1
+        return entry
+
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+    def _store(self, url, entry):
+        self.memory[url] = entry
+        path = self._cache_path(url)
+        try:
+            with open(path + '.tmp', 'w') as f:
+                json.dump(entry, f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"Warning: Could not write API cache: {e}")
+
+    def _wait_for_slot(self, stale):
+        # Returns False if the caller should fall back to the stale entry
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                if stale is not None:
+                    return False
+                time.sleep(self.blocked_until - now)
+                continue
+            with self._lock:
+                allowed, self._bucket_state = self._bucket.take(self._bucket_state, now)
+            if allowed:
+                return True
+            self.stats['rate_limited'] += 1
+            time.sleep(1.0 / self._bucket.rate)
+
+    def _upstream(self, url, entry):
+        if not self._wait_for_slot(entry):
+            self.stats['stale_served'] += 1
+            return entry['body']
+        headers = {}
+        if entry is not None and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        self.stats['upstream'] += 1
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.stats['errors'] += 1
+            if entry is not None:
+                self.stats['stale_served'] += 1
+                return entry['body']
+            raise ApiError(f"Stats API unreachable: {e}")
+        self._note_limits(response)
+
+        if response.status_code == 304 and entry is not None:
+            self.stats['not_modified'] += 1
+            entry = dict(entry, expires_at=time.time() + self.ttl)
+            self._store(url, entry)
+            return entry['body']
+        if response.status_code == 429 or response.status_code >= 500:
+            self.stats['errors'] += 1
+            if entry is not None:
+                self.stats['stale_served'] += 1
+                return entry['body']
+            raise ApiError(f"Stats API returned {response.status_code}")
+        if response.status_code != 200:
+            self.stats['errors'] += 1
+            raise ApiError(f"Stats API returned {response.status_code}: {response.text[:200]}")
+
+        body = response.json()
+        self._store(url, {
+            'body': body,
+            'etag': response.headers.get('ETag'),
+            'fetched_at': time.time(),
+            'expires_at': time.time() + self._max_age(response)
+        })
+        return body
+
+    def _max_age(self, response):
+        for part in response.headers.get('Cache-Control', '').split(','):
+            key, _, value = part.strip().partition('=')
+            if key == 'max-age' and value.isdigit():
+                return min(int(value), self.ttl) if self.ttl else int(value)
+        return self.ttl
+
+    def _note_limits(self, response):
+        retry = None
+        if response.status_code == 429:
+            retry = response.headers.get('Retry-After', '5')
+        elif response.headers.get('X-RateLimit-Remaining') == '0':
+            retry = response.headers.get('X-RateLimit-Reset', '1')
+        if retry is not None:
+            try:
+                delay = float(retry)
+            except ValueError:
+                delay = 5.0
+            # Some APIs send the reset as an epoch timestamp
+            if delay > 1e9:
+                delay = max(delay - time.time(), 0)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+
+def normalize_stats(body):
+    # fortnite-api.com /v2/stats/br/v2 -> the integer counters the app keeps
+    # "data" is null for players with hidden stats; zeros would overwrite the
+    # streamer's real counters, so that is an error rather than an empty result
+    data = body.get('data') if isinstance(body, dict) else None
+    if not isinstance(data, dict):
+        raise ValueError("Stats response has no data")
+    overall = ((data.get('stats') or {}).get('all') or {}).get('overall') or {}
+    return {
+        'victories': int(overall.get('wins', 0)),
+        'eliminations': int(overall.get('kills', 0)),
+        'games_played': int(overall.get('matches', 0)),
+        'top_10s': int(overall.get('top10', 0) or overall.get('top5', 0) or 0)
+    }
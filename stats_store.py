@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+
+DEFAULT_STATS = {'victories': 0, 'eliminations': 0, 'games_played': 0, 'top_10s': 0}
+
+
+class StatsStore:
+    # Write-behind stats persistence.
+    #
+    # Every change is applied to the in-memory dict immediately and queued as a
+    # one-line journal event ("<seq> <op> <key> <json value>"). A background thread
+    # appends queued events to the journal every flush_interval seconds and,
+    # once the journal holds compact_every events, rewrites the snapshot
+    # atomically and truncates the journal. The snapshot records the last seq it
+    # contains, so a crash between the two steps only replays newer events.
+
+    def __init__(self, path='stats.json', journal_path=None, flush_interval=1.0, compact_every=500):
+        self.path = path
+        self.journal_path = journal_path or os.path.splitext(path)[0] + '.journal'
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+
+        self.stats = dict(DEFAULT_STATS)
+        self.seq = 0
+        self.journal_events = 0
+
+        self._pending = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def load(self):
+        snapshot_seq = 0
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            snapshot_seq = data.pop('_seq', 0)
+            self.stats.update(data)
+        except FileNotFoundError:
+            print("No existing stats file found, creating new one")
+        except Exception as e:
+            print(f"Error loading stats: {e}")
+
+        self.seq = snapshot_seq
+        self.journal_events = 0
+        try:
+            with open(self.journal_path, 'r') as f:
+                lines = f.readlines()
+            for i, line in enumerate(lines):
+                event = self._parse(line)
+                if event is None and i == len(lines) - 1:
+                    # Torn write from a crash; drop it so new appends stay readable
+                    with open(self.journal_path, 'w') as f:
+                        f.write(''.join(lines[:i]))
+                    break
+                if event is None:
+                    # A complete but unreadable line; later events are still valid
+                    print(f"Warning: Skipping corrupt stats journal line {i + 1}")
+                    continue
+                self.journal_events += 1
+                if event[0] > snapshot_seq:
+                    self._apply(*event[1:])
+                    self.seq = event[0]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error replaying stats journal: {e}")
+
+        return self.stats
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='stats-writer', daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self.compact()
+
+    # Mutations (called from the UI thread)
+    def incr(self, key, delta=1):
+        self._record('+', key, delta)
+
+    def set(self, key, value):
+        self._record('=', key, value)
+
+    def reset(self, values=None):
+        with self._lock:
+            self.stats.clear()
+            self.stats.update(values if values is not None else DEFAULT_STATS)
+            self.seq += 1
+            self._pending.append(f"{self.seq} ! {json.dumps(self.stats, separators=(',', ':'))}\n")
+
+    def _record(self, op, key, value):
+        with self._lock:
+            self._apply(op, key, value)
+            self.seq += 1
+            self._pending.append(f"{self.seq} {op} {key} {json.dumps(value, separators=(',', ':'))}\n")
+
+    def _apply(self, op, key, value=None):
+        if op == '+':
+            self.stats[key] = self.stats.get(key, 0) + value
+        elif op == '=':
+            self.stats[key] = value
+        elif op == '!':
+            self.stats.clear()
+            self.stats.update(key)
+
+    def _parse(self, line):
+        if not line.endswith('\n'):
+            return None
+        try:
+            seq, op, rest = line[:-1].split(' ', 2)
+            if op == '!':
+                return int(seq), op, json.loads(rest)
+            key, value = rest.split(' ', 1)
+            return int(seq), op, key, json.loads(value)
+        except ValueError:
+            return None
+
+    # Background writer
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if self.journal_events >= self.compact_every:
+                    self.compact()
+            except Exception as e:
+                print(f"Error writing stats journal: {e}")
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            with open(self.journal_path, 'a') as f:
+                f.write(''.join(batch))
+                f.flush()
+                os.fsync(f.fileno())
+            self.journal_events += len(batch)
+
+    def compact(self):
+        with self._io_lock:
+            with self._lock:
+                # Only events already in the journal may be folded into the
+                # snapshot, otherwise a crash would drop the pending batch
+                if self._pending:
+                    return
+                data = dict(self.stats)
+                data['_seq'] = self.seq
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            open(self.journal_path, 'w').close()
+            self.journal_events = 0
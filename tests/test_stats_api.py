@@ -0,0 +1,117 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from fake_stats_api import FakeStatsApi
+from stats_api import StatsApiClient, normalize_stats
+
+# Drives StatsApiClient against the local stand-in API from benchmarks/, so
+# caching, revalidation, coalescing and rate limiting are checked against
+# real HTTP round trips. Run with: python -m unittest discover tests
+
+PATH = '/v2/stats/br/v2'
+PARAMS = {'name': 'player1', 'timeWindow': 'lifetime'}
+
+
+class StatsApiClientTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp(prefix='stats-api-test-')
+        self.api = None
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        if self.api is not None:
+            self.api.stop()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def start_api(self, **options):
+        self.api = FakeStatsApi(port=0, **options).start()
+        return self.api
+
+    def client(self, **options):
+        client = StatsApiClient(f"http://127.0.0.1:{self.api.port}", api_key='test',
+                                cache_dir=self.folder, **options)
+        self.clients.append(client)
+        return client
+
+    def test_etag_revalidation_renews_entry(self):
+        api = self.start_api(latency=0.0)
+        client = self.client(ttl=0.2)
+        first = client.fetch(PATH, PARAMS)
+        time.sleep(0.3)
+
+        second = client.fetch(PATH, PARAMS)
+        self.assertEqual(second, first)
+        self.assertEqual(api.not_modified, 1)
+        self.assertEqual(client.stats['not_modified'], 1)
+
+        # The 304 renewed the entry, so an immediate lookup stays local
+        client.fetch(PATH, PARAMS)
+        self.assertEqual(api.requests, 2)
+        self.assertEqual(client.stats['memory_hits'], 1)
+
+    def test_duplicate_lookups_share_one_request(self):
+        api = self.start_api(latency=0.3)
+        client = self.client(workers=8)
+        start = threading.Barrier(8)
+        results = []
+
+        def lookup():
+            start.wait()
+            results.append(client.fetch(PATH, PARAMS))
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(api.requests, 1)
+        self.assertEqual(client.stats['coalesced'], 7)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_rate_limit_serves_stale_entry(self):
+        api = self.start_api(latency=0.0, limit=1)
+        warm = self.client(ttl=0.2)
+        body = warm.fetch(PATH, PARAMS)
+        time.sleep(0.3)
+
+        # A second client shares the now-stale disk entry but has not seen
+        # the exhausted limit, so its revalidation gets the 429
+        client = self.client(ttl=0.2)
+        self.assertEqual(client.fetch(PATH, PARAMS), body)
+        self.assertEqual(api.throttled, 1)
+        self.assertEqual(client.stats['stale_served'], 1)
+        self.assertGreater(client.blocked_until, time.monotonic() + 30)
+
+        # Retry-After keeps it off the API; stale data is served meanwhile
+        self.assertEqual(client.fetch(PATH, PARAMS), body)
+        self.assertEqual(api.requests, 2)
+        self.assertEqual(client.stats['stale_served'], 2)
+
+    def test_disk_tier_survives_new_client(self):
+        api = self.start_api(latency=0.0)
+        first = self.client(ttl=600.0)
+        body = first.fetch(PATH, PARAMS)
+        first.close()
+
+        restarted = self.client(ttl=600.0)
+        self.assertEqual(restarted.fetch(PATH, PARAMS), body)
+        self.assertEqual(api.requests, 1)
+        self.assertEqual(restarted.stats['disk_hits'], 1)
+        self.assertGreater(normalize_stats(body)['games_played'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
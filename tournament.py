@@ -0,0 +1,185 @@
+import csv
+import json
+import os
+from bisect import bisect_left, insort
+
+
+class ScoringRules:
+    # Placement tiers are (worst place, points) pairs, best tier first, so
+    # [(1, 25), (5, 15)] gives 25 for a win and 15 for 2nd-5th. They are
+    # expanded into a per-place table once; scoring a result is then a lookup.
+
+    def __init__(self, placement, elim_points=1, team_size=1, teams=100):
+        self.placement = list(placement)
+        self.elim_points = elim_points
+        self.team_size = team_size
+        self.teams = teams
+        self.table = [0] * (teams + 1)
+        place = 1
+        for worst, points in self.placement:
+            while place <= min(worst, teams):
+                self.table[place] = points
+                place += 1
+
+    def points(self, placement, eliminations):
+        placed = self.table[placement] if 0 < placement < len(self.table) else 0
+        return placed + eliminations * self.elim_points
+
+
+# Point tables follow the shape of Epic's competitive scoring: a big bonus
+# for the win, steps through the top 25 and elimination points on top
+TOURNAMENT_RULES = {
+    "Solo Cash Cup": ScoringRules(
+        [(1, 25), (2, 20), (3, 16), (4, 14), (5, 12), (10, 10), (15, 7), (20, 5), (25, 3), (40, 1)],
+        elim_points=2, team_size=1, teams=100
+    ),
+    "Duo Arena": ScoringRules(
+        [(1, 60), (2, 50), (3, 45), (5, 40), (10, 30), (15, 20), (20, 10), (25, 5)],
+        elim_points=2, team_size=2, teams=50
+    ),
+    "Trio Tournament": ScoringRules(
+        [(1, 60), (2, 54), (3, 48), (5, 40), (10, 30), (15, 20), (20, 10), (25, 5)],
+        elim_points=1, team_size=3, teams=33
+    ),
+    "Squad Scrims": ScoringRules(
+        [(1, 20), (2, 16), (3, 14), (5, 12), (10, 8), (15, 4), (20, 2), (25, 1)],
+        elim_points=1, team_size=4, teams=25
+    ),
+}
+
+
+class Standing:
+    __slots__ = ('team', 'points', 'wins', 'eliminations', 'matches', 'placement_total', 'key')
+
+    def __init__(self, team):
+        self.team = team
+        self.points = 0
+        self.wins = 0
+        self.eliminations = 0
+        self.matches = 0
+        self.placement_total = 0
+        self.key = None
+
+    @property
+    def avg_placement(self):
+        return self.placement_total / self.matches if self.matches else 0.0
+
+    def sort_key(self):
+        # Ascending order is leaderboard order: points, then wins, then the
+        # better average placement, then eliminations; the name keeps keys
+        # unique so a team's entry can be found again by bisect
+        return (-self.points, -self.wins, self.avg_placement, -self.eliminations, self.team)
+
+
+class Tournament:
+    # Cumulative leaderboard for a multi-match tournament.
+    #
+    # The leaderboard is a list of sort keys kept ordered with bisect. A
+    # result only moves its own team: the old key is found with a binary
+    # search and removed, the new one is inserted at its new place, so a
+    # result costs two O(log n) searches plus a pointer memmove instead of a
+    # re-sort of every team. Ranks are a single bisect and the top N is a
+    # slice. Every applied match is kept, so the last one can be undone if it
+    # was entered wrong. on_update(tournament) runs once per applied match.
+
+    def __init__(self, name, rules, on_update=None):
+        self.name = name
+        self.rules = rules
+        self.on_update = on_update
+        self.teams = {}
+        self.order = []
+        self.matches = []
+
+    def _apply(self, team, placement, eliminations, sign):
+        standing = self.teams.get(team)
+        if standing is None:
+            standing = self.teams[team] = Standing(team)
+        else:
+            del self.order[bisect_left(self.order, standing.key)]
+        standing.points += sign * self.rules.points(placement, eliminations)
+        standing.wins += sign * (placement == 1)
+        standing.eliminations += sign * eliminations
+        standing.matches += sign
+        standing.placement_total += sign * placement
+        if standing.matches == 0:
+            del self.teams[team]
+            return
+        standing.key = standing.sort_key()
+        insort(self.order, standing.key)
+
+    def add_match(self, results):
+        # results: (team, placement, eliminations) for one match. A team
+        # listed twice keeps its first row.
+        applied = []
+        seen = set()
+        for team, placement, eliminations in results:
+            if team in seen:
+                print(f"Warning: {team} appears twice in match {len(self.matches) + 1}, keeping the first result")
+                continue
+            seen.add(team)
+            self._apply(team, placement, eliminations, 1)
+            applied.append((team, placement, eliminations))
+        self.matches.append(applied)
+        if self.on_update is not None:
+            self.on_update(self)
+        return len(applied)
+
+    def undo_match(self):
+        if not self.matches:
+            return False
+        for team, placement, eliminations in self.matches.pop():
+            self._apply(team, placement, eliminations, -1)
+        if self.on_update is not None:
+            self.on_update(self)
+        return True
+
+    def rank(self, team):
+        standing = self.teams.get(team)
+        if standing is None:
+            return None
+        return bisect_left(self.order, standing.key) + 1
+
+    def standing(self, team):
+        return self.teams.get(team)
+
+    def top(self, count=10):
+        return [self.teams[key[-1]] for key in self.order[:count]]
+
+    def leaderboard(self, count=10):
+        # Overlay form: [[team, points], ...]
+        return [[standing.team, standing.points] for standing in self.top(count)]
+
+    def __len__(self):
+        return len(self.order)
+
+    def save(self, path):
+        data = {'name': self.name, 'matches': self.matches}
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(path + '.tmp', path)
+
+
+def load_match_results(path):
+    # One match's results from a CSV (team/placement/eliminations columns,
+    # a few common header spellings accepted) or a JSON list of objects
+    # with the same keys, optionally under "results"
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        rows = data.get('results', []) if isinstance(data, dict) else data
+    else:
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+    results = []
+    for row in rows:
+        row = {str(k).strip().lower(): v for k, v in row.items()}
+        team = row.get('team') or row.get('name') or row.get('player')
+        try:
+            placement = int(row.get('placement') or row.get('place'))
+            eliminations = int(row.get('eliminations') or row.get('elims') or row.get('kills') or 0)
+        except (TypeError, ValueError):
+            print(f"Warning: Skipping malformed result row in {path}: {row}")
+            continue
+        if team:
+            results.append((str(team).strip(), placement, eliminations))
+    return results
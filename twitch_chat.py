@@ -0,0 +1,247 @@
+import asyncio
+import threading
+import time
+
+TWITCH_IRC_HOST = 'irc.chat.twitch.tv'
+TWITCH_IRC_PORT = 6667
+
+_TAG_ESCAPES = {':': ';', 's': ' ', '\\': '\\', 'r': '\r', 'n': '\n'}
+
+
+def unescape_tag(value):
+    out = []
+    i = 0
+    while i < len(value):
+        c = value[i]
+        if c == '\\' and i + 1 < len(value):
+            out.append(_TAG_ESCAPES.get(value[i + 1], value[i + 1]))
+            i += 2
+        else:
+            if c != '\\':
+                out.append(c)
+            i += 1
+    return ''.join(out)
+
+
+def parse_tags(raw):
+    tags = {}
+    for item in raw.split(';'):
+        key, _, value = item.partition('=')
+        if '\\' in value:
+            value = unescape_tag(value)
+        tags[key] = value
+    return tags
+
+
+class ChatMessage:
+    # One parsed IRC line. Tags stay a raw string until first accessed; most
+    # consumers only need nick and text, and tag parsing dominates cost.
+    __slots__ = ('raw_tags', 'prefix', 'command', 'params', '_tags')
+
+    def __init__(self, raw_tags, prefix, command, params):
+        self.raw_tags = raw_tags
+        self.prefix = prefix
+        self.command = command
+        self.params = params
+        self._tags = None
+
+    @property
+    def tags(self):
+        if self._tags is None:
+            self._tags = parse_tags(self.raw_tags) if self.raw_tags else {}
+        return self._tags
+
+    @property
+    def nick(self):
+        if not self.prefix:
+            return ''
+        return self.prefix.split('!', 1)[0]
+
+    @property
+    def channel(self):
+        return self.params[0] if self.params else ''
+
+    @property
+    def text(self):
+        return self.params[-1] if self.params else ''
+
+    @property
+    def user_id(self):
+        return self.tags.get('user-id') or self.nick
+
+
+def parse_line(line):
+    raw_tags = None
+    prefix = None
+    if line.startswith('@'):
+        raw_tags, _, line = line.partition(' ')
+        raw_tags = raw_tags[1:]
+    if line.startswith(':'):
+        prefix, _, line = line.partition(' ')
+        prefix = prefix[1:]
+    head, sep, trailing = line.partition(' :')
+    params = head.split(' ')
+    command = params[0]
+    params = params[1:]
+    if sep:
+        params.append(trailing)
+    return ChatMessage(raw_tags, prefix, command, params)
+
+
+class TwitchChatClient:
+    # Anonymous (justinfan) or authenticated Twitch chat reader.
+    #
+    # The asyncio loop lives on its own daemon thread. Socket data is read in
+    # large chunks and split into lines by hand, PRIVMSG lines are parsed and
+    # collected, and on_batch(list_of_messages) is called at most once per
+    # batch interval from the chat thread. Callers hand the batch to the UI
+    # through the event bus, so Tk never waits on the network.
+
+    def __init__(self, channel, on_batch, nick=None, token=None,
+                 host=TWITCH_IRC_HOST, port=TWITCH_IRC_PORT,
+                 batch_ms=50, max_batch=5000, on_status=None):
+        self.channel = '#' + channel.lstrip('#').lower()
+        self.on_batch = on_batch
+        self.on_status = on_status
+        self.nick = nick or 'justinfan12345'
+        self.token = token
+        self.host = host
+        self.port = port
+        self.batch_interval = batch_ms / 1000
+        self.max_batch = max_batch
+
+        self.loop = None
+        self.thread = None
+        self.connected = False
+        self.stats = {'messages': 0, 'batches': 0, 'bytes': 0, 'reconnects': 0}
+
+        self._batch = []
+        self._stopping = False
+        self._writer = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._thread_main, name='twitch-chat', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self._stopping = True
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._close_writer)
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def send(self, text):
+        # Thread-safe; anonymous (justinfan) sessions cannot post, so replies
+        # are only sent when a token is configured
+        if not self.token or self.loop is None:
+            return False
+        line = f'PRIVMSG {self.channel} :{text}\r\n'.encode()
+        self.loop.call_soon_threadsafe(self._write, line)
+        return True
+
+    def _write(self, data):
+        if self._writer is not None:
+            self._writer.write(data)
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def _status(self, text):
+        if self.on_status is not None:
+            self.on_status(text)
+
+    def _thread_main(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self._run())
+        finally:
+            self.loop.close()
+
+    async def _run(self):
+        delay = 1
+        flusher = asyncio.ensure_future(self._flush_loop())
+        try:
+            while not self._stopping:
+                try:
+                    await self._session()
+                    delay = 1
+                except (OSError, asyncio.IncompleteReadError) as e:
+                    self._status(f"Chat connection lost: {e}")
+                self.connected = False
+                if self._stopping:
+                    break
+                self.stats['reconnects'] += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+        finally:
+            flusher.cancel()
+            self._flush()
+
+    async def _session(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=1 << 20)
+        self._writer = writer
+        try:
+            writer.write(b'CAP REQ :twitch.tv/tags twitch.tv/commands\r\n')
+            if self.token:
+                writer.write(f'PASS oauth:{self.token.replace("oauth:", "")}\r\n'.encode())
+            writer.write(f'NICK {self.nick}\r\nJOIN {self.channel}\r\n'.encode())
+            await writer.drain()
+            self.connected = True
+            self._status(f"Connected to {self.channel}")
+
+            pending = b''
+            while not self._stopping:
+                chunk = await reader.read(1 << 16)
+                if not chunk:
+                    break
+                self.stats['bytes'] += len(chunk)
+                lines = (pending + chunk).split(b'\r\n')
+                pending = lines.pop()
+                for line in lines:
+                    if line:
+                        self._handle(line.decode('utf-8', 'replace'), writer)
+                if len(self._batch) >= self.max_batch:
+                    self._flush()
+        finally:
+            self._writer = None
+            writer.close()
+
+    def _handle(self, line, writer):
+        # Fast path: chat lines are by far the most common
+        if ' PRIVMSG ' in line:
+            self._batch.append(parse_line(line))
+            return
+        message = parse_line(line)
+        if message.command == 'PING':
+            writer.write(f'PONG :{message.text or "tmi.twitch.tv"}\r\n'.encode())
+        elif message.command == 'RECONNECT':
+            writer.close()
+        elif message.command == 'NOTICE':
+            self._status(message.text)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            self._flush()
+
+    def _flush(self):
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        self.stats['messages'] += len(batch)
+        self.stats['batches'] += 1
+        try:
+            self.on_batch(batch)
+        except Exception as e:
+            print(f"Error handling chat batch: {e}")
+
+
+def sent_latency(message, now=None):
+    # Seconds between Twitch's tmi-sent-ts tag and now
+    sent = message.tags.get('tmi-sent-ts')
+    if not sent:
+        return None
+    return (now if now is not None else time.time()) - int(sent) / 1000
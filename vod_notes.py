@@ -0,0 +1,221 @@
+import csv
+import os
+import shutil
+import subprocess
+from array import array
+from bisect import bisect_left, bisect_right
+
+HEADER = "# vod-notes v1\n"
+
+
+class KeyframeIndex:
+    # Keyframe times and byte offsets of a VOD's video stream, listed once
+    # with ffprobe and cached next to the thumbnail strips as two flat binary
+    # arrays. lookup() is a bisect, so a note maps to the keyframe a player
+    # can seek to directly without decoding anything before it.
+
+    def __init__(self, times, positions):
+        self.times = times
+        self.positions = positions
+
+    @classmethod
+    def load_or_build(cls, vod_path, cache_dir='vod_cache'):
+        from vod_timeline import vod_key
+        os.makedirs(cache_dir, exist_ok=True)
+        base = os.path.join(cache_dir, vod_key(vod_path))
+        times, positions = array('d'), array('q')
+        try:
+            with open(base + '.keytimes', 'rb') as f:
+                times.frombytes(f.read())
+            with open(base + '.keypos', 'rb') as f:
+                positions.frombytes(f.read())
+            if len(times) == len(positions) and len(times):
+                return cls(times, positions)
+        except (OSError, ValueError):
+            pass
+
+        if shutil.which('ffprobe') is None:
+            return None
+        times, positions = array('d'), array('q')
+        process = subprocess.Popen(
+            ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries', 'packet=pts_time,pos,flags', '-of', 'csv=p=0', vod_path],
+            stdout=subprocess.PIPE, text=True
+        )
+        for line in process.stdout:
+            pts, pos, flags = (line.strip().split(',') + ['', '', ''])[:3]
+            if 'K' in flags and pts not in ('', 'N/A') and pos not in ('', 'N/A'):
+                times.append(float(pts))
+                positions.append(int(pos))
+        if process.wait() != 0 or not times:
+            return None
+        # Packets come in decode order; keyframes are already in time order
+        # for every common container, but make sure
+        if any(times[i] > times[i + 1] for i in range(len(times) - 1)):
+            pairs = sorted(zip(times, positions))
+            times, positions = array('d', (p[0] for p in pairs)), array('q', (p[1] for p in pairs))
+        with open(base + '.keytimes', 'wb') as f:
+            f.write(times.tobytes())
+        with open(base + '.keypos', 'wb') as f:
+            f.write(positions.tobytes())
+        return cls(times, positions)
+
+    def lookup(self, seconds):
+        # Keyframe at or before `seconds`: (time, byte offset)
+        i = bisect_right(self.times, seconds) - 1
+        if i < 0:
+            i = 0
+        return self.times[i], self.positions[i]
+
+
+class VodNotes:
+    # Timestamped notes for one VOD, kept in a "<vod>.notes" sidecar.
+    #
+    # The sidecar is append-only text, one "seconds<TAB>kind<TAB>text" line
+    # per note, so adding a note is one small write however many exist. In
+    # memory, times and entries are parallel lists kept sorted with bisect:
+    # inserting is a binary search plus a memmove, and range queries (the
+    # notes around the playhead) are two bisects. Bulk adds from automatic
+    # detectors are written in one go and merged with a single sort.
+
+    def __init__(self, vod_path, keyframes=None):
+        self.vod_path = vod_path
+        self.path = vod_path + '.notes'
+        self.keyframes = keyframes
+        self.times = []
+        self.entries = []
+        self._file = None
+        self.load()
+
+    def load(self):
+        pairs = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('#') or not line.endswith('\n'):
+                        continue
+                    seconds, kind, text = (line[:-1].split('\t', 2) + ['', ''])[:3]
+                    try:
+                        pairs.append((float(seconds), kind, text))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        pairs.sort(key=lambda p: p[0])
+        self.times = [p[0] for p in pairs]
+        self.entries = [(p[1], p[2]) for p in pairs]
+
+    def _append(self, lines):
+        if self._file is None:
+            new = not os.path.exists(self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if new:
+                self._file.write(HEADER)
+        self._file.write(''.join(lines))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def add(self, seconds, text, kind='note'):
+        text = _clean(text)
+        self._append([f"{seconds:.3f}\t{kind}\t{text}\n"])
+        i = bisect_right(self.times, seconds)
+        self.times.insert(i, seconds)
+        self.entries.insert(i, (kind, text))
+        return i
+
+    def add_many(self, notes, kind='auto'):
+        notes = [(seconds, _clean(text)) for seconds, text in notes]
+        if not notes:
+            return
+        self._append([f"{seconds:.3f}\t{kind}\t{text}\n" for seconds, text in notes])
+        merged = sorted(
+            list(zip(self.times, self.entries)) + [(seconds, (kind, text)) for seconds, text in notes],
+            key=lambda p: p[0]
+        )
+        self.times = [p[0] for p in merged]
+        self.entries = [p[1] for p in merged]
+
+    def __len__(self):
+        return len(self.times)
+
+    def between(self, start, end, limit=None):
+        lo = bisect_left(self.times, start)
+        hi = bisect_right(self.times, end)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return [(self.times[i],) + self.entries[i] for i in range(lo, hi)]
+
+    def seek_point(self, seconds):
+        # Where a player should seek to show this note without a linear
+        # decode: the keyframe at or before it, or the note time itself when
+        # no keyframe index is available
+        if self.keyframes is None:
+            return seconds, None
+        return self.keyframes.lookup(seconds)
+
+    def notes(self):
+        for i in range(len(self.times)):
+            yield (self.times[i],) + self.entries[i]
+
+    def export_chapters(self, path, min_gap=10.0):
+        # YouTube wants the first chapter at 0:00 and chapters at least 10s
+        # apart, so later notes within min_gap of a chapter are folded in
+        lines = []
+        last = None
+        if not self.times or self.times[0] >= min_gap:
+            lines.append(f"{_chapter_time(0)} Start")
+            last = 0.0
+        for seconds, kind, text in self.notes():
+            if last is not None and seconds - last < min_gap:
+                continue
+            lines.append(f"{_chapter_time(0 if last is None else seconds)} {text or kind}")
+            last = 0.0 if last is None else seconds
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return len(lines)
+
+    def export_csv(self, path, fps=30.0):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['seconds', 'timecode', 'kind', 'note', 'keyframe_seconds', 'byte_offset'])
+            for seconds, kind, text in self.notes():
+                keyframe, offset = self.seek_point(seconds)
+                writer.writerow([f"{seconds:.3f}", _timecode(seconds, fps), kind, text,
+                                 f"{keyframe:.3f}", '' if offset is None else offset])
+        return len(self.times)
+
+    def export_edl(self, path, fps=30.0):
+        # CMX3600 EDL with one single-frame marker event per note, in the
+        # marker form DaVinci Resolve and Premiere import
+        name = os.path.splitext(os.path.basename(self.vod_path))[0]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"TITLE: {name} notes\nFCM: NON-DROP FRAME\n\n")
+            for event, (seconds, kind, text) in enumerate(self.notes(), 1):
+                start = _timecode(seconds, fps)
+                end = _timecode(seconds + 1 / fps, fps)
+                color = 'ResolveColorBlue' if kind == 'note' else 'ResolveColorYellow'
+                f.write(f"{event:03}  001      V     C        {start} {end} {start} {end}\n")
+                f.write(f" |C:{color} |M:{text or kind} |D:1\n\n")
+        return len(self.times)
+
+
+def _clean(text):
+    return ' '.join(str(text).split())
+
+
+def _chapter_time(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds // 60 % 60:02}:{seconds % 60:02}"
+    return f"{seconds // 60}:{seconds % 60:02}"
+
+
+def _timecode(seconds, fps):
+    rate = int(round(fps))
+    frames = int(round(seconds * fps))
+    return (f"{frames // (rate * 3600):02}:{frames // (rate * 60) % 60:02}:"
+            f"{frames // rate % 60:02}:{frames % rate:02}")
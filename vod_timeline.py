@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import lazy_imports
+
+
+def vod_key(path):
+    # Cache key for a VOD: changes if the file is replaced or re-exported
+    st = os.stat(path)
+    return hashlib.sha1(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode()).hexdigest()[:20]
+
+
+def coarse_to_fine(count):
+    # 0, n/2, n/4, 3n/4, ... so a partly filled strip covers the whole VOD
+    step = 1
+    while step * 2 < count:
+        step *= 2
+    seen = bytearray(count)
+    order = []
+    while step >= 1:
+        for i in range(0, count, step):
+            if not seen[i]:
+                seen[i] = 1
+                order.append(i)
+        step //= 2
+    return order
+
+
+def photo_data(frame):
+    # BGR array -> PPM bytes for tk.PhotoImage(data=...), no Pillow needed
+    height, width = frame.shape[:2]
+    return f"P6 {width} {height} 255 ".encode() + np.ascontiguousarray(frame[:, :, ::-1]).tobytes()
+
+
+class ThumbnailStrip:
+    # Evenly spaced thumbnails for a VOD, cached on disk per VOD.
+    #
+    # The strip is a (count, height, width, 3) .npy opened with
+    # np.lib.format.open_memmap plus a one-byte-per-thumbnail "filled" mask,
+    # so reopening a multi-hour VOD maps two files and reads a tiny JSON
+    # (duration, fps) without opening the video at all; pages are only read
+    # as thumbnails are shown. Missing thumbnails are decoded by fill() on a
+    # background thread in coarse-to-fine order, and written straight into
+    # the mapping, so an interrupted fill resumes where it stopped.
+
+    def __init__(self, vod_path, cache_dir='vod_cache', count=300, width=160, height=90):
+        self.vod_path = vod_path
+        self.count = count
+        self.width = width
+        self.height = height
+        os.makedirs(cache_dir, exist_ok=True)
+        base = os.path.join(cache_dir, vod_key(vod_path))
+        meta_path = base + '.json'
+        strip_path = base + '.strip.npy'
+        mask_path = base + '.mask'
+
+        meta = None
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            pass
+        shape = (count, height, width, 3)
+        reuse = (meta is not None and meta.get('shape') == list(shape)
+                 and os.path.exists(strip_path) and os.path.exists(mask_path))
+        if not reuse:
+            meta = self._probe()
+            meta['shape'] = list(shape)
+        self.duration = meta['duration']
+        self.fps = meta['fps']
+        self.thumbs = np.lib.format.open_memmap(
+            strip_path, mode='r+' if reuse else 'w+', dtype=np.uint8, shape=shape
+        )
+        self.filled = np.memmap(mask_path, dtype=np.uint8, mode='r+' if reuse else 'w+', shape=(count,))
+        if not reuse:
+            # Written last: a strip without its meta is rebuilt next time
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+        self.reused = reuse
+
+    def _probe(self):
+        cv2 = lazy_imports.cv2()
+        capture = cv2.VideoCapture(self.vod_path)
+        if not capture.isOpened():
+            raise OSError(f"Could not open VOD {self.vod_path}")
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+            frames = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        finally:
+            capture.release()
+        return {'duration': frames / fps, 'fps': fps}
+
+    def time_at(self, index):
+        return (index + 0.5) * self.duration / self.count
+
+    def index_at(self, seconds):
+        if not self.duration:
+            return 0
+        return min(max(int(seconds / self.duration * self.count), 0), self.count - 1)
+
+    def nearest_filled(self, index):
+        # Closest thumbnail that exists, for scrubbing before the fill is done
+        if self.filled[index]:
+            return index
+        filled = np.flatnonzero(self.filled)
+        if not len(filled):
+            return None
+        return int(filled[np.abs(filled - index).argmin()])
+
+    @property
+    def complete(self):
+        return bool(self.filled.all())
+
+    def fill(self, stop=None, on_thumbnail=None):
+        # Decodes only the frames at the thumbnail times: each one is a seek
+        # to the keyframe before it, never a linear pass over the VOD
+        missing = [i for i in coarse_to_fine(self.count) if not self.filled[i]]
+        if not missing:
+            return 0
+        cv2 = lazy_imports.cv2()
+        capture = cv2.VideoCapture(self.vod_path)
+        done = 0
+        try:
+            for index in missing:
+                if stop is not None and stop.is_set():
+                    break
+                capture.set(cv2.CAP_PROP_POS_MSEC, self.time_at(index) * 1000)
+                ok, frame = capture.read()
+                if not ok:
+                    continue
+                self.thumbs[index] = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+                self.filled[index] = 1
+                done += 1
+                if on_thumbnail is not None:
+                    on_thumbnail(index)
+        finally:
+            capture.release()
+            self.flush()
+        return done
+
+    def flush(self):
+        self.thumbs.flush()
+        self.filled.flush()
+
+
+class FrameReader:
+    # Full-size frames for the scrubber on a background thread. Requests are
+    # latest-wins: while the user drags, only the newest position is decoded
+    # and stale ones are skipped instead of queuing up behind each other.
+
+    def __init__(self, vod_path, on_frame, max_width=960):
+        self.vod_path = vod_path
+        self.on_frame = on_frame
+        self.max_width = max_width
+        self.stats = {'requests': 0, 'decoded': 0, 'skipped': 0, 'decode_seconds': 0.0}
+        self._request = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='vod-frames', daemon=True)
+        self._thread.start()
+
+    def request(self, seconds):
+        with self._cond:
+            if self._request is not None:
+                self.stats['skipped'] += 1
+            self._request = seconds
+            self.stats['requests'] += 1
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _run(self):
+        cv2 = lazy_imports.cv2()
+        capture = cv2.VideoCapture(self.vod_path)
+        try:
+            while True:
+                with self._cond:
+                    while self._request is None and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    seconds, self._request = self._request, None
+                started = time.perf_counter()
+                capture.set(cv2.CAP_PROP_POS_MSEC, seconds * 1000)
+                ok, frame = capture.read()
+                if not ok:
+                    continue
+                if frame.shape[1] > self.max_width:
+                    height = frame.shape[0] * self.max_width // frame.shape[1]
+                    frame = cv2.resize(frame, (self.max_width, height), interpolation=cv2.INTER_AREA)
+                self.stats['decoded'] += 1
+                self.stats['decode_seconds'] += time.perf_counter() - started
+                self.on_frame(seconds, frame)
+        finally:
+            capture.release()